@@ -5,12 +5,164 @@ Detects whether a resume is human-written or AI-generated
 """
 
 import re
+import itertools
 import numpy as np
+import pandas as pd
 from collections import Counter
+from functools import cached_property
 import math
+from concurrent.futures import ProcessPoolExecutor
+from ngram_lm import NGramLM
+from near_duplicates import MinHashLSH
+
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+# Joins documents for batch pattern matching; no AI phrase or pattern can
+# match across it
+DOCUMENT_SEPARATOR = '\x00'
+ASCII_LETTER = re.compile('[a-z]', re.IGNORECASE)
+_ascii_folds = {}
+
+
+def fold_to_ascii(text):
+    """
+    Replace the few non-ASCII characters that case-insensitive matching
+    treats as ASCII letters ('ı' ~ 'i', 'ſ' ~ 's', 'K' ~ 'k') by those
+    letters. Positions in the text are unchanged.
+    """
+    if text.isascii():
+        return text
+    
+    folds = {}
+    for ch in set(text):
+        if ord(ch) < 128:
+            continue
+        if ch not in _ascii_folds:
+            _ascii_folds[ch] = next(
+                (c for c in 'abcdefghijklmnopqrstuvwxyz' if re.fullmatch(c, ch, re.IGNORECASE)), None
+            ) if ASCII_LETTER.fullmatch(ch) else None
+        if _ascii_folds[ch]:
+            folds[ch] = _ascii_folds[ch]
+    if not folds:
+        return text
+    # A regex substitution only touches the (rare) folded characters
+    chars = re.compile('[' + ''.join(folds) + ']')
+    return chars.sub(lambda m: folds[m.group()], text)
+
+
+def compile_scanner(pattern):
+    """
+    Case-sensitive pattern without its leading \\b, run over the
+    lowercased, ASCII-folded text. It matches wherever the original
+    IGNORECASE pattern can start, and without \\b in front the regex
+    engine jumps straight to its literal prefix instead of trying every
+    position. Only lowercase ASCII patterns qualify.
+    """
+    rest = pattern[2:]
+    if not pattern.startswith(r'\b') or not rest.isascii() or rest != rest.lower():
+        return None
+    try:
+        return re.compile(rest)
+    except re.error:
+        return None
+
+
+def match_starts(regex, scanner, text, scan_text):
+    """
+    Start positions of the matches regex.findall(text) returns; the regex
+    is only tried at candidate positions found by the scanner in
+    scan_text = fold_to_ascii(text)
+    """
+    if scanner is None:
+        return [m.start() for m in regex.finditer(text)]
+    
+    starts = []
+    pos = 0
+    while True:
+        candidate = scanner.search(scan_text, pos)
+        if candidate is None:
+            return starts
+        start = candidate.start()
+        match = regex.match(text, start)
+        if match is None:
+            pos = start + 1
+        elif match.end() == start:
+            # Empty matches follow finditer's own stepping rules
+            return [m.start() for m in regex.finditer(text)]
+        else:
+            starts.append(start)
+            pos = match.end()
+
+
+class TextFeatures:
+    """
+    Tokens and sentences of one text, computed lazily and at most once so
+    that every metric shares a single lowercase/split pass
+    """
+    def __init__(self, text):
+        self.text = text
+        self.lower = text.lower()
+    
+    @cached_property
+    def words(self):
+        return self.lower.split()
+    
+    @cached_property
+    def total_words(self):
+        return len(self.words)
+    
+    @cached_property
+    def word_freq(self):
+        return Counter(self.words)
+    
+    @cached_property
+    def sentence_words(self):
+        """Word lists of the non-empty sentences"""
+        pieces = (s.split() for s in SENTENCE_SPLIT.split(self.lower))
+        return [words for words in pieces if words]
+    
+    @cached_property
+    def sentence_lengths(self):
+        return [len(words) for words in self.sentence_words]
+    
+    @cached_property
+    def starters(self):
+        """First three words of every sentence"""
+        return [' '.join(words[:3]) for words in self.sentence_words]
+
 
 class AIContentDetector:
-    def __init__(self):
+    # Weight of each metric's 0-100 score in the AI probability
+    WEIGHTS = {
+        'perplexity': 0.15,
+        'burstiness': 0.25,
+        'phrases': 0.30,
+        'repetition': 0.15,
+        'formality': 0.15
+    }
+    # Cascade order, cheapest metric first (repetition reuses the sentences
+    # split for burstiness, perplexity the word counts of formality; the
+    # language model is by far the most expensive)
+    CASCADE_ORDER = ['phrases', 'burstiness', 'repetition', 'formality', 'perplexity']
+    AI_THRESHOLD = 60
+    
+    def __init__(self, language_model=None, duplicate_index=None):
+        """
+        language_model: optional NGramLM (or its model directory) trained on
+        human resumes; when given, the perplexity metric is the text's
+        perplexity under that model instead of its own unigram entropy
+        duplicate_index: optional MinHashLSH (or its index directory) of the
+        resume corpus; when given, details['near_duplicates'] lists indexed
+        resumes the text nearly duplicates (the score is unchanged)
+        """
+        if isinstance(language_model, str):
+            language_model = NGramLM(language_model)
+        if language_model is not None and not language_model.reference_perplexity:
+            raise ValueError("Language model has no reference_perplexity; train it with held-out documents")
+        self.language_model = language_model
+        if isinstance(duplicate_index, str):
+            duplicate_index = MinHashLSH.load(duplicate_index, mmap=True)
+        self.duplicate_index = duplicate_index
+        
         # Common AI-generated content markers
         self.ai_phrases = [
             "extensive experience in",
@@ -43,19 +195,39 @@ class AIContentDetector:
             r'\bleverag(e|ed|ing)\b',
             r'\b(spearhead|orchestrat)(e|ed|ing)\b'
         ]
+        
+        # Overly formal vocabulary (substring match per word)
+        self.formal_words = [
+            'utilize', 'facilitate', 'leverage', 'implement', 'execute',
+            'demonstrate', 'establish', 'conduct', 'perform', 'achieve',
+            'collaborate', 'coordinate', 'optimize', 'enhance', 'streamline'
+        ]
+        
+        # Compiled once: the AI patterns with a fast scanner for each (see
+        # compile_scanner), and the formal words as a single alternation
+        # that is searched once per distinct word
+        self.pattern_regexes = [re.compile(p, re.IGNORECASE) for p in self.ai_patterns]
+        self.pattern_scanners = [compile_scanner(p) for p in self.ai_patterns]
+        self.formal_regex = re.compile('|'.join(re.escape(w) for w in self.formal_words))
+        self.min_formal_length = min(len(w) for w in self.formal_words)
     
     def calculate_perplexity(self, text):
         """
         Calculate text perplexity - AI text tends to have lower perplexity
         """
-        words = text.lower().split()
-        if len(words) < 10:
+        features = TextFeatures(text)
+        if self.language_model is not None:
+            return self.perplexity_from_lm(self.language_model.perplexity(text), features.total_words)
+        return self.perplexity_from_counts(features.word_freq, features.total_words)
+    
+    def perplexity_from_counts(self, word_freq, total_words):
+        """
+        Perplexity from a word frequency Counter (insertion order = first
+        occurrence order, as Counter(words) builds it)
+        """
+        if total_words < 10:
             return 50  # Neutral score for very short text
         
-        # Calculate word frequency distribution
-        word_freq = Counter(words)
-        total_words = len(words)
-        
         # Calculate entropy (simplified perplexity)
         entropy = 0
         for count in word_freq.values():
@@ -65,22 +237,35 @@ class AIContentDetector:
         perplexity = 2 ** (-entropy)
         return perplexity
     
+    def perplexity_from_lm(self, lm_perplexity, total_words):
+        """
+        Language-model perplexity on the same scale as the unigram metric:
+        100 = as surprising as the median held-out human resume, lower =
+        more predictable (more AI-like)
+        """
+        if total_words < 10:
+            return 50
+        return lm_perplexity / self.language_model.reference_perplexity * 100
+    
     def calculate_burstiness(self, text):
         """
         Calculate burstiness - human text has more variation
         AI text tends to be more uniform
         """
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if s.strip()]
-        
-        if len(sentences) < 3:
+        return self.burstiness_from_lengths(TextFeatures(text).sentence_lengths)
+    
+    def burstiness_from_lengths(self, lengths):
+        """
+        Burstiness from the word counts of the non-empty sentences
+        """
+        if len(lengths) < 3:
             return 50  # Neutral score
         
         # Calculate sentence length variation
-        lengths = [len(s.split()) for s in sentences]
         if len(lengths) < 2:
             return 50
         
+        lengths = np.asarray(lengths)
         mean_length = np.mean(lengths)
         std_length = np.std(lengths)
         
@@ -97,78 +282,214 @@ class AIContentDetector:
         """
         Detect common AI-generated phrases
         """
-        text_lower = text.lower()
-        phrase_count = 0
+        return self.phrase_count(TextFeatures(text))
+    
+    def phrase_count(self, features):
+        """
+        Phrase presence plus pattern match count on the lowercased text
+        """
+        text_lower = features.lower
         
         # Check for exact phrase matches
-        for phrase in self.ai_phrases:
-            if phrase in text_lower:
-                phrase_count += 1
+        phrase_count = sum(1 for phrase in self.ai_phrases if phrase in text_lower)
         
         # Check for pattern matches
-        for pattern in self.ai_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            phrase_count += len(matches)
+        phrase_count += self.pattern_hits(text_lower)
         
         return phrase_count
     
+    def pattern_hits(self, text_lower):
+        """
+        Total number of AI pattern matches
+        """
+        scan_text = fold_to_ascii(text_lower)
+        return sum(
+            len(match_starts(regex, scanner, text_lower, scan_text))
+            for regex, scanner in zip(self.pattern_regexes, self.pattern_scanners)
+        )
+    
     def calculate_repetition_score(self, text):
         """
         AI text often has repetitive structures
         """
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip().lower() for s in sentences if s.strip()]
-        
-        if len(sentences) < 3:
+        return self.repetition_from_starters(TextFeatures(text).starters)
+    
+    def repetition_from_sentences(self, sentences):
+        """
+        Repetition rate from stripped, lowercased non-empty sentences
+        """
+        return self.repetition_from_starters([' '.join(s.split()[:3]) for s in sentences])
+    
+    def repetition_from_starters(self, starters):
+        """
+        Repetition rate from the first three words of every sentence
+        """
+        if len(starters) < 3:
             return 0
         
-        # Check for sentences starting with similar patterns
-        starters = [s.split()[:3] if len(s.split()) >= 3 else s.split() 
-                   for s in sentences]
-        starter_strings = [' '.join(starter) for starter in starters]
-        
-        # Count duplicates
-        starter_counts = Counter(starter_strings)
+        # Count sentences starting with the same words
+        starter_counts = Counter(starters)
         repetitions = sum(count - 1 for count in starter_counts.values() if count > 1)
         
         # Normalize by sentence count
-        repetition_rate = (repetitions / len(sentences)) * 100
+        repetition_rate = (repetitions / len(starters)) * 100
         return min(repetition_rate, 100)
     
     def calculate_formality_score(self, text):
         """
         AI text tends to be overly formal
         """
-        formal_words = [
-            'utilize', 'facilitate', 'leverage', 'implement', 'execute',
-            'demonstrate', 'establish', 'conduct', 'perform', 'achieve',
-            'collaborate', 'coordinate', 'optimize', 'enhance', 'streamline'
-        ]
-        
-        words = text.lower().split()
-        if len(words) < 10:
+        features = TextFeatures(text)
+        return self.formality_from_counts(self.formal_count(features.word_freq), features.total_words)
+    
+    def formal_count(self, word_freq):
+        """
+        Number of words containing a formal word, checked once per distinct
+        word (words shorter than every formal word cannot contain one)
+        """
+        search = self.formal_regex.search
+        min_length = self.min_formal_length
+        return sum(
+            count for word, count in word_freq.items()
+            if len(word) >= min_length and search(word)
+        )
+    
+    def formality_from_counts(self, formal_count, total_words):
+        """
+        Formality from the number of formal words and the total word count
+        """
+        if total_words < 10:
             return 50
         
-        formal_count = sum(1 for word in words if any(fw in word for fw in formal_words))
-        formality_rate = (formal_count / len(words)) * 100
+        formality_rate = (formal_count / total_words) * 100
         
         return min(formality_rate * 5, 100)  # Scale up for visibility
     
-    def detect_ai_content(self, text):
+    def detect_ai_content(self, text, cascade=False):
         """
         Main detection function
+        cascade=True stops early once the verdict is decided
+        (see detect_ai_content_cascade)
         Returns: (is_ai_generated: bool, confidence: float, details: dict)
         """
+        if cascade:
+            return self.detect_ai_content_cascade(text)
         if not text or len(text.strip()) < 50:
             return False, 0, {"error": "Text too short to analyze"}
         
-        # Calculate various metrics
-        perplexity = self.calculate_perplexity(text)
-        burstiness = self.calculate_burstiness(text)
-        ai_phrase_count = self.detect_ai_phrases(text)
-        repetition = self.calculate_repetition_score(text)
-        formality = self.calculate_formality_score(text)
+        # Calculate various metrics from one shared tokenization
+        features = TextFeatures(text)
+        if self.language_model is None:
+            lm_perplexity = None
+            perplexity = self.perplexity_from_counts(features.word_freq, features.total_words)
+        else:
+            lm_perplexity = self.language_model.perplexity(text)
+            perplexity = self.perplexity_from_lm(lm_perplexity, features.total_words)
+        burstiness = self.burstiness_from_lengths(features.sentence_lengths)
+        ai_phrase_count = self.phrase_count(features)
+        repetition = self.repetition_from_starters(features.starters)
+        formality = self.formality_from_counts(
+            self.formal_count(features.word_freq), features.total_words
+        )
         
+        is_ai, ai_score, details = self.score_metrics(
+            perplexity, burstiness, ai_phrase_count, repetition, formality, lm_perplexity=lm_perplexity
+        )
+        if self.duplicate_index is not None:
+            details['near_duplicates'] = self.duplicate_index.query(text)
+        return is_ai, ai_score, details
+    
+    def detect_ai_content_cascade(self, text):
+        """
+        Early-exit detection. Metrics run cheapest first while the weighted
+        score is bounded: every metric score lies in 0-100, so metrics not
+        yet computed add between 0 and 100 x their weight. Detection stops
+        as soon as the whole range is on one side of the threshold, so the
+        verdict is always the one detect_ai_content gives.
+        
+        details['cascade'] lists the metrics that ran and were skipped and
+        the final score bounds. details['metrics'] holds only the metrics
+        that ran. After an early exit ai_score is the bound on the verdict's
+        side (the lowest possible score for AI, the highest for human).
+        """
+        if not text or len(text.strip()) < 50:
+            return False, 0, {"error": "Text too short to analyze"}
+        
+        features = TextFeatures(text)
+        values, lm_perplexity = {}, None
+        low, high = 0.0, 100.0
+        
+        for name in self.CASCADE_ORDER:
+            if name == 'phrases':
+                values[name] = self.phrase_count(features)
+                score = min(values[name] * 5, 100)
+            elif name == 'burstiness':
+                values[name] = self.burstiness_from_lengths(features.sentence_lengths)
+                score = max(0, 100 - values[name])
+            elif name == 'repetition':
+                values[name] = score = self.repetition_from_starters(features.starters)
+            elif name == 'formality':
+                values[name] = score = self.formality_from_counts(
+                    self.formal_count(features.word_freq), features.total_words
+                )
+            else:
+                if self.language_model is None:
+                    values[name] = self.perplexity_from_counts(features.word_freq, features.total_words)
+                else:
+                    lm_perplexity = self.language_model.perplexity(text)
+                    values[name] = self.perplexity_from_lm(lm_perplexity, features.total_words)
+                score = max(0, 100 - values[name])
+            
+            weight = self.WEIGHTS[name]
+            low += score * weight
+            high -= (100 - score) * weight
+            # Small margin: the bounds sum in a different order than score_metrics
+            if low > self.AI_THRESHOLD + 1e-9 or high < self.AI_THRESHOLD - 1e-9:
+                break
+        
+        skipped = [name for name in self.CASCADE_ORDER if name not in values]
+        if not skipped:
+            is_ai, ai_score, details = self.score_metrics(
+                values['perplexity'], values['burstiness'], values['phrases'],
+                values['repetition'], values['formality'], lm_perplexity=lm_perplexity
+            )
+            low = high = ai_score
+        else:
+            is_ai = low > self.AI_THRESHOLD
+            ai_score = low if is_ai else high
+            metric_keys = {
+                'perplexity': 'perplexity',
+                'burstiness': 'burstiness',
+                'phrases': 'ai_phrases_found',
+                'repetition': 'repetition_rate',
+                'formality': 'formality_score'
+            }
+            details = {
+                'ai_probability': round(ai_score, 2),
+                'human_probability': round(100 - ai_score, 2),
+                'metrics': {
+                    metric_keys[name]: value if name == 'phrases' else round(value, 2)
+                    for name, value in values.items()
+                },
+                'verdict': 'AI-Generated' if is_ai else 'Human-Written',
+                'confidence': round(abs(ai_score - 50) * 2, 2)
+            }
+        
+        details['cascade'] = {
+            'metrics_run': list(values),
+            'metrics_skipped': skipped,
+            'ai_probability_bounds': [round(low, 2), round(high, 2)]
+        }
+        if self.duplicate_index is not None:
+            details['near_duplicates'] = self.duplicate_index.query(text)
+        return is_ai, ai_score, details
+    
+    def score_metrics(self, perplexity, burstiness, ai_phrase_count, repetition, formality,
+                      lm_perplexity=None):
+        """
+        Combine the individual metrics into the final verdict
+        Returns: (is_ai_generated: bool, confidence: float, details: dict)
+        """
         # Normalize scores (0-100, where higher = more likely AI)
         # Low perplexity = AI (invert the score)
         perplexity_score = max(0, 100 - perplexity)
@@ -180,13 +501,7 @@ class AIContentDetector:
         phrase_score = min(ai_phrase_count * 5, 100)
         
         # Calculate weighted AI probability
-        weights = {
-            'perplexity': 0.15,
-            'burstiness': 0.25,
-            'phrases': 0.30,
-            'repetition': 0.15,
-            'formality': 0.15
-        }
+        weights = self.WEIGHTS
         
         ai_score = (
             perplexity_score * weights['perplexity'] +
@@ -197,7 +512,7 @@ class AIContentDetector:
         )
         
         # Determine if AI-generated (threshold: 60%)
-        is_ai = ai_score > 60
+        is_ai = ai_score > self.AI_THRESHOLD
         
         details = {
             'ai_probability': round(ai_score, 2),
@@ -212,9 +527,144 @@ class AIContentDetector:
             'verdict': 'AI-Generated' if is_ai else 'Human-Written',
             'confidence': round(abs(ai_score - 50) * 2, 2)  # Distance from neutral
         }
+        if lm_perplexity is not None:
+            details['metrics']['lm_perplexity'] = round(lm_perplexity, 2)
         
         return is_ai, ai_score, details
     
+    def detect_ai_content_many(self, texts):
+        """
+        Batch version of detect_ai_content. Every document is tokenized
+        once into flat word/sentence arrays with per-document offsets; the
+        metrics are then computed for the whole batch with NumPy, and the
+        AI patterns are matched once over the concatenated batch.
+        
+        Returns a DataFrame with one row per text (unrounded metrics, same
+        values as detect_ai_content up to floating-point summation order).
+        Texts too short to analyze get NaN metrics and an `error`.
+        With a duplicate index, `near_duplicates` counts the matches and
+        `duplicate_of` is the most similar one.
+        """
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        n = len(texts)
+        short = np.array([len(t.strip()) < 50 for t in texts], dtype=bool)
+        lowers = [t.lower() for t in texts]
+        
+        # Flatten: words and sentences of all documents, with document indices
+        words, word_counts = [], np.zeros(n, dtype=np.int64)
+        starters, sentence_lengths, sentence_counts = [], [], np.zeros(n, dtype=np.int64)
+        for i, lower in enumerate(lowers):
+            doc_words = lower.split()
+            words.extend(doc_words)
+            word_counts[i] = len(doc_words)
+            
+            pieces = [p for p in (s.split() for s in SENTENCE_SPLIT.split(lower)) if p]
+            starters.extend(' '.join(p[:3]) for p in pieces)
+            sentence_lengths.extend(len(p) for p in pieces)
+            sentence_counts[i] = len(pieces)
+        
+        word_doc = np.repeat(np.arange(n), word_counts)
+        sentence_doc = np.repeat(np.arange(n), sentence_counts)
+        total_words = word_counts.astype(np.float64)
+        
+        # Perplexity: entropy of each document's word distribution
+        word_codes, vocabulary = pd.factorize(np.array(words, dtype=object))
+        term_codes, terms = pd.factorize(word_doc * max(len(vocabulary), 1) + word_codes)
+        term_doc = terms // max(len(vocabulary), 1)
+        probability = np.bincount(term_codes, minlength=len(terms)) / total_words[term_doc]
+        entropy = np.bincount(term_doc, weights=probability * np.log2(probability), minlength=n)
+        perplexity = np.where(word_counts < 10, 50, 2 ** (-entropy))
+        if self.language_model is not None:
+            lm_perplexity = self.language_model.perplexity_many(texts)
+            perplexity = np.where(
+                word_counts < 10, 50, lm_perplexity / self.language_model.reference_perplexity * 100
+            )
+        
+        # Burstiness: coefficient of variation of sentence lengths
+        lengths = np.array(sentence_lengths, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_length = np.bincount(sentence_doc, weights=lengths, minlength=n) / sentence_counts
+            deviation = lengths - mean_length[sentence_doc]
+            std_length = np.sqrt(np.bincount(sentence_doc, weights=deviation * deviation, minlength=n) / sentence_counts)
+            cv = np.where(mean_length > 0, (std_length / mean_length) * 100, 0)
+        burstiness = np.where(sentence_counts < 3, 50, np.minimum(cv, 100))
+        
+        # Phrases (presence) and patterns (every match) over the joined batch
+        joined = DOCUMENT_SEPARATOR.join(lowers)
+        doc_starts = np.cumsum([0] + [len(lower) + 1 for lower in lowers[:-1]])
+        
+        def docs_of(positions):
+            return np.searchsorted(doc_starts, np.asarray(positions, dtype=np.int64), side='right') - 1
+        
+        ai_phrase_count = np.zeros(n, dtype=np.int64)
+        for phrase in self.ai_phrases:
+            docs = np.unique(docs_of([m.start() for m in re.finditer(re.escape(phrase), joined)]))
+            ai_phrase_count[docs] += 1
+        scan_text = fold_to_ascii(joined)
+        for regex, scanner in zip(self.pattern_regexes, self.pattern_scanners):
+            ai_phrase_count += np.bincount(
+                docs_of(match_starts(regex, scanner, joined, scan_text)), minlength=n
+            )
+        
+        # Repetition: sentences whose first three words were seen before
+        starter_codes, starter_values = pd.factorize(np.array(starters, dtype=object))
+        distinct = np.unique(sentence_doc * max(len(starter_values), 1) + starter_codes)
+        distinct_starters = np.bincount(distinct // max(len(starter_values), 1), minlength=n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            repetition_rate = ((sentence_counts - distinct_starters) / sentence_counts) * 100
+        repetition = np.where(sentence_counts < 3, 0, np.minimum(repetition_rate, 100))
+        
+        # Formality: one regex search per distinct word in the batch
+        search = self.formal_regex.search
+        is_formal = np.array(
+            [len(w) >= self.min_formal_length and search(w) is not None for w in vocabulary], dtype=bool
+        )
+        formal_count = np.bincount(word_doc, weights=is_formal[word_codes], minlength=n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            formality_rate = (formal_count / total_words) * 100
+        formality = np.where(word_counts < 10, 50, np.minimum(formality_rate * 5, 100))
+        
+        # Same weighting as score_metrics
+        weights = self.WEIGHTS
+        ai_score = (
+            np.maximum(0, 100 - perplexity) * weights['perplexity'] +
+            np.maximum(0, 100 - burstiness) * weights['burstiness'] +
+            np.minimum(ai_phrase_count * 5, 100) * weights['phrases'] +
+            repetition * weights['repetition'] +
+            formality * weights['formality']
+        )
+        ai_score[short] = 0
+        is_ai = ai_score > self.AI_THRESHOLD
+        
+        result = pd.DataFrame({
+            'is_ai': is_ai,
+            'ai_score': ai_score,
+            'verdict': np.where(is_ai, 'AI-Generated', 'Human-Written'),
+            'confidence': np.abs(ai_score - 50) * 2,
+            'perplexity': perplexity,
+            'burstiness': burstiness,
+            'ai_phrases_found': ai_phrase_count,
+            'repetition_rate': repetition,
+            'formality_score': formality,
+            'total_words': word_counts,
+            'sentences': sentence_counts,
+            'error': np.where(short, 'Text too short to analyze', None)
+        })
+        if self.language_model is not None:
+            result.insert(result.columns.get_loc('burstiness'), 'lm_perplexity', lm_perplexity)
+            result['lm_perplexity'] = result['lm_perplexity'].mask(short)
+        if self.duplicate_index is not None:
+            matches = self.duplicate_index.query_many(texts)
+            position = result.columns.get_loc('total_words')
+            result.insert(position, 'near_duplicates', [len(m) for m in matches])
+            result.insert(position + 1, 'duplicate_of', [m[0]['doc_id'] if m else None for m in matches])
+            result['near_duplicates'] = result['near_duplicates'].mask(short)
+            result['duplicate_of'] = result['duplicate_of'].mask(short)
+        for column in ['verdict', 'confidence', 'perplexity', 'burstiness', 'ai_phrases_found',
+                       'repetition_rate', 'formality_score']:
+            result[column] = result[column].mask(short)
+        return result
+    
     def get_recommendation(self, is_ai, confidence):
         """
         Get recommendation based on detection results
@@ -235,6 +685,54 @@ class AIContentDetector:
                 return "✓ PASSED: This resume appears to be human-written, though some sections may benefit from more personality."
 
 
+# -------------------------------
+# Corpus Detection
+# -------------------------------
+_worker_detectors = {}
+
+
+def _detect_chunk(start, texts, language_model=None, duplicate_index=None):
+    # One detector per process (and model directories), memory-mapping the LM
+    # and the duplicate index once
+    key = (language_model, duplicate_index)
+    if key not in _worker_detectors:
+        _worker_detectors[key] = AIContentDetector(language_model, duplicate_index)
+    result = _worker_detectors[key].detect_ai_content_many(texts)
+    result.index = pd.RangeIndex(start, start + len(texts))
+    return result
+
+
+def iter_detect_ai_content(texts, chunk_size=1000, workers=1, language_model=None,
+                           duplicate_index=None):
+    """
+    Stream detect_ai_content_many over any iterable of texts, yielding one
+    DataFrame per chunk (indexed by position in `texts`) in input order.
+    With workers > 1 chunks are scored in a process pool, with at most
+    2 * workers chunks in flight so memory stays bounded.
+    language_model is an NGramLM model directory and duplicate_index a
+    MinHashLSH index directory, shared by all workers.
+    """
+    iterator = iter(texts)
+    chunks = zip(
+        itertools.count(0, chunk_size),
+        iter(lambda: list(itertools.islice(iterator, chunk_size)), [])
+    )
+    
+    if workers <= 1:
+        for start, chunk in chunks:
+            yield _detect_chunk(start, chunk, language_model, duplicate_index)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = [pool.submit(_detect_chunk, start, chunk, language_model, duplicate_index)
+                   for start, chunk in itertools.islice(chunks, 2 * workers)]
+        while pending:
+            result = pending.pop(0).result()
+            for start, chunk in itertools.islice(chunks, 1):
+                pending.append(pool.submit(_detect_chunk, start, chunk, language_model, duplicate_index))
+            yield result
+
+
 # Quick test function
 if __name__ == "__main__":
     detector = AIContentDetector()
@@ -4,15 +4,19 @@ import streamlit as st
 from skill_extractor import SkillExtractor
 from matcher import ResumeJDMatcher
 from ats_scorer import ATSScorer
+from resume_parser import ResumeParser
 from ai_detector import AIContentDetector
+from incremental_analyzer import IncrementalAnalyzer
+from document_extractor import EXTENSIONS, DocumentExtractor
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-import PyPDF2
-import pdfplumber
-from docx import Document
 import io
+import os
+import zipfile
 
 # -------------------------------
 # Page Config
@@ -102,52 +106,70 @@ def load_models():
         extractor = SkillExtractor("skill_ontology.json")
         matcher = ResumeJDMatcher()
         scorer = ATSScorer()
-        ai_detector = AIContentDetector()
-    return extractor, matcher, scorer, ai_detector
+        resume_parser = ResumeParser(None, stream=True)
+        # Optional n-gram LM (python ngram_lm.py train) for the perplexity signal
+        # and near-duplicate index (python near_duplicates.py build)
+        ai_detector = AIContentDetector(os.environ.get("AI_DETECTOR_LM"), os.environ.get("AI_DETECTOR_DEDUP"))
+        # Block-level caches shared across reruns (keyed by content fingerprint)
+        analyzer = IncrementalAnalyzer(extractor, matcher, ai_detector)
+    return extractor, matcher, scorer, ai_detector, analyzer, resume_parser
+
+@st.cache_resource
+def load_document_extractor():
+    # Uploads are extracted once per file content, across reruns and sessions
+    return DocumentExtractor(cache_dir=os.environ.get("EXTRACTION_CACHE_DIR"))
+
+@st.cache_resource
+def load_batch_extractor():
+    # Batch uploads are extracted file by file in EXTRACTION_WORKERS processes;
+    # single uploads stay in-process with the extractor above
+    return DocumentExtractor(
+        cache_dir=os.environ.get("EXTRACTION_CACHE_DIR"),
+        workers=int(os.environ.get("EXTRACTION_WORKERS", os.cpu_count() or 1))
+    )
+
+@st.cache_resource
+def load_stage_pool():
+    # Worker threads for the independent analysis stages, shared by all sessions
+    return ThreadPoolExecutor(max_workers=int(os.environ.get("ANALYSIS_WORKERS", "4")))
 
 # -------------------------------
 # Helper Functions
 # -------------------------------
-def extract_text_from_pdf(pdf_file):
-    """Extract text from PDF file using pdfplumber"""
-    try:
-        text = ""
-        with pdfplumber.open(pdf_file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text.strip()
-    except Exception as e:
-        st.error(f"Error extracting PDF: {str(e)}")
+def extract_text_from_file(uploaded_file):
+    """Extract text from uploaded file (PDF, DOCX or TXT), cached by file content"""
+    if uploaded_file is None:
         return ""
-
-def extract_text_from_docx(docx_file):
-    """Extract text from DOCX file"""
+    
     try:
-        doc = Document(docx_file)
-        text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-        return text.strip()
+        return document_extractor.extract(uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type)
     except Exception as e:
-        st.error(f"Error extracting DOCX: {str(e)}")
+        st.error(f"Error extracting {uploaded_file.name}: {str(e)}")
         return ""
 
-def extract_text_from_file(uploaded_file):
-    """Extract text from uploaded file (PDF or DOCX)"""
-    if uploaded_file is None:
-        return ""
-    
-    file_type = uploaded_file.type
-    
-    if file_type == "application/pdf":
-        return extract_text_from_pdf(uploaded_file)
-    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(uploaded_file)
-    elif file_type == "text/plain":
-        return uploaded_file.read().decode("utf-8")
+def start_analysis(resume_text, job_description, incremental, block_stats=None):
+    """
+    Submit the independent analysis stages to the stage pool and return
+    name -> future. The embedding (slowest) is submitted first and runs
+    alongside AI detection, skill extraction and section parsing. In
+    incremental mode, block_stats receives this run's embedding stats.
+    """
+    if incremental:
+        semantic = lambda resume, jd: analyzer.semantic_match(resume, jd, block_stats)
+        detect = analyzer.detect_ai_content
+        skills, jd_skills = analyzer.extract_skills, analyzer.extract_jd_skills
     else:
-        st.error(f"Unsupported file type: {file_type}")
-        return ""
+        semantic, detect = matcher.match, ai_detector.detect_ai_content
+        skills = jd_skills = skill_extractor.extract
+    
+    jobs = {
+        "semantic": (semantic, resume_text, job_description),
+        "ai": (detect, resume_text),
+        "skills": (skills, resume_text),
+        "jd_skills": (jd_skills, job_description),
+        "sections": (resume_parser.parse_sections, resume_text)
+    }
+    return {name: stage_pool.submit(*job) for name, job in jobs.items()}
 
 def check_resume_length(text):
     """
@@ -263,6 +285,222 @@ def create_skill_comparison(resume_skills, jd_skills):
     fig.update_layout(height=400, showlegend=False)
     return fig, matched, resume_only, jd_only
 
+# -------------------------------
+# Batch Ranking
+# -------------------------------
+# Resumes embedded and scored per table update
+BATCH_CHUNK = 32
+# ZIP uploads: files read per archive and uncompressed size per file
+MAX_ZIP_ENTRIES = 1000
+MAX_ZIP_FILE_BYTES = 20 * 1024 * 1024
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def analyze_job_description(job_description):
+    """JD skills and embedding, computed once per JD text"""
+    return skill_extractor.extract(job_description), matcher.embed(job_description)
+
+def expand_uploads(uploaded_files):
+    """
+    (data, filename, mime_type) documents from uploaded files, with ZIP
+    archives expanded, and (name, reason) of the files left out. Archives
+    are read up to MAX_ZIP_ENTRIES resumes of at most MAX_ZIP_FILE_BYTES.
+    """
+    documents = []
+    rejected = []
+    for uploaded_file in uploaded_files:
+        if not uploaded_file.name.lower().endswith(".zip"):
+            documents.append((uploaded_file.getvalue(), uploaded_file.name, uploaded_file.type))
+            continue
+        
+        try:
+            archive = zipfile.ZipFile(io.BytesIO(uploaded_file.getvalue()))
+        except zipfile.BadZipFile as e:
+            rejected.append((uploaded_file.name, f"Not a valid ZIP archive: {e}"))
+            continue
+        
+        with archive:
+            members = [
+                member for member in archive.infolist()
+                if not member.is_dir() and not member.filename.startswith("__MACOSX/")
+                and not os.path.basename(member.filename).startswith(".")
+                and os.path.splitext(member.filename)[1].lower() in EXTENSIONS
+            ]
+            if len(members) > MAX_ZIP_ENTRIES:
+                rejected.append((uploaded_file.name, f"Only the first {MAX_ZIP_ENTRIES} of "
+                                                     f"{len(members)} resumes in the archive were read"))
+            for member in members[:MAX_ZIP_ENTRIES]:
+                # file_size is the declared size; reads never return more than it
+                if member.file_size > MAX_ZIP_FILE_BYTES:
+                    rejected.append((member.filename, f"Larger than {MAX_ZIP_FILE_BYTES // (1024 * 1024)} MB uncompressed"))
+                    continue
+                documents.append((archive.read(member), member.filename, None))
+    return documents, rejected
+
+def ranking_table(rows):
+    """Ranked DataFrame of scored resumes, best first"""
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table = table.sort_values("ATS Score", ascending=False, kind="stable").reset_index(drop=True)
+    table.insert(0, "Rank", range(1, len(table) + 1))
+    return table
+
+def show_ranking_table(area, rows):
+    area.dataframe(
+        ranking_table(rows),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "ATS Score": st.column_config.ProgressColumn("ATS Score", min_value=0, max_value=100, format="%.1f")
+        }
+    )
+
+def rank_resumes(documents, job_description, progress_area, table_area):
+    """
+    Score (data, filename, mime_type) documents against one JD. Files are
+    extracted in parallel; every BATCH_CHUNK extracted resumes are tagged,
+    embedded in one encoder call, scored with the vectorized scorer and
+    put through the length and AI-content checks, then the progress bar
+    and the ranked table are updated.
+    Returns {"rows", "failed", "ranked_at"}.
+    """
+    jd_skill_output, jd_embedding = analyze_job_description(job_description)
+    jd_skills = jd_skill_output["normalized_skills"]
+    jd_vector = skill_extractor.skill_vector(jd_skills)
+    jd_embedding = np.asarray(jd_embedding, dtype=np.float32)
+    jd_embedding = jd_embedding / (np.linalg.norm(jd_embedding) or 1.0)
+    
+    rows = []
+    failed = []
+    
+    def score(chunk):
+        names = [name for name, _ in chunk]
+        texts = [text for _, text in chunk]
+        skill_outputs = [skill_extractor.extract(text) for text in texts]
+        resume_jsons = [
+            dict(resume_parser.parse_sections(text), skills=output["normalized_skills"])
+            for text, output in zip(texts, skill_outputs)
+        ]
+        
+        # Cosine similarity to the JD, rounded like ResumeJDMatcher.match_embeddings
+        embeddings = matcher.embed_batch(texts, batch_size=BATCH_CHUNK)
+        norms = np.linalg.norm(embeddings, axis=1)
+        semantic = np.round(embeddings @ jd_embedding / np.where(norms == 0, 1, norms), 4)
+        
+        inputs = scorer.build_batch_inputs(resume_jsons, skill_outputs, texts, skill_extractor.vocabulary)
+        final_scores, components = scorer.calculate_scores_batch(
+            jd_skill_vector=jd_vector, semantic_scores=semantic, **inputs
+        )
+        
+        # The checks that reject or warn about a single upload, as flags
+        ai_results = ai_detector.detect_ai_content_many(texts)
+        
+        for i, (name, text, output) in enumerate(zip(names, texts, skill_outputs)):
+            missing = sorted(set(jd_skills) - set(output["normalized_skills"]))
+            flags = []
+            is_valid_length, _, _, estimated_pages = check_resume_length(text)
+            if not is_valid_length:
+                flags.append(f"📏 {estimated_pages:.1f} pages")
+            if ai_results["is_ai"].iat[i]:
+                label = "AI-generated" if ai_results["confidence"].iat[i] > 60 else "possibly AI"
+                flags.append(f"🤖 {label} ({ai_results['ai_score'].iat[i]:.0f}%)")
+            rows.append({
+                "Resume": name,
+                "ATS Score": float(final_scores[i]),
+                "Skill Match %": round(float(components["skill_match"][i]) * 100, 1),
+                "Semantic Match %": round(float(semantic[i]) * 100, 1),
+                "Completeness %": round(float(components["section_completeness"][i]) * 100, 1),
+                "Matched Skills": len(jd_skills) - len(missing),
+                "Missing Skills": ", ".join(missing[:5]),
+                "Words": len(text.split()),
+                "Flags": " · ".join(flags)
+            })
+    
+    chunk = []
+    done = 0
+    progress = progress_area.progress(0, text=f"📄 Extracting {len(documents)} resumes...")
+    for index, text, error in batch_extractor.extract_many(documents):
+        done += 1
+        name = documents[index][1]
+        if error is None and not text.strip():
+            error = "No text found"
+        if error is None:
+            chunk.append((name, text))
+        else:
+            failed.append((name, error))
+        
+        if len(chunk) >= BATCH_CHUNK or (done == len(documents) and chunk):
+            score(chunk)
+            chunk = []
+            show_ranking_table(table_area, rows)
+        progress.progress(int(done * 100 / len(documents)),
+                          text=f"🤖 Ranked {len(rows)} of {len(documents)} resumes")
+    
+    progress_area.empty()
+    return {"rows": rows, "failed": failed, "ranked_at": datetime.now().strftime('%H:%M:%S')}
+
+def render_batch_ranking():
+    st.markdown("### 🏆 Rank Many Resumes Against One Job")
+    
+    col_b1, col_b2 = st.columns(2)
+    with col_b1:
+        batch_files = st.file_uploader(
+            "Upload resumes (PDF, DOCX, TXT) or ZIP archives of them",
+            type=["pdf", "docx", "txt", "zip"],
+            accept_multiple_files=True,
+            key="batch_upload"
+        )
+    with col_b2:
+        batch_jd = st.text_area(
+            "Paste the target job description here",
+            height=200,
+            key="batch_jd"
+        )
+    
+    rank_button = st.button("🏆 Rank Resumes", use_container_width=True, key="rank_button")
+    progress_area = st.empty()
+    table_area = st.empty()
+    
+    if rank_button:
+        if not batch_files or not batch_jd:
+            st.error("⚠️ Please upload resumes and provide a job description to rank them!")
+        else:
+            documents, rejected = expand_uploads(batch_files)
+            if not documents:
+                st.error("⚠️ No PDF, DOCX or TXT resumes found in the upload!")
+                for name, reason in rejected:
+                    st.markdown(f"• **{name}**: {reason}")
+            else:
+                # Kept in the session: sorting, downloads and other widgets rerun
+                # the script but only redraw the table
+                ranking = rank_resumes(documents, batch_jd, progress_area, table_area)
+                ranking["failed"] = rejected + ranking["failed"]
+                st.session_state["batch_ranking"] = ranking
+    
+    ranking = st.session_state.get("batch_ranking")
+    if ranking is None:
+        return
+    
+    show_ranking_table(table_area, ranking["rows"])
+    st.caption(f"Ranked {len(ranking['rows'])} resumes at {ranking['ranked_at']} – click a column header to sort")
+    flagged = sum(1 for row in ranking["rows"] if row["Flags"])
+    if flagged:
+        st.caption(f"⚠️ {flagged} resume(s) flagged: longer than one page or likely AI-generated. "
+                   f"They are ranked anyway; the single-resume analysis would reject or warn about them.")
+    
+    if ranking["failed"]:
+        with st.expander(f"⚠️ {len(ranking['failed'])} file(s) could not be ranked"):
+            for name, error in ranking["failed"]:
+                st.markdown(f"• **{name}**: {error}")
+    
+    if ranking["rows"]:
+        st.download_button(
+            label="📄 Download Ranking (CSV)",
+            data=ranking_table(ranking["rows"]).to_csv(index=False),
+            file_name=f"resume_ranking_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
 # -------------------------------
 # Header
 # -------------------------------
@@ -292,6 +530,10 @@ with st.sidebar:
     show_detailed = st.checkbox("Show Detailed Analysis", value=True)
     show_skills = st.checkbox("Show Skill Breakdown", value=True)
     show_recommendations = st.checkbox("Show Recommendations", value=True)
+    incremental_mode = st.checkbox(
+        "⚡ Incremental Re-analysis", value=False,
+        help="Only re-analyze the paragraphs you changed since the last run"
+    )
     
     st.divider()
     
@@ -304,508 +546,567 @@ with st.sidebar:
     st.markdown("💡 **Pro Tip:** Use specific keywords from the job description in your resume!")
 
 # Load models
-skill_extractor, matcher, scorer, ai_detector = load_models()
+skill_extractor, matcher, scorer, ai_detector, analyzer, resume_parser = load_models()
+document_extractor = load_document_extractor()
+batch_extractor = load_batch_extractor()
+stage_pool = load_stage_pool()
 
 # -------------------------------
-# Main Content - Two Columns
+# Mode Tabs
 # -------------------------------
-col1, col2 = st.columns(2)
+single_tab, batch_tab = st.tabs(["🎯 Single Resume Analysis", "🏆 Batch Ranking"])
 
-with col1:
-    st.markdown("### 📄 Your Resume")
-    
-    # Upload option
-    upload_tab1, text_tab1 = st.tabs(["📁 Upload File", "✍️ Paste Text"])
-    
-    with upload_tab1:
-        resume_file = st.file_uploader(
-            "Upload your resume (PDF, DOCX, or TXT)",
-            type=["pdf", "docx", "txt"],
-            help="Upload your resume file and we'll extract the text automatically",
-            key="resume_upload"
-        )
+# Batch tab first: the single-resume flow below can st.stop() the script
+with batch_tab:
+    render_batch_ranking()
+
+with single_tab:
+    # -------------------------------
+    # Main Content - Two Columns
+    # -------------------------------
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("### 📄 Your Resume")
         
-        if resume_file:
-            with st.spinner("📄 Extracting text from file..."):
-                resume_text = extract_text_from_file(resume_file)
+        # Upload option
+        upload_tab1, text_tab1 = st.tabs(["📁 Upload File", "✍️ Paste Text"])
+        
+        with upload_tab1:
+            resume_file = st.file_uploader(
+                "Upload your resume (PDF, DOCX, or TXT)",
+                type=["pdf", "docx", "txt"],
+                help="Upload your resume file and we'll extract the text automatically",
+                key="resume_upload"
+            )
             
-            if resume_text:
-                st.success(f"✅ Extracted {len(resume_text)} characters from {resume_file.name}")
-                with st.expander("📝 Preview extracted text"):
-                    st.text_area("Extracted content", resume_text, height=200, key="resume_preview", disabled=True)
+            if resume_file:
+                with st.spinner("📄 Extracting text from file..."):
+                    resume_text = extract_text_from_file(resume_file)
+                
+                if resume_text:
+                    st.success(f"✅ Extracted {len(resume_text)} characters from {resume_file.name}")
+                    with st.expander("📝 Preview extracted text"):
+                        st.text_area("Extracted content", resume_text, height=200, key="resume_preview", disabled=True)
+                else:
+                    resume_text = ""
+                    st.warning("⚠️ Could not extract text. Please try pasting text manually.")
             else:
                 resume_text = ""
-                st.warning("⚠️ Could not extract text. Please try pasting text manually.")
-        else:
-            resume_text = ""
-    
-    with text_tab1:
-        resume_text_manual = st.text_area(
-            "Paste your resume content here",
-            height=300,
-            placeholder="Enter your resume text including skills, experience, education, projects, and certifications...",
-            help="Include all relevant sections: skills, work experience, education, projects, and certifications",
-            key="resume_text"
-        )
         
-        if resume_text_manual:
-            resume_text = resume_text_manual
-            word_count = len(resume_text_manual.split())
-            st.caption(f"📝 Word count: {word_count}")
-
-with col2:
-    st.markdown("### 💼 Job Description")
-    
-    # Upload option
-    upload_tab2, text_tab2 = st.tabs(["📁 Upload File", "✍️ Paste Text"])
-    
-    with upload_tab2:
-        jd_file = st.file_uploader(
-            "Upload job description (PDF, DOCX, or TXT)",
-            type=["pdf", "docx", "txt"],
-            help="Upload the job description file and we'll extract the text automatically",
-            key="jd_upload"
-        )
+        with text_tab1:
+            resume_text_manual = st.text_area(
+                "Paste your resume content here",
+                height=300,
+                placeholder="Enter your resume text including skills, experience, education, projects, and certifications...",
+                help="Include all relevant sections: skills, work experience, education, projects, and certifications",
+                key="resume_text"
+            )
+            
+            if resume_text_manual:
+                resume_text = resume_text_manual
+                word_count = len(resume_text_manual.split())
+                st.caption(f"📝 Word count: {word_count}")
+
+    with col2:
+        st.markdown("### 💼 Job Description")
         
-        if jd_file:
-            with st.spinner("📄 Extracting text from file..."):
-                job_description = extract_text_from_file(jd_file)
+        # Upload option
+        upload_tab2, text_tab2 = st.tabs(["📁 Upload File", "✍️ Paste Text"])
+        
+        with upload_tab2:
+            jd_file = st.file_uploader(
+                "Upload job description (PDF, DOCX, or TXT)",
+                type=["pdf", "docx", "txt"],
+                help="Upload the job description file and we'll extract the text automatically",
+                key="jd_upload"
+            )
             
-            if job_description:
-                st.success(f"✅ Extracted {len(job_description)} characters from {jd_file.name}")
-                with st.expander("📝 Preview extracted text"):
-                    st.text_area("Extracted content", job_description, height=200, key="jd_preview", disabled=True)
+            if jd_file:
+                with st.spinner("📄 Extracting text from file..."):
+                    job_description = extract_text_from_file(jd_file)
+                
+                if job_description:
+                    st.success(f"✅ Extracted {len(job_description)} characters from {jd_file.name}")
+                    with st.expander("📝 Preview extracted text"):
+                        st.text_area("Extracted content", job_description, height=200, key="jd_preview", disabled=True)
+                else:
+                    job_description = ""
+                    st.warning("⚠️ Could not extract text. Please try pasting text manually.")
             else:
                 job_description = ""
-                st.warning("⚠️ Could not extract text. Please try pasting text manually.")
-        else:
-            job_description = ""
-    
-    with text_tab2:
-        job_description_manual = st.text_area(
-            "Paste the target job description here",
-            height=300,
-            placeholder="Enter the complete job description including required skills, qualifications, and responsibilities...",
-            help="Include the full job posting for best results",
-            key="jd_text"
-        )
         
-        if job_description_manual:
-            job_description = job_description_manual
-            word_count = len(job_description_manual.split())
-            st.caption(f"📝 Word count: {word_count}")
+        with text_tab2:
+            job_description_manual = st.text_area(
+                "Paste the target job description here",
+                height=300,
+                placeholder="Enter the complete job description including required skills, qualifications, and responsibilities...",
+                help="Include the full job posting for best results",
+                key="jd_text"
+            )
+            
+            if job_description_manual:
+                job_description = job_description_manual
+                word_count = len(job_description_manual.split())
+                st.caption(f"📝 Word count: {word_count}")
 
-# -------------------------------
-# Analyze Button
-# -------------------------------
-st.markdown("<br>", unsafe_allow_html=True)
+    # -------------------------------
+    # Analyze Button
+    # -------------------------------
+    st.markdown("<br>", unsafe_allow_html=True)
 
-col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
-with col_btn2:
-    analyze_button = st.button("🚀 Analyze Resume", use_container_width=True)
+    col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
+    with col_btn2:
+        analyze_button = st.button("🚀 Analyze Resume", use_container_width=True)
 
-# -------------------------------
-# Analysis Results
-# -------------------------------
-if analyze_button:
-    if not resume_text or not job_description:
-        st.error("⚠️ Please provide both resume text and job description to proceed!")
-    else:
-        # Progress bar for user engagement
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Step 0A: Check Resume Length
-        status_text.text("📏 Checking resume length...")
-        progress_bar.progress(5)
-        is_valid_length, word_count, char_count, estimated_pages = check_resume_length(resume_text)
-        
-        if not is_valid_length:
-            # REJECT if resume is too long
-            st.markdown("---")
-            st.markdown("## 📏 Resume Length Check")
-            st.error(f"### ❌ RESUME REJECTED - TOO LONG")
-            st.error(f"**Your resume exceeds the one-page limit!**")
-            
-            col_len1, col_len2, col_len3 = st.columns(3)
-            
-            with col_len1:
-                st.metric("Word Count", f"{word_count:,}", 
-                         delta=f"+{word_count - 600:,}",
-                         delta_color="inverse")
-            
-            with col_len2:
-                st.metric("Character Count", f"{char_count:,}",
-                         delta=f"+{char_count - 3500:,}",
-                         delta_color="inverse")
-            
-            with col_len3:
-                st.metric("Estimated Pages", f"{estimated_pages:.1f}",
-                         delta=f"+{estimated_pages - 1.0:.1f}",
-                         delta_color="inverse")
-            
-            st.warning("### 📋 One Page Resume Standards:")
-            st.markdown("""
-            - **Maximum Words:** 600 words
-            - **Maximum Characters:** 3,500 characters
-            - **Your Resume:** {:.1f} pages (estimated)
-            
-            **Why One Page?**
-            - ✅ Recruiters spend 6-7 seconds on initial review
-            - ✅ Forces you to highlight only relevant information
-            - ✅ Shows you can communicate concisely
-            - ✅ Industry standard for professionals with <10 years experience
-            """.format(estimated_pages))
-            
-            st.error("### 💡 How to Reduce Your Resume Length:")
-            st.markdown("""
-            1. **Remove outdated experience** - Focus on last 5-7 years
-            2. **Cut redundant details** - Avoid repeating similar points
-            3. **Use bullet points** - Not paragraphs
-            4. **Quantify achievements** - Replace long descriptions with metrics
-            5. **Remove personal statements** - Let your experience speak
-            6. **Eliminate references line** - "References available upon request" is unnecessary
-            7. **Use action verbs** - Start bullets with strong verbs (Developed, Led, Increased)
-            8. **Keep only relevant skills** - Remove outdated or basic skills
-            
-            **Example Reduction:**
-            - ❌ "I was responsible for the development and implementation of a comprehensive marketing strategy that resulted in significant improvements in customer engagement and brand awareness across multiple digital platforms"
-            - ✅ "Developed marketing strategy that increased customer engagement by 40%"
-            """)
-            
-            with st.expander("📊 Detailed Length Analysis"):
-                st.markdown(f"""
-                **Current Statistics:**
-                - Words: {word_count:,} (Limit: 600)
-                - Characters: {char_count:,} (Limit: 3,500)
-                - Estimated Pages: {estimated_pages:.2f}
-                - Words per page: ~600
-                - Characters per page: ~3,500
-                
-                **Reduction Needed:**
-                - Remove approximately **{word_count - 600:,} words**
-                - Or reduce by **{char_count - 3500:,} characters**
-                - Target reduction: **{((estimated_pages - 1.0) / estimated_pages * 100):.1f}%**
-                """)
-            
-            # Stop further processing
-            progress_bar.empty()
-            status_text.empty()
-            st.stop()
-        
+    # -------------------------------
+    # Analysis Results
+    # -------------------------------
+    if analyze_button:
+        if not resume_text or not job_description:
+            st.error("⚠️ Please provide both resume text and job description to proceed!")
         else:
-            # Show length check passed
-            st.markdown("---")
-            st.markdown("## 📏 Resume Length Check")
-            st.success(f"### ✅ LENGTH APPROVED - One Page Resume")
+            # Progress bar for user engagement
+            progress_bar = st.progress(0)
+            status_text = st.empty()
             
-            col_len1, col_len2, col_len3 = st.columns(3)
+            # Step 0A: Check Resume Length
+            status_text.text("📏 Checking resume length...")
+            progress_bar.progress(5)
+            is_valid_length, word_count, char_count, estimated_pages = check_resume_length(resume_text)
             
-            with col_len1:
-                st.metric("Word Count", f"{word_count:,}",
-                         delta=f"{600 - word_count:,} remaining")
-            
-            with col_len2:
-                st.metric("Character Count", f"{char_count:,}",
-                         delta=f"{3500 - char_count:,} remaining")
-            
-            with col_len3:
-                st.metric("Estimated Pages", f"{estimated_pages:.2f}",
-                         delta="Within limit ✓",
-                         delta_color="off")
-        
-        # Step 0B: AI Detection
-        status_text.text("🔍 Checking if resume is human-written...")
-        progress_bar.progress(10)
-        is_ai, ai_score, ai_details = ai_detector.detect_ai_content(resume_text)
-        recommendation = ai_detector.get_recommendation(is_ai, ai_details['confidence'])
-        
-        # Display AI Detection Results
-        st.markdown("---")
-        st.markdown("## 🤖 AI Content Detection")
-        
-        if is_ai and ai_details['confidence'] > 60:
-            # REJECT if AI-generated with high confidence
-            st.error(f"### ❌ RESUME REJECTED")
-            st.error(recommendation)
-            
-            col_ai1, col_ai2 = st.columns(2)
-            
-            with col_ai1:
-                st.metric("AI Probability", f"{ai_details['ai_probability']:.1f}%", 
-                         delta=f"{ai_details['ai_probability'] - 50:.1f}%",
-                         delta_color="inverse")
-                st.metric("Confidence", f"{ai_details['confidence']:.1f}%")
-            
-            with col_ai2:
-                st.metric("Human Probability", f"{ai_details['human_probability']:.1f}%",
-                         delta=f"{ai_details['human_probability'] - 50:.1f}%")
-                st.metric("Verdict", ai_details['verdict'])
-            
-            # Show detailed metrics
-            with st.expander("📊 Detection Metrics Details"):
-                metrics_df = pd.DataFrame([
-                    {"Metric": "Perplexity", "Value": ai_details['metrics']['perplexity'], "Indicator": "Lower = More AI-like"},
-                    {"Metric": "Burstiness", "Value": ai_details['metrics']['burstiness'], "Indicator": "Higher = More Human-like"},
-                    {"Metric": "AI Phrases Found", "Value": ai_details['metrics']['ai_phrases_found'], "Indicator": "Higher = More AI-like"},
-                    {"Metric": "Repetition Rate", "Value": f"{ai_details['metrics']['repetition_rate']:.1f}%", "Indicator": "Higher = More AI-like"},
-                    {"Metric": "Formality Score", "Value": f"{ai_details['metrics']['formality_score']:.1f}%", "Indicator": "Higher = More AI-like"}
-                ])
-                st.dataframe(metrics_df, use_container_width=True)
+            if not is_valid_length:
+                # REJECT if resume is too long
+                st.markdown("---")
+                st.markdown("## 📏 Resume Length Check")
+                st.error(f"### ❌ RESUME REJECTED - TOO LONG")
+                st.error(f"**Your resume exceeds the one-page limit!**")
+                
+                col_len1, col_len2, col_len3 = st.columns(3)
+                
+                with col_len1:
+                    st.metric("Word Count", f"{word_count:,}", 
+                             delta=f"+{word_count - 600:,}",
+                             delta_color="inverse")
+                
+                with col_len2:
+                    st.metric("Character Count", f"{char_count:,}",
+                             delta=f"+{char_count - 3500:,}",
+                             delta_color="inverse")
+                
+                with col_len3:
+                    st.metric("Estimated Pages", f"{estimated_pages:.1f}",
+                             delta=f"+{estimated_pages - 1.0:.1f}",
+                             delta_color="inverse")
+                
+                st.warning("### 📋 One Page Resume Standards:")
+                st.markdown("""
+                - **Maximum Words:** 600 words
+                - **Maximum Characters:** 3,500 characters
+                - **Your Resume:** {:.1f} pages (estimated)
+                
+                **Why One Page?**
+                - ✅ Recruiters spend 6-7 seconds on initial review
+                - ✅ Forces you to highlight only relevant information
+                - ✅ Shows you can communicate concisely
+                - ✅ Industry standard for professionals with <10 years experience
+                """.format(estimated_pages))
+                
+                st.error("### 💡 How to Reduce Your Resume Length:")
+                st.markdown("""
+                1. **Remove outdated experience** - Focus on last 5-7 years
+                2. **Cut redundant details** - Avoid repeating similar points
+                3. **Use bullet points** - Not paragraphs
+                4. **Quantify achievements** - Replace long descriptions with metrics
+                5. **Remove personal statements** - Let your experience speak
+                6. **Eliminate references line** - "References available upon request" is unnecessary
+                7. **Use action verbs** - Start bullets with strong verbs (Developed, Led, Increased)
+                8. **Keep only relevant skills** - Remove outdated or basic skills
+                
+                **Example Reduction:**
+                - ❌ "I was responsible for the development and implementation of a comprehensive marketing strategy that resulted in significant improvements in customer engagement and brand awareness across multiple digital platforms"
+                - ✅ "Developed marketing strategy that increased customer engagement by 40%"
+                """)
+                
+                with st.expander("📊 Detailed Length Analysis"):
+                    st.markdown(f"""
+                    **Current Statistics:**
+                    - Words: {word_count:,} (Limit: 600)
+                    - Characters: {char_count:,} (Limit: 3,500)
+                    - Estimated Pages: {estimated_pages:.2f}
+                    - Words per page: ~600
+                    - Characters per page: ~3,500
+                    
+                    **Reduction Needed:**
+                    - Remove approximately **{word_count - 600:,} words**
+                    - Or reduce by **{char_count - 3500:,} characters**
+                    - Target reduction: **{((estimated_pages - 1.0) / estimated_pages * 100):.1f}%**
+                    """)
+                
+                # Stop further processing
+                progress_bar.empty()
+                status_text.empty()
+                st.stop()
             
-            st.warning("### 💡 How to Fix This:")
-            st.markdown("""
-            1. **Rewrite in your own words** - Add personal experiences and specific examples
-            2. **Use natural language** - Write like you speak, avoid overly formal phrases
-            3. **Add specifics** - Include concrete numbers, project names, and real outcomes
-            4. **Show personality** - Let your unique voice and experience shine through
-            5. **Avoid generic phrases** - Remove clichés like "results-driven" and "proven track record"
-            """)
+            else:
+                # Show length check passed
+                st.markdown("---")
+                st.markdown("## 📏 Resume Length Check")
+                st.success(f"### ✅ LENGTH APPROVED - One Page Resume")
+                
+                col_len1, col_len2, col_len3 = st.columns(3)
+                
+                with col_len1:
+                    st.metric("Word Count", f"{word_count:,}",
+                             delta=f"{600 - word_count:,} remaining")
+                
+                with col_len2:
+                    st.metric("Character Count", f"{char_count:,}",
+                             delta=f"{3500 - char_count:,} remaining")
+                
+                with col_len3:
+                    st.metric("Estimated Pages", f"{estimated_pages:.2f}",
+                             delta="Within limit ✓",
+                             delta_color="off")
             
-            # Stop further processing
-            progress_bar.empty()
-            status_text.empty()
-            st.stop()
-        
-        elif is_ai:
-            # Warning but continue
-            st.warning(f"### ⚠️ AI Detection Warning")
-            st.warning(recommendation)
+            # Remaining stages run concurrently; each section is filled into its
+            # placeholder (in page order) as soon as the stages it needs finish
+            block_stats = {}
+            stages = start_analysis(resume_text, job_description, incremental_mode, block_stats)
+            stage_labels = {
+                "semantic": "AI semantic analysis",
+                "ai": "AI content detection",
+                "skills": "resume skills",
+                "jd_skills": "job description skills",
+                "sections": "resume sections"
+            }
             
-            col_ai1, col_ai2 = st.columns(2)
-            with col_ai1:
-                st.metric("AI Probability", f"{ai_details['ai_probability']:.1f}%")
-            with col_ai2:
-                st.metric("Human Probability", f"{ai_details['human_probability']:.1f}%")
+            ai_area = st.empty()
+            results_header = st.empty()
+            score_area = st.empty()
+            skills_area = st.empty()
+            categories_area = st.empty()
+            sections_area = st.empty()
             
-            st.info("📝 **Continuing with analysis**, but consider rewriting for better authenticity...")
-        
-        else:
-            # Accepted - Human-written
-            st.success(f"### ✅ RESUME ACCEPTED")
-            st.success(recommendation)
+            with results_header.container():
+                st.markdown("---")
+                st.markdown("## 📊 Analysis Results")
+            score_area.info("🤖 Running AI semantic analysis...")
             
-            col_ai1, col_ai2 = st.columns(2)
-            with col_ai1:
-                st.metric("Human Probability", f"{ai_details['human_probability']:.1f}%",
-                         delta=f"+{ai_details['confidence']:.1f}%")
-            with col_ai2:
-                st.metric("Authenticity", "Verified ✓")
-        
-        # Step 1: Skill Extraction
-        status_text.text("🔍 Extracting skills from resume...")
-        progress_bar.progress(25)
-        skill_output = skill_extractor.extract(resume_text)
-        
-        # Step 2: JD Analysis
-        status_text.text("📋 Analyzing job description...")
-        progress_bar.progress(50)
-        jd_skill_output = skill_extractor.extract(job_description)
-        jd_skills = jd_skill_output["normalized_skills"]
-        
-        # Step 3: Semantic Matching
-        status_text.text("🤖 Running AI semantic analysis...")
-        progress_bar.progress(75)
-        semantic_score = matcher.match(resume_text, job_description)
-        
-        # Step 4: ATS Scoring
-        status_text.text("📊 Calculating ATS score...")
-        progress_bar.progress(90)
-        resume_json = {
-            "skills": skill_output["normalized_skills"],
-            "experience": resume_text,
-            "education": resume_text,
-            "projects": resume_text
-        }
-        
-        final_score, breakdown = scorer.calculate_score(
-            resume_json=resume_json,
-            skill_output=skill_output,
-            jd_skills=jd_skills,
-            semantic_score=semantic_score,
-            resume_text=resume_text
-        )
-        
-        progress_bar.progress(100)
-        status_text.text("✅ Analysis complete!")
-        
-        # Clear progress indicators
-        import time
-        time.sleep(0.5)
-        progress_bar.empty()
-        status_text.empty()
-        
-        # -------------------------------
-        # Display Results
-        # -------------------------------
-        st.markdown("---")
-        st.markdown("## 📊 Analysis Results")
-        
-        # Overall Score with visual indicator
-        score_color = "🟢" if final_score >= 85 else "🟡" if final_score >= 70 else "🔴"
-        st.markdown(f"### {score_color} Overall ATS Score: **{final_score:.1f}/100**")
-        
-        if final_score >= 85:
-            st.success("🎉 **Excellent!** Your resume is a strong match – highly likely to be shortlisted!")
-        elif final_score >= 70:
-            st.info("👍 **Good!** Your resume is a decent match – minor improvements could help!")
-        else:
-            st.warning("⚠️ **Needs Work!** Your resume needs optimization to improve your chances!")
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Gauge Chart for Overall Score
-        col_g1, col_g2 = st.columns(2)
-        
-        with col_g1:
-            st.plotly_chart(create_gauge_chart(final_score, "ATS Score"), use_container_width=True)
-        
-        with col_g2:
-            st.plotly_chart(create_breakdown_chart(breakdown), use_container_width=True)
-        
-        # Detailed Breakdown
-        if show_detailed:
-            st.markdown("---")
-            st.markdown("### 📈 Detailed Score Breakdown")
-            
-            cols = st.columns(5)
-            metrics = [
-                ("Skill Match", breakdown["skill_match"], "🎯"),
-                ("Semantic Match", breakdown["semantic_match"], "🤖"),
-                ("Completeness", breakdown["section_completeness"], "📋"),
-                ("Balance", breakdown["category_balance"], "⚖️"),
-                ("Formatting", breakdown["formatting"], "✨")
-            ]
-            
-            for col, (name, value, icon) in zip(cols, metrics):
-                with col:
-                    st.metric(
-                        label=f"{icon} {name}",
-                        value=f"{value * 100:.1f}%",
-                        delta=f"{(value * 100) - 70:.1f}%" if value * 100 != 70 else "0%"
+            status_text.text("🔍 Checking if resume is human-written and extracting skills...")
+            progress_bar.progress(10)
+            results = {}
+            names = {future: name for name, future in stages.items()}
+            for future in as_completed(names):
+                name = names[future]
+                results[name] = future.result()
+                progress_bar.progress(10 + 80 * len(results) // len(stages))
+                waiting = [label for stage, label in stage_labels.items() if stage not in results]
+                if waiting:
+                    status_text.text(f"⏳ Waiting for {', '.join(waiting)}...")
+                
+                # AI Detection
+                if name == "ai":
+                    is_ai, ai_score, ai_details = results["ai"]
+                    recommendation = ai_detector.get_recommendation(is_ai, ai_details['confidence'])
+                    rejected = is_ai and ai_details['confidence'] > 60
+                    
+                    with ai_area.container():
+                        st.markdown("---")
+                        st.markdown("## 🤖 AI Content Detection")
+                        
+                        near_duplicates = ai_details.get('near_duplicates')
+                        if near_duplicates:
+                            best = near_duplicates[0]
+                            st.warning(f"🧬 Near-duplicate of {len(near_duplicates)} resume(s) in the corpus "
+                                       f"(closest: {best['doc_id']}, {best['similarity']:.0%} similar). "
+                                       f"It may come from a shared template or generator.")
+                        
+                        if is_ai and ai_details['confidence'] > 60:
+                            # REJECT if AI-generated with high confidence
+                            st.error(f"### ❌ RESUME REJECTED")
+                            st.error(recommendation)
+                            
+                            col_ai1, col_ai2 = st.columns(2)
+                            
+                            with col_ai1:
+                                st.metric("AI Probability", f"{ai_details['ai_probability']:.1f}%", 
+                                         delta=f"{ai_details['ai_probability'] - 50:.1f}%",
+                                         delta_color="inverse")
+                                st.metric("Confidence", f"{ai_details['confidence']:.1f}%")
+                            
+                            with col_ai2:
+                                st.metric("Human Probability", f"{ai_details['human_probability']:.1f}%",
+                                         delta=f"{ai_details['human_probability'] - 50:.1f}%")
+                                st.metric("Verdict", ai_details['verdict'])
+                            
+                            # Show detailed metrics
+                            with st.expander("📊 Detection Metrics Details"):
+                                metrics_df = pd.DataFrame([
+                                    {"Metric": "Perplexity", "Value": ai_details['metrics']['perplexity'], "Indicator": "Lower = More AI-like"},
+                                    {"Metric": "Burstiness", "Value": ai_details['metrics']['burstiness'], "Indicator": "Higher = More Human-like"},
+                                    {"Metric": "AI Phrases Found", "Value": ai_details['metrics']['ai_phrases_found'], "Indicator": "Higher = More AI-like"},
+                                    {"Metric": "Repetition Rate", "Value": f"{ai_details['metrics']['repetition_rate']:.1f}%", "Indicator": "Higher = More AI-like"},
+                                    {"Metric": "Formality Score", "Value": f"{ai_details['metrics']['formality_score']:.1f}%", "Indicator": "Higher = More AI-like"}
+                                ])
+                                st.dataframe(metrics_df, use_container_width=True)
+                            
+                            st.warning("### 💡 How to Fix This:")
+                            st.markdown("""
+                            1. **Rewrite in your own words** - Add personal experiences and specific examples
+                            2. **Use natural language** - Write like you speak, avoid overly formal phrases
+                            3. **Add specifics** - Include concrete numbers, project names, and real outcomes
+                            4. **Show personality** - Let your unique voice and experience shine through
+                            5. **Avoid generic phrases** - Remove clichés like "results-driven" and "proven track record"
+                            """)
+                        
+                        elif is_ai:
+                            # Warning but continue
+                            st.warning(f"### ⚠️ AI Detection Warning")
+                            st.warning(recommendation)
+                            
+                            col_ai1, col_ai2 = st.columns(2)
+                            with col_ai1:
+                                st.metric("AI Probability", f"{ai_details['ai_probability']:.1f}%")
+                            with col_ai2:
+                                st.metric("Human Probability", f"{ai_details['human_probability']:.1f}%")
+                            
+                            st.info("📝 **Continuing with analysis**, but consider rewriting for better authenticity...")
+                        
+                        else:
+                            # Accepted - Human-written
+                            st.success(f"### ✅ RESUME ACCEPTED")
+                            st.success(recommendation)
+                            
+                            col_ai1, col_ai2 = st.columns(2)
+                            with col_ai1:
+                                st.metric("Human Probability", f"{ai_details['human_probability']:.1f}%",
+                                         delta=f"+{ai_details['confidence']:.1f}%")
+                            with col_ai2:
+                                st.metric("Authenticity", "Verified ✓")
+                    
+                    if rejected:
+                        # Stop further processing (stages already running finish in the background)
+                        for stage in stages.values():
+                            stage.cancel()
+                        for area in [results_header, score_area, skills_area, categories_area, sections_area]:
+                            area.empty()
+                        progress_bar.empty()
+                        status_text.empty()
+                        st.stop()
+                
+                # Skill Extraction and JD Analysis
+                elif name in ("skills", "jd_skills") and "skills" in results and "jd_skills" in results:
+                    skill_output = results["skills"]
+                    jd_skills = results["jd_skills"]["normalized_skills"]
+                    fig_skills, matched, resume_only, jd_only = create_skill_comparison(
+                        skill_output["normalized_skills"],
+                        jd_skills
                     )
-        
-        # Skill Analysis
-        if show_skills:
-            st.markdown("---")
-            st.markdown("### 🎯 Skill Gap Analysis")
+                    
+                    with skills_area.container():
+                        if show_skills:
+                            st.markdown("---")
+                            st.markdown("### 🎯 Skill Gap Analysis")
+                            
+                            st.plotly_chart(fig_skills, use_container_width=True)
+                            
+                            col_sk1, col_sk2, col_sk3 = st.columns(3)
+                            
+                            with col_sk1:
+                                st.markdown("#### ✅ Matched Skills")
+                                st.success(f"**{len(matched)}** skills matched")
+                                if matched:
+                                    for skill in sorted(matched):
+                                        st.markdown(f"<span class='skill-badge'>✓ {skill}</span>", unsafe_allow_html=True)
+                                else:
+                                    st.info("No matched skills found")
+                            
+                            with col_sk2:
+                                st.markdown("#### 💼 Your Extra Skills")
+                                st.info(f"**{len(resume_only)}** additional skills")
+                                if resume_only:
+                                    for skill in sorted(list(resume_only)[:10]):
+                                        st.markdown(f"<span class='skill-badge'>• {skill}</span>", unsafe_allow_html=True)
+                                    if len(resume_only) > 10:
+                                        st.caption(f"...and {len(resume_only) - 10} more")
+                            
+                            with col_sk3:
+                                st.markdown("#### ⚠️ Missing Skills")
+                                st.warning(f"**{len(jd_only)}** skills needed")
+                                if jd_only:
+                                    for skill in sorted(list(jd_only)[:10]):
+                                        st.markdown(f"<span class='skill-badge'>! {skill}</span>", unsafe_allow_html=True)
+                                    if len(jd_only) > 10:
+                                        st.caption(f"...and {len(jd_only) - 10} more")
+                    
+                    with categories_area.container():
+                        # Skill Categories
+                        st.markdown("---")
+                        st.markdown("### 🏷️ Your Skills by Category")
+                        
+                        if skill_output.get("skill_categories"):
+                            cat_cols = st.columns(len(skill_output["skill_categories"]))
+                            for col, (category, skills) in zip(cat_cols, skill_output["skill_categories"].items()):
+                                with col:
+                                    st.markdown(f"**{category}**")
+                                    for skill in skills:
+                                        st.markdown(f"• {skill}")
+                
+                # Parsed Sections
+                elif name == "sections":
+                    resume_json = results["sections"]
+                    with sections_area.container():
+                        with st.expander("📄 Parsed Resume Sections"):
+                            col_p1, col_p2 = st.columns(2)
+                            with col_p1:
+                                st.markdown("**🎓 Education**")
+                                st.write(resume_json["education"] or "Not found")
+                                st.markdown("**🚀 Projects**")
+                                for project in resume_json["projects"] or ["Not found"]:
+                                    st.markdown(f"• {project}")
+                            with col_p2:
+                                st.markdown("**💼 Experience**")
+                                st.write(resume_json["experience"] or "Not found")
+                                st.markdown("**📜 Certifications**")
+                                for certification in resume_json["certifications"] or ["Not found"]:
+                                    st.markdown(f"• {certification}")
             
-            fig_skills, matched, resume_only, jd_only = create_skill_comparison(
-                skill_output["normalized_skills"],
-                jd_skills
+            # ATS Scoring
+            status_text.text("📊 Calculating ATS score...")
+            progress_bar.progress(90)
+            resume_json["skills"] = skill_output["normalized_skills"]
+            semantic_score = results["semantic"]
+            final_score, breakdown = scorer.calculate_score(
+                resume_json=resume_json,
+                skill_output=skill_output,
+                jd_skills=jd_skills,
+                semantic_score=semantic_score,
+                resume_text=resume_text
             )
             
-            st.plotly_chart(fig_skills, use_container_width=True)
-            
-            col_sk1, col_sk2, col_sk3 = st.columns(3)
+            # Clear progress indicators
+            progress_bar.empty()
+            status_text.empty()
             
-            with col_sk1:
-                st.markdown("#### ✅ Matched Skills")
-                st.success(f"**{len(matched)}** skills matched")
-                if matched:
-                    for skill in sorted(matched):
-                        st.markdown(f"<span class='skill-badge'>✓ {skill}</span>", unsafe_allow_html=True)
+            with score_area.container():
+                if "embeddings" in block_stats:
+                    stats = block_stats["embeddings"]
+                    st.caption(f"⚡ Incremental mode: re-analyzed {stats['recomputed']} of {stats['blocks']} resume blocks")
+                
+                # Overall Score with visual indicator
+                score_color = "🟢" if final_score >= 85 else "🟡" if final_score >= 70 else "🔴"
+                st.markdown(f"### {score_color} Overall ATS Score: **{final_score:.1f}/100**")
+                
+                if final_score >= 85:
+                    st.success("🎉 **Excellent!** Your resume is a strong match – highly likely to be shortlisted!")
+                elif final_score >= 70:
+                    st.info("👍 **Good!** Your resume is a decent match – minor improvements could help!")
                 else:
-                    st.info("No matched skills found")
+                    st.warning("⚠️ **Needs Work!** Your resume needs optimization to improve your chances!")
+                
+                st.markdown("<br>", unsafe_allow_html=True)
+                
+                # Gauge Chart for Overall Score
+                col_g1, col_g2 = st.columns(2)
+                
+                with col_g1:
+                    st.plotly_chart(create_gauge_chart(final_score, "ATS Score"), use_container_width=True)
+                
+                with col_g2:
+                    st.plotly_chart(create_breakdown_chart(breakdown), use_container_width=True)
+                
+                # Detailed Breakdown
+                if show_detailed:
+                    st.markdown("---")
+                    st.markdown("### 📈 Detailed Score Breakdown")
+                    
+                    cols = st.columns(5)
+                    metrics = [
+                        ("Skill Match", breakdown["skill_match"], "🎯"),
+                        ("Semantic Match", breakdown["semantic_match"], "🤖"),
+                        ("Completeness", breakdown["section_completeness"], "📋"),
+                        ("Balance", breakdown["category_balance"], "⚖️"),
+                        ("Formatting", breakdown["formatting"], "✨")
+                    ]
+                    
+                    for col, (name, value, icon) in zip(cols, metrics):
+                        with col:
+                            st.metric(
+                                label=f"{icon} {name}",
+                                value=f"{value * 100:.1f}%",
+                                delta=f"{(value * 100) - 70:.1f}%" if value * 100 != 70 else "0%"
+                            )
             
-            with col_sk2:
-                st.markdown("#### 💼 Your Extra Skills")
-                st.info(f"**{len(resume_only)}** additional skills")
-                if resume_only:
-                    for skill in sorted(list(resume_only)[:10]):
-                        st.markdown(f"<span class='skill-badge'>• {skill}</span>", unsafe_allow_html=True)
-                    if len(resume_only) > 10:
-                        st.caption(f"...and {len(resume_only) - 10} more")
+            # Recommendations
+            if show_recommendations:
+                st.markdown("---")
+                st.markdown("### 💡 Recommendations to Improve Your Score")
+                
+                recommendations = []
+                
+                if breakdown["skill_match"] < 0.7:
+                    recommendations.append(("🎯 **Add Missing Skills**", 
+                        f"Your skill match is {breakdown['skill_match']*100:.1f}%. Add these skills: {', '.join(list(jd_only)[:5])}"))
+                
+                if breakdown["semantic_match"] < 0.7:
+                    recommendations.append(("📝 **Improve Content Relevance**",
+                        f"Your semantic match is {breakdown['semantic_match']*100:.1f}%. Use more keywords from the job description in context."))
+                
+                if breakdown["section_completeness"] < 1.0:
+                    missing_sections = [sec.capitalize() for sec in scorer.SECTIONS if not resume_json.get(sec)]
+                    recommendations.append(("📋 **Complete All Sections**",
+                        f"No {', '.join(missing_sections)} section found. Add clearly titled sections for each."))
+                
+                if breakdown["category_balance"] < 0.7:
+                    recommendations.append(("⚖️ **Balance Skill Categories**",
+                        "Diversify your skills across Programming, Frameworks, Tools, and Domain Knowledge."))
+                
+                if breakdown["formatting"] < 0.7:
+                    recommendations.append(("✨ **Improve Formatting**",
+                        "Ensure your resume is well-structured with clear sections and bullet points."))
+                
+                if not recommendations:
+                    st.success("🎉 **Excellent work!** Your resume is well-optimized!")
+                else:
+                    for i, (title, desc) in enumerate(recommendations, 1):
+                        with st.expander(f"{i}. {title}"):
+                            st.write(desc)
             
-            with col_sk3:
-                st.markdown("#### ⚠️ Missing Skills")
-                st.warning(f"**{len(jd_only)}** skills needed")
-                if jd_only:
-                    for skill in sorted(list(jd_only)[:10]):
-                        st.markdown(f"<span class='skill-badge'>! {skill}</span>", unsafe_allow_html=True)
-                    if len(jd_only) > 10:
-                        st.caption(f"...and {len(jd_only) - 10} more")
-        
-        # Skill Categories
-        st.markdown("---")
-        st.markdown("### 🏷️ Your Skills by Category")
-        
-        if skill_output.get("skill_categories"):
-            cat_cols = st.columns(len(skill_output["skill_categories"]))
-            for col, (category, skills) in zip(cat_cols, skill_output["skill_categories"].items()):
-                with col:
-                    st.markdown(f"**{category}**")
-                    for skill in skills:
-                        st.markdown(f"• {skill}")
-        
-        # Recommendations
-        if show_recommendations:
+            # Download Results
             st.markdown("---")
-            st.markdown("### 💡 Recommendations to Improve Your Score")
-            
-            recommendations = []
-            
-            if breakdown["skill_match"] < 0.7:
-                recommendations.append(("🎯 **Add Missing Skills**", 
-                    f"Your skill match is {breakdown['skill_match']*100:.1f}%. Add these skills: {', '.join(list(jd_only)[:5])}"))
+            st.markdown("### 📥 Export Results")
             
-            if breakdown["semantic_match"] < 0.7:
-                recommendations.append(("📝 **Improve Content Relevance**",
-                    f"Your semantic match is {breakdown['semantic_match']*100:.1f}%. Use more keywords from the job description in context."))
-            
-            if breakdown["section_completeness"] < 1.0:
-                recommendations.append(("📋 **Complete All Sections**",
-                    "Make sure your resume includes: Experience, Education, Skills, and Projects sections."))
-            
-            if breakdown["category_balance"] < 0.7:
-                recommendations.append(("⚖️ **Balance Skill Categories**",
-                    "Diversify your skills across Programming, Frameworks, Tools, and Domain Knowledge."))
-            
-            if breakdown["formatting"] < 0.7:
-                recommendations.append(("✨ **Improve Formatting**",
-                    "Ensure your resume is well-structured with clear sections and bullet points."))
-            
-            if not recommendations:
-                st.success("🎉 **Excellent work!** Your resume is well-optimized!")
-            else:
-                for i, (title, desc) in enumerate(recommendations, 1):
-                    with st.expander(f"{i}. {title}"):
-                        st.write(desc)
-        
-        # Download Results
-        st.markdown("---")
-        st.markdown("### 📥 Export Results")
-        
-        results_text = f"""
-ATS RESUME ANALYSIS REPORT
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-========================
+            results_text = f"""
+    ATS RESUME ANALYSIS REPORT
+    Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+    ========================
 
-OVERALL SCORE: {final_score:.1f}/100
+    OVERALL SCORE: {final_score:.1f}/100
 
-SCORE BREAKDOWN:
-- Skill Match: {breakdown['skill_match']*100:.1f}%
-- Semantic Match: {breakdown['semantic_match']*100:.1f}%
-- Section Completeness: {breakdown['section_completeness']*100:.1f}%
-- Category Balance: {breakdown['category_balance']*100:.1f}%
-- Formatting: {breakdown['formatting']*100:.1f}%
+    SCORE BREAKDOWN:
+    - Skill Match: {breakdown['skill_match']*100:.1f}%
+    - Semantic Match: {breakdown['semantic_match']*100:.1f}%
+    - Section Completeness: {breakdown['section_completeness']*100:.1f}%
+    - Category Balance: {breakdown['category_balance']*100:.1f}%
+    - Formatting: {breakdown['formatting']*100:.1f}%
 
-MATCHED SKILLS ({len(matched)}):
-{', '.join(sorted(matched))}
+    MATCHED SKILLS ({len(matched)}):
+    {', '.join(sorted(matched))}
 
-MISSING SKILLS ({len(jd_only)}):
-{', '.join(sorted(jd_only))}
+    MISSING SKILLS ({len(jd_only)}):
+    {', '.join(sorted(jd_only))}
 
-YOUR ADDITIONAL SKILLS ({len(resume_only)}):
-{', '.join(sorted(resume_only))}
-"""
-        
-        st.download_button(
-            label="📄 Download Analysis Report",
-            data=results_text,
-            file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-            mime="text/plain"
-        )
+    YOUR ADDITIONAL SKILLS ({len(resume_only)}):
+    {', '.join(sorted(resume_only))}
+    """
+            
+            st.download_button(
+                label="📄 Download Analysis Report",
+                data=results_text,
+                file_name=f"resume_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                mime="text/plain"
+            )
 
 # -------------------------------
 # Footer
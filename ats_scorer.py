@@ -1,7 +1,27 @@
 # backend/ats_scorer.py
 
+import json
+import numpy as np
+
+
+def round_scores(values):
+    """
+    Vectorized round(v, 2) with Python's semantics. np.round rounds v * 100,
+    which can land on the other side of a .5 tie; the few values that close
+    to a tie are rounded with Python's correctly-rounded round() instead.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in near_tie:
+        rounded[i] = round(float(values[i]), 2)
+    return rounded
+
+
 class ATSScorer:
-    def __init__(self):
+    def __init__(self, weights=None):
         self.weights = {
             "skill_match": 0.35,
             "semantic_match": 0.25,
@@ -10,6 +30,25 @@ class ATSScorer:
             "formatting": 0.10
         }
 
+        if weights:
+            unknown = set(weights) - set(self.weights)
+            if unknown:
+                raise ValueError(f"Unknown score components: {sorted(unknown)}")
+            self.weights.update(weights)
+
+        # Scores without semantic_match are re-normalized by the other weights
+        if any(w < 0 for w in self.weights.values()):
+            raise ValueError("Score weights must be non-negative")
+        if sum(w for k, w in self.weights.items() if k != "semantic_match") <= 0:
+            raise ValueError("Weights other than semantic_match must not all be zero")
+
+    @classmethod
+    def from_file(cls, path):
+        """Load weights written by calibrate_weights.py (or a plain JSON dict)"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("weights", data))
+
     # -------------------------------
     # 1️⃣ Skill Match Score
     # -------------------------------
@@ -73,8 +112,132 @@ class ATSScorer:
         )
         scores["formatting"] = self.formatting_score(resume_text)
 
+        # Weights are normalized over the available components: components
+        # that could not be computed (None) are dropped, e.g. semantic_match
+        # under a deadline, and custom weights need not sum to 1
+        available = [k for k in scores if scores[k] is not None]
+
         final_score = sum(
-            scores[k] * self.weights[k] for k in scores
+            scores[k] * self.weights[k] for k in available
         )
+        final_score /= sum(self.weights[k] for k in available)
 
         return round(final_score * 100, 2), scores
+
+    # -------------------------------
+    # BATCH SCORING (vectorized)
+    # -------------------------------
+    SECTIONS = ["skills", "experience", "education", "projects"]
+
+    def build_batch_inputs(self, resume_jsons, skill_outputs, resume_texts, vocabulary):
+        """
+        Turn per-candidate scalar inputs into the arrays used by
+        calculate_scores_batch. `vocabulary` is the ordered skill list
+        (e.g. SkillExtractor.vocabulary).
+        """
+        skill_ids = {skill: i for i, skill in enumerate(vocabulary)}
+        n = len(resume_jsons)
+
+        skill_matrix = np.zeros((n, len(vocabulary)), dtype=bool)
+        categories = sorted({c for o in skill_outputs for c in o["skill_categories"]})
+        category_ids = {c: i for i, c in enumerate(categories)}
+        category_flags = np.zeros((n, len(categories)), dtype=bool)
+
+        for row, output in enumerate(skill_outputs):
+            skill_matrix[row, [skill_ids[s] for s in set(output["normalized_skills"])]] = True
+            for category, skills in output["skill_categories"].items():
+                category_flags[row, category_ids[category]] = bool(skills)
+
+        section_flags = np.array(
+            [[bool(r.get(sec)) for sec in self.SECTIONS] for r in resume_jsons],
+            dtype=bool
+        ).reshape(n, len(self.SECTIONS))
+
+        return {
+            "skill_matrix": skill_matrix,
+            "section_flags": section_flags,
+            "category_flags": category_flags,
+            "text_lengths": np.array([len(t) for t in resume_texts], dtype=np.int64),
+            "is_upper": np.array([t.isupper() for t in resume_texts], dtype=bool)
+        }
+
+    def calculate_scores_batch(
+        self,
+        skill_matrix,
+        jd_skill_vector,
+        semantic_scores,
+        section_flags,
+        category_flags,
+        text_lengths,
+        is_upper
+    ):
+        """
+        Score n candidates at once, bit-for-bit consistent with calculate_score.
+
+        skill_matrix     (n, vocab) bool, or np.packbits(..., axis=1) uint8
+        jd_skill_vector  (vocab,) bool
+        semantic_scores  (n,) float, NaN = unavailable (weights re-normalized)
+        section_flags    (n, 4) bool for skills/experience/education/projects
+        category_flags   (n, categories) bool, True = non-empty category
+        text_lengths     (n,) resume character counts
+        is_upper         (n,) bool, resume_text.isupper()
+
+        Returns (final_scores, components) where components maps each
+        score name to an (n,) float64 array.
+        """
+        jd_skill_vector = np.asarray(jd_skill_vector, dtype=bool)
+        skill_matrix = np.asarray(skill_matrix)
+
+        if skill_matrix.dtype == np.uint8:
+            jd_bits = np.packbits(jd_skill_vector)
+            matched = np.unpackbits(skill_matrix & jd_bits, axis=1).sum(axis=1)
+        else:
+            matched = (skill_matrix & jd_skill_vector).sum(axis=1)
+
+        jd_count = int(jd_skill_vector.sum())
+        semantic = np.asarray(semantic_scores, dtype=np.float64)
+        n = len(semantic)
+
+        scores = {}
+        if jd_count:
+            scores["skill_match"] = matched / jd_count
+        else:
+            scores["skill_match"] = np.zeros(n)
+
+        scores["semantic_match"] = semantic
+        scores["section_completeness"] = (
+            np.asarray(section_flags, dtype=bool).sum(axis=1) / len(self.SECTIONS)
+        )
+        scores["category_balance"] = np.minimum(
+            np.asarray(category_flags, dtype=bool).reshape(n, -1).sum(axis=1) / 4, 1.0
+        )
+
+        # Same operation order as formatting_score: 0 (+0.3) (+0.4)
+        penalty = np.zeros(n)
+        penalty = penalty + np.where(np.asarray(text_lengths) < 300, 0.3, 0.0)
+        penalty = penalty + np.where(np.asarray(is_upper, dtype=bool), 0.4, 0.0)
+        scores["formatting"] = np.maximum(0.0, 1.0 - penalty)
+
+        return self.combine_batch(scores), scores
+
+    def combine_batch(self, scores):
+        """
+        Weighted final scores from per-component arrays (NaN semantic_match
+        = unavailable), rounded exactly like calculate_score
+        """
+        semantic = np.asarray(scores["semantic_match"], dtype=np.float64)
+        n = len(semantic)
+
+        # Accumulate in calculate_score's key order so sums round identically
+        available = ~np.isnan(semantic)
+        final = np.zeros(n)
+        for k in self.weights:
+            term = np.asarray(scores[k], dtype=np.float64) * self.weights[k]
+            final = np.where(available, final + term, final) if k == "semantic_match" else final + term
+
+        # Normalized like calculate_score (a no-op for weights summing to 1)
+        full_weight = sum(self.weights[k] for k in self.weights)
+        partial_weight = sum(self.weights[k] for k in self.weights if k != "semantic_match")
+        final = np.where(available, final / full_weight, final / partial_weight)
+
+        return round_scores(final * 100)
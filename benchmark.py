@@ -0,0 +1,933 @@
+# benchmark.py
+"""
+Micro-benchmarks for performance-sensitive parts of the analyzer.
+
+Usage:
+    python benchmark.py encoding [--batch-size 1000]
+    python benchmark.py scoring [--candidates 100000]
+    python benchmark.py reweight [--candidates 1000000]
+    python benchmark.py incremental
+    python benchmark.py detector [--repeat 200]
+    python benchmark.py detector-batch [--documents 20000] [--workers 4]
+    python benchmark.py cascade [--documents 2000]
+    python benchmark.py dedup [--documents 1000000]
+    python benchmark.py parser [--rows 1000000]
+    python benchmark.py stream [--rows 10000 100000 1000000]
+    python benchmark.py parallel [--rows 200000] [--workers 1 2 4]
+    python benchmark.py store [--rows 1000000]
+    python benchmark.py reparse [--rows 200000] [--changed 0.01]
+    python benchmark.py extract [--documents 200] [--workers 4]
+    python benchmark.py ingest [--documents 1000] [--workers 1 4] [--embed]
+"""
+
+import argparse
+import json
+import time
+
+
+def timeit(fn, repeat=5, number=1):
+    """Best-of-`repeat` wall time of `number` calls, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1000
+
+
+# -------------------------------
+# Response Encodings
+# -------------------------------
+def bench_encoding(args):
+    import response_encoding as enc
+    from main import AnalyzeResponse, BatchAnalyzeResponse
+
+    single = {
+        "ats_score": 78.35,
+        "semantic_match": 0.6421,
+        "skill_match": 0.75,
+        "section_completeness": 1.0,
+        "category_balance": 0.75,
+        "formatting": 1.0,
+        "extracted_skills": ["AWS", "Docker", "Git", "Machine Learning", "Python", "PyTorch"],
+        "stages": ["skill_extraction", "semantic_match", "ats_scoring"],
+        "unavailable": [],
+        "degraded": False,
+        "elapsed_ms": 41.27
+    }
+    single_ids = dict(single, extracted_skills=[0, 2, 3, 6, 9, 10])
+    item = {k: v for k, v in single.items() if k != "elapsed_ms"}
+    item_ids = {k: v for k, v in single_ids.items() if k != "elapsed_ms"}
+    batch = {"results": [item] * args.batch_size, "elapsed_ms": 812.5}
+    batch_ids = {"results": [item_ids] * args.batch_size, "elapsed_ms": 812.5}
+
+    cases = [
+        ("single", single, AnalyzeResponse),
+        ("single+ids", single_ids, AnalyzeResponse),
+        (f"batch[{args.batch_size}]", batch, BatchAnalyzeResponse),
+        (f"batch[{args.batch_size}]+ids", batch_ids, BatchAnalyzeResponse),
+    ]
+
+    number = max(1, 2000 // args.batch_size)
+    print(f"{'payload':<20}{'format':<16}{'encode ms':>12}{'decode ms':>12}{'bytes':>10}")
+    for name, payload, model in cases:
+        formats = [
+            ("pydantic json",
+             lambda: model(**payload).model_dump_json().encode(),
+             json.loads),
+            ("fast json",
+             lambda: enc.encode(payload, enc.FAST_JSON),
+             lambda b: enc.decode(b, enc.FAST_JSON)),
+        ]
+        if enc.msgpack is not None:
+            formats.append((
+                "msgpack",
+                lambda: enc.encode(payload, enc.MSGPACK),
+                lambda b: enc.decode(b, enc.MSGPACK)
+            ))
+
+        for fmt, encode_fn, decode_fn in formats:
+            content = encode_fn()
+            n = number if name.startswith("batch") else 2000
+            encode_ms = timeit(encode_fn, number=n)
+            decode_ms = timeit(lambda: decode_fn(content), number=n)
+            print(f"{name:<20}{fmt:<16}{encode_ms:>12.4f}{decode_ms:>12.4f}{len(content):>10}")
+
+
+# -------------------------------
+# ATS Scoring
+# -------------------------------
+def bench_scoring(args):
+    import numpy as np
+    from ats_scorer import ATSScorer
+    from skill_extractor import SkillExtractor
+
+    extractor = SkillExtractor("skill_ontology.json")
+    scorer = ATSScorer()
+    rng = np.random.default_rng(0)
+    n, vocab = args.candidates, len(extractor.vocabulary)
+
+    skill_matrix = rng.random((n, vocab)) < 0.3
+    jd_vector = rng.random(vocab) < 0.4
+    semantic = rng.random(n)
+    section_flags = rng.random((n, 4)) < 0.8
+    category_flags = rng.random((n, 4)) < 0.6
+    text_lengths = rng.integers(0, 3000, n)
+    is_upper = rng.random(n) < 0.05
+
+    # Scalar path inputs
+    vocabulary = np.array(extractor.vocabulary)
+    jd_skills = list(vocabulary[jd_vector])
+    skill_lists = [list(vocabulary[row]) for row in skill_matrix]
+    section_names = ATSScorer.SECTIONS
+    resume_jsons = [{sec: "x" if f else "" for sec, f in zip(section_names, row)} for row in section_flags]
+    category_dicts = [{str(c): ["x"] if f else [] for c, f in enumerate(row)} for row in category_flags]
+    texts = ["A" * int(length) if upper else "a" * int(length) for length, upper in zip(text_lengths, is_upper)]
+
+    def scalar():
+        for i in range(n):
+            scorer.calculate_score(
+                resume_jsons[i],
+                {"normalized_skills": skill_lists[i], "skill_categories": category_dicts[i]},
+                jd_skills, float(semantic[i]), texts[i]
+            )
+
+    def batch():
+        scorer.calculate_scores_batch(
+            skill_matrix, jd_vector, semantic, section_flags,
+            category_flags, text_lengths, is_upper
+        )
+
+    scalar_ms = timeit(scalar, repeat=1)
+    batch_ms = timeit(batch)
+    print(f"{n} candidates: scalar {scalar_ms:.1f} ms, batch {batch_ms:.1f} ms "
+          f"({scalar_ms / batch_ms:.1f}x)")
+
+
+# -------------------------------
+# Re-weighting Stored Scores
+# -------------------------------
+def bench_reweight(args):
+    import tempfile
+    import numpy as np
+    from score_store import ScoreStore, COMPONENTS
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = ScoreStore(store_dir)
+        chunk = 100000
+        for start in range(0, args.candidates, chunk):
+            m = min(chunk, args.candidates - start)
+            values = rng.random((m, len(COMPONENTS)))
+            # Write the columns directly instead of building m breakdown dicts
+            columns = {name: values[:, i] for i, name in enumerate(COMPONENTS)}
+            columns["candidate_id"] = [f"c{start + i}" for i in range(m)]
+            columns["candidate_key"] = rng.integers(-2**63, 2**63 - 1, m)
+            columns["job_id"] = ["job-a" if i % 2 else "job-b" for i in range(m)]
+            columns["scored_at"] = np.zeros(m)
+            store.table.append(columns)
+
+        store = ScoreStore(store_dir)
+        weights = {"skill_match": 0.5, "semantic_match": 0.1}
+        all_ms = timeit(lambda: store.reweight(weights, top_k=100))
+        job_ms = timeit(lambda: store.reweight(weights, job_id="job-a", top_k=100))
+        print(f"{len(store)} stored scores: re-weight all {all_ms:.1f} ms, one job {job_ms:.1f} ms")
+
+
+# -------------------------------
+# Incremental Re-analysis
+# -------------------------------
+SAMPLE_RESUME = """Jane Doe
+Machine Learning Engineer | jane@example.com
+
+Summary
+ML engineer with 4 years of experience shipping NLP and computer vision models.
+I like small teams, fast feedback and measurable outcomes.
+
+Experience
+Acme Corp - ML Engineer (2021 - present)
+Built a resume ranking service in Python and PyTorch serving 2M requests a day.
+Cut inference cost by 40% by distilling a transformer and moving it to ONNX.
+Set up Docker based training pipelines on AWS with nightly evaluation.
+
+Startup Inc - Data Scientist (2019 - 2021)
+Predicted customer churn with gradient boosting, retaining 15% more customers.
+Wrote the team's first data quality checks and a small feature store.
+
+Projects
+Resume Analyzer - semantic matching of resumes and job descriptions.
+Face Recognition System - real-time recognition on a Raspberry Pi.
+
+Education
+B.Tech in Computer Science, 2019
+
+Skills
+Python, SQL, PyTorch, TensorFlow, scikit-learn, Docker, Git, AWS
+"""
+
+SAMPLE_JD = """Looking for a Machine Learning Engineer with strong Python skills,
+experience in deep learning frameworks like TensorFlow or PyTorch,
+Docker and AWS, and hands-on project experience."""
+
+
+def bench_incremental(args):
+    from ai_detector import AIContentDetector
+    from incremental_analyzer import IncrementalAnalyzer
+    from matcher import ResumeJDMatcher
+    from skill_extractor import SkillExtractor
+
+    extractor = SkillExtractor("skill_ontology.json")
+    matcher = ResumeJDMatcher()
+    detector = AIContentDetector()
+
+    def full_run(resume):
+        detector.detect_ai_content(resume)
+        extractor.extract(resume)
+        extractor.extract(SAMPLE_JD)
+        matcher.match(resume, SAMPLE_JD)
+
+    def incremental_run(analyzer, resume):
+        analyzer.detect_ai_content(resume)
+        analyzer.extract_skills(resume)
+        analyzer.extract_jd_skills(SAMPLE_JD)
+        analyzer.semantic_match(resume, SAMPLE_JD)
+
+    full_run(SAMPLE_RESUME)  # warm up the model
+    edits = [
+        SAMPLE_RESUME.replace("40%", f"{40 + i}%") for i in range(1, 6)
+    ]
+
+    full_ms = timeit(lambda: [full_run(r) for r in edits], repeat=3) / len(edits)
+
+    def edited_runs():
+        analyzer = IncrementalAnalyzer(extractor, matcher, detector)
+        incremental_run(analyzer, SAMPLE_RESUME)
+        start = time.perf_counter()
+        for resume in edits:
+            incremental_run(analyzer, resume)
+        return (time.perf_counter() - start) / len(edits) * 1000
+
+    incremental_ms = min(edited_runs() for _ in range(3))
+    print(f"full analysis {full_ms:.1f} ms, incremental re-analysis after a one-line edit "
+          f"{incremental_ms:.1f} ms ({full_ms / incremental_ms:.1f}x)")
+
+
+# -------------------------------
+# AI Detector Engine
+# -------------------------------
+def bench_detector(args):
+    import re
+    from collections import Counter
+    from ai_detector import AIContentDetector
+
+    detector = AIContentDetector()
+
+    def multi_pass(text):
+        """The original detector: every metric lowercases and splits on its own"""
+        words = text.lower().split()
+        perplexity = detector.perplexity_from_counts(Counter(words), len(words))
+
+        sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+        burstiness = detector.burstiness_from_lengths([len(s.split()) for s in sentences])
+
+        text_lower = text.lower()
+        phrase_count = sum(1 for phrase in detector.ai_phrases if phrase in text_lower)
+        for pattern in detector.ai_patterns:
+            phrase_count += len(re.findall(pattern, text_lower, re.IGNORECASE))
+
+        sentences = [s.strip().lower() for s in re.split(r'[.!?]+', text) if s.strip()]
+        repetition = detector.repetition_from_sentences(sentences)
+
+        words = text.lower().split()
+        formal_count = sum(1 for w in words if any(fw in w for fw in detector.formal_words))
+        formality = detector.formality_from_counts(formal_count, len(words))
+
+        return detector.score_metrics(perplexity, burstiness, phrase_count, repetition, formality)
+
+    texts = {
+        "resume": SAMPLE_RESUME,
+        "resume x10": "\n\n".join([SAMPLE_RESUME] * 10),
+    }
+    print(f"{'text':<14}{'words':>8}{'multi-pass ms':>16}{'single-pass ms':>16}{'speedup':>10}")
+    for name, text in texts.items():
+        assert multi_pass(text) == detector.detect_ai_content(text)
+        number = max(1, args.repeat // (10 if "x10" in name else 1))
+        old_ms = timeit(lambda: multi_pass(text), number=number)
+        new_ms = timeit(lambda: detector.detect_ai_content(text), number=number)
+        print(f"{name:<14}{len(text.split()):>8}{old_ms:>16.3f}{new_ms:>16.3f}{old_ms / new_ms:>9.1f}x")
+
+
+def mixed_resumes(count, seed=0):
+    """Resume-like texts, from plain human lines to AI-phrase heavy"""
+    import random
+
+    rng = random.Random(seed)
+    lines = [line for line in SAMPLE_RESUME.splitlines() if line.strip()]
+    ai_lines = [
+        "Results-driven professional with a proven track record of leveraging data.",
+        "Demonstrated ability to spearhead cross-functional initiatives.",
+        "Highly motivated team player with excellent communication skills.",
+    ]
+    return [
+        "\n".join(rng.choice(lines + ai_lines * (i % 3)) for _ in range(rng.randint(8, 30)))
+        for i in range(count)
+    ]
+
+
+def bench_detector_batch(args):
+    from ai_detector import AIContentDetector, iter_detect_ai_content
+
+    detector = AIContentDetector()
+    texts = mixed_resumes(args.documents)
+
+    start = time.perf_counter()
+    for text in texts:
+        detector.detect_ai_content(text)
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    detector.detect_ai_content_many(texts)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flagged = sum(int(df["is_ai"].sum()) for df in iter_detect_ai_content(texts, workers=args.workers))
+    pool_s = time.perf_counter() - start
+
+    print(f"{len(texts)} documents ({flagged} flagged): per-document {scalar_s:.2f} s, "
+          f"batch {batch_s:.2f} s ({scalar_s / batch_s:.1f}x), "
+          f"streamed with {args.workers} workers {pool_s:.2f} s ({scalar_s / pool_s:.1f}x)")
+
+
+def bench_cascade(args):
+    import random
+    import tempfile
+    from collections import Counter
+    from ai_detector import AIContentDetector
+    from ngram_lm import NGramCounter
+
+    # Half resume-like lines, half uniform AI-styled summaries
+    rng = random.Random(0)
+    ai_sentences = [
+        "Results-driven professional with a proven track record of leveraging data to drive innovation.",
+        "Demonstrated ability to spearhead cross-functional initiatives and facilitate strategic alignment.",
+        "Highly motivated team player with excellent communication skills and attention to detail.",
+        "Passionate about utilizing cutting-edge technologies to optimize business outcomes.",
+        "Adept at orchestrating comprehensive solutions that enhance operational efficiency.",
+    ]
+    texts = mixed_resumes(args.documents - args.documents // 2) + [
+        " ".join(rng.choice(ai_sentences) for _ in range(rng.randint(4, 12)))
+        for _ in range(args.documents // 2)
+    ]
+
+    with tempfile.TemporaryDirectory() as model_dir:
+        # Small LM on separate resume-like text, for the expensive-metric case
+        counter = NGramCounter()
+        counter.add(mixed_resumes(2000, seed=1))
+        counter.save(model_dir, holdout_texts=mixed_resumes(50, seed=2))
+
+        for label, detector in [("unigram perplexity", AIContentDetector()),
+                                ("n-gram LM perplexity", AIContentDetector(model_dir))]:
+            full_ms = timeit(lambda: [detector.detect_ai_content(t) for t in texts], repeat=args.repeat)
+            cascade_ms = timeit(
+                lambda: [detector.detect_ai_content(t, cascade=True) for t in texts], repeat=args.repeat
+            )
+
+            runs = [detector.detect_ai_content(t, cascade=True)[2]["cascade"]["metrics_run"] for t in texts]
+            flagged = sum(detector.detect_ai_content(t)[0] for t in texts)
+            stopped = Counter(run[-1] for run in runs)
+            early = sum(len(run) < len(detector.CASCADE_ORDER) for run in runs)
+
+            print(f"{label}: {len(texts)} documents ({flagged} flagged)")
+            print(f"  full     {full_ms / len(texts) * 1000:6.1f} µs/document")
+            print(f"  cascade  {cascade_ms / len(texts) * 1000:6.1f} µs/document "
+                  f"({1 - cascade_ms / full_ms:.0%} saved, {early / len(texts):.0%} exited early)")
+            print("  stopped after: " + ", ".join(
+                f"{name} {stopped[name]}" for name in detector.CASCADE_ORDER if stopped[name]
+            ))
+
+
+# -------------------------------
+# Resume CSV Parsing
+# -------------------------------
+def write_resume_csv(path, rows, seed=0):
+    """Synthetic CSV shaped like UpdatedResumeDataSet.csv (Category, Resume)"""
+    import csv
+    import random
+
+    rng = random.Random(seed)
+    categories = ["Data Science", "HR", "Java Developer", "Testing", "DevOps Engineer", "Web Designing"]
+    skills = ["Python", "SQL", "Java", "Docker", "AWS", "Excel", "Selenium", "React", "Tableau", "Git"]
+    degrees = ["B.E in Computer Engineering", "B.Tech in IT", "Master of Science", "MBA in HR", "Diploma"]
+    lines = [line for line in SAMPLE_RESUME.splitlines() if line.strip()]
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Category", "Resume"])
+        for _ in range(rows):
+            resume = "\r\n".join([
+                "Skills: " + ", ".join(rng.sample(skills, rng.randint(2, 6))),
+                "Education Details \r\n" + rng.choice(degrees) + " - University, " + str(rng.randint(2005, 2023)),
+                rng.choice(["Experience: ", "Company Details \r\n", "Work Experience - "])
+                + " ".join(rng.sample(lines, rng.randint(3, 8))),
+                "Tools: " + ", ".join(rng.sample(skills, 2)),
+            ])
+            writer.writerow([rng.choice(categories), resume])
+
+
+def bench_parser(args):
+    import os
+    import re
+    import tempfile
+    from resume_parser import ResumeParser
+
+    def iterrows_parse(parser, limit):
+        """The original engine: iterrows() and re.findall with string patterns per row"""
+        records = []
+        for idx, row in parser.df.head(limit).iterrows():
+            resume_text = str(row.get("Resume", ""))
+            skills = []
+            for pattern in [r'Skills?\s*:?\s*([^\n]+)', r'Technical Skills?\s*:?\s*([^\n]+)',
+                            r'Programming Languages?\s*:?\s*([^\n]+)', r'Tools?\s*:?\s*([^\n]+)']:
+                for match in re.findall(pattern, resume_text, re.IGNORECASE):
+                    skills.extend([s.strip() for s in re.split(r',|\||;|•|·', match) if s.strip()])
+            education = []
+            for pattern in [r'Education\s*(?:Details)?\s*:?\s*([^\n]+(?:\n(?!\w+:)[^\n]+)*)',
+                            r'(?:Bachelor|Master|PhD|B\.E|B\.Tech|M\.Tech|M\.S)\s+[^\n]+']:
+                education.extend(re.findall(pattern, resume_text, re.IGNORECASE))
+            experience = []
+            for pattern in [r'Experience\s*:?\s*([^\n]+(?:\n(?!\w+:)[^\n]+)*)',
+                            r'Work Experience\s*:?\s*([^\n]+(?:\n(?!\w+:)[^\n]+)*)']:
+                experience.extend(re.findall(pattern, resume_text, re.IGNORECASE))
+            clean = lambda text: re.sub(r'\s+', ' ', text).strip()
+            records.append({
+                "resume_id": idx,
+                "category": str(row.get("Category", "")),
+                "skills": sorted(set(skills)),
+                "education": clean(' '.join(education) if education else ""),
+                "experience": clean(' '.join(experience) if experience else resume_text[:500]),
+                "projects": "",
+                "certifications": "",
+                "full_text": clean(resume_text)[:1000]
+            })
+        return records
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resumes.csv")
+        start = time.perf_counter()
+        write_resume_csv(path, args.rows)
+        print(f"Generated {args.rows:,} rows ({os.path.getsize(path) / 1e6:,.0f} MB) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        parser = ResumeParser(path)
+        load_s = time.perf_counter() - start
+
+        baseline_rows = min(args.baseline_rows, args.rows)
+        start = time.perf_counter()
+        expected = iterrows_parse(parser, baseline_rows)
+        baseline_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = parser.parse()
+        parse_s = time.perf_counter() - start
+        assert len(records) == args.rows and len(expected) == baseline_rows
+
+    baseline_us = baseline_s / baseline_rows * 1e6
+    parse_us = parse_s / args.rows * 1e6
+    print(f"read_csv {load_s:.1f}s")
+    print(f"iterrows engine   {baseline_us:6.1f} µs/row (first {baseline_rows:,} rows; "
+          f"~{baseline_us * args.rows / 1e6:,.0f}s for all)")
+    print(f"segmenter engine  {parse_us:6.1f} µs/row ({parse_s:.1f}s for {args.rows:,} rows, "
+          f"{baseline_us / parse_us:.1f}x)")
+
+
+def bench_stream(args):
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    # Each run in a fresh process, so ru_maxrss is that run's peak memory
+    script = (
+        "import resource, sys, time\n"
+        "from resume_parser import ResumeParser\n"
+        "start = time.perf_counter()\n"
+        "if sys.argv[1] == 'json':\n"
+        "    ResumeParser(sys.argv[2]).save_json(sys.argv[3])\n"
+        "else:\n"
+        "    ResumeParser(sys.argv[2], stream=True).save_jsonl(sys.argv[3])\n"
+        "print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)\n"
+    )
+    print(f"{'rows':>10}{'CSV MB':>9}{'mode':>8}{'seconds':>10}{'peak MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, "resumes.csv")
+            write_resume_csv(path, rows)
+            modes = ["json", "jsonl"] if rows <= args.max_json_rows else ["jsonl"]
+            for mode in modes:
+                out = subprocess.run(
+                    [sys.executable, "-c", script, mode, path, os.path.join(tmp, "out." + mode)],
+                    capture_output=True, text=True, check=True
+                ).stdout.splitlines()[-1]
+                seconds, peak_mb = map(float, out.split())
+                print(f"{rows:>10,}{os.path.getsize(path) / 1e6:>9,.0f}{mode:>8}{seconds:>10.1f}{peak_mb:>10,.0f}")
+
+
+def bench_parallel(args):
+    import os
+    import tempfile
+    from resume_parser import ResumeParser
+
+    print(f"{os.cpu_count()} CPU(s) available")
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>12}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resumes.csv")
+        write_resume_csv(path, args.rows)
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            ResumeParser(path, stream=True).save_jsonl_parallel(
+                os.path.join(tmp, f"out_{workers}.jsonl"), workers=workers, shard_size=args.shard_size
+            )
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>8}{seconds:>10.1f}{args.rows / seconds:>12,.0f}{baseline / seconds:>9.1f}x")
+
+
+# -------------------------------
+# Near-duplicate Index
+# -------------------------------
+def bench_store(args):
+    import os
+    import random
+    import subprocess
+    import sys
+    import tempfile
+    from parsed_store import ParsedResumeStore
+    from resume_parser import ResumeParser
+
+    rng = random.Random(0)
+    parser = ResumeParser(None, stream=True)
+    categories = ["Data Science", "HR", "Java Developer", "Testing", "DevOps Engineer", "Web Designing"]
+    skills = [f"Skill {i}" for i in range(500)]
+    lines = [line for line in SAMPLE_RESUME.splitlines() if line.strip()]
+
+    def rows(first, count):
+        for i in range(first, first + count):
+            text = "\n".join([
+                "Skills: " + ", ".join(rng.sample(skills, rng.randint(3, 12))),
+                "Education\nB.Tech in IT, 2019",
+                "Experience\n" + "\n".join(rng.sample(lines, 6)),
+                "Projects\n- Resume Analyzer\n- " + rng.choice(lines),
+            ])
+            yield parser.parse_spans(i, text, rng.choice(categories))
+
+    # Each read in a fresh process, so nothing is warm in the interpreter
+    # (peak memory from VmHWM: ru_maxrss would include this parent process)
+    script = (
+        "import json, sys, time\n"
+        "from parsed_store import ParsedResumeStore\n"
+        "start = time.perf_counter()\n"
+        "if sys.argv[1] == 'json':\n"
+        "    with open(sys.argv[2], 'r', encoding='utf-8') as f:\n"
+        "        values = [r['skills'] for r in json.load(f)]\n"
+        "elif sys.argv[1] == 'skills':\n"
+        "    values = ParsedResumeStore(sys.argv[2]).column('skills')\n"
+        "elif sys.argv[1] == 'category':\n"
+        "    store = ParsedResumeStore(sys.argv[2])\n"
+        "    values = store.column('skills', store.rows(category='HR'))\n"
+        "else:\n"
+        "    store = ParsedResumeStore(sys.argv[2])\n"
+        "    values = [len(view) for view in store.text_views()]\n"
+        "with open('/proc/self/status') as f:\n"
+        "    peak_kb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM'))\n"
+        "print(time.perf_counter() - start, len(values), peak_kb / 1024)\n"
+    )
+
+    def run(mode, path):
+        out = subprocess.run([sys.executable, "-c", script, mode, path],
+                             capture_output=True, text=True, check=True).stdout.split()
+        return float(out[0]), int(out[1]), float(out[2])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_dir = os.path.join(tmp, "store")
+        start = time.perf_counter()
+        store = ParsedResumeStore(store_dir)
+        for first in range(0, args.rows, 100_000):
+            store.add(rows(first, min(100_000, args.rows - first)))
+        write_s = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(os.path.join(store_dir, n)) for n in os.listdir(store_dir)) / 1e6
+        text_mb = os.path.getsize(os.path.join(store_dir, "text.bin")) / 1e6
+        print(f"{args.rows:,} parsed resumes written in {write_s:.1f} s "
+              f"({size_mb:,.0f} MB, of which {text_mb:,.0f} MB full text)")
+
+        # Baseline: the same records as JSON, every section a copied string
+        json_rows = min(args.rows, args.max_json_rows)
+        json_path = os.path.join(tmp, "parsed.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            for first in range(0, json_rows, 100_000):
+                batch = json.dumps(store.records(slice(first, min(first + 100_000, json_rows))), indent=2)
+                f.write(("[" if first == 0 else ",") + batch[1:-1])
+            f.write("]")
+        print(f"  JSON with full text: {os.path.getsize(json_path) / 1e6:,.0f} MB for {json_rows:,} rows")
+
+        print(f"  {'':<48}{'seconds':>8}{'rows':>12}{'peak MB':>10}")
+        for label, mode, path in [
+            (f"json.load of the JSON records ({json_rows:,} rows)", "json", json_path),
+            ("skills column, all rows", "skills", store_dir),
+            ("skills column, category == HR", "category", store_dir),
+            ("full text of every row (memoryview)", "texts", store_dir),
+        ]:
+            seconds, count, peak_mb = run(mode, path)
+            print(f"  {label:<48}{seconds:>8.2f}{count:>12,}{peak_mb:>10,.0f}")
+
+
+def bench_reparse(args):
+    import csv
+    import os
+    import random
+    import tempfile
+    from resume_parser import ResumeParser
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "resumes.csv")
+        store_dir = os.path.join(tmp, "store")
+        write_resume_csv(csv_path, args.rows)
+
+        def update(label):
+            start = time.perf_counter()
+            rows, parsed = ResumeParser(csv_path, stream=True).update_store(store_dir)
+            seconds = time.perf_counter() - start
+            print(f"  {label:<36}{parsed:>10,} parsed{seconds:>8.1f} s{seconds / rows * 1e6:>8.1f} us/row")
+
+        print(f"{args.rows:,} rows")
+        update("first run (everything new)")
+        update("rerun, nothing changed")
+
+        # Edit a random fraction of the resumes in place
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            table = list(csv.reader(f))
+        rng = random.Random(1)
+        for row in rng.sample(range(1, len(table)), int(args.rows * args.changed)):
+            table[row][1] += "\r\nCertifications: AWS"
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(table)
+        update(f"rerun, {args.changed:.0%} of rows edited")
+
+
+def write_pdf(path, pages):
+    """Minimal PDF with a Helvetica text layer, one list of text lines per page"""
+    def escape(line):
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        text = "\n".join(["BT /F1 10 Tf 12 TL 50 770 Td"] + [f"({escape(line)}) Tj T*" for line in lines] + ["ET"])
+        stream = text.encode("latin-1", errors="replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_resume_pdfs(directory, count, long_every=10, seed=0):
+    """count generated resume PDFs of 1-2 pages; every long_every-th has 24 pages"""
+    import os
+    import random
+
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    lines = [line for line in SAMPLE_RESUME.splitlines() if line.strip()]
+    paths = []
+    for i in range(count):
+        pages = 24 if long_every and i % long_every == long_every - 1 else rng.randint(1, 2)
+        path = os.path.join(directory, f"resume_{i:05d}.pdf")
+        write_pdf(path, [[f"Candidate {i}, page {page + 1}"] + rng.sample(lines, min(40, len(lines)))
+                         for page in range(pages)])
+        paths.append(path)
+    return paths
+
+
+def bench_extract(args):
+    import io
+    import os
+    import tempfile
+    import pdfplumber
+    from document_extractor import DocumentExtractor
+
+    def original(data):
+        # app.py's previous extract_text_from_pdf
+        text = ""
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for page in pdf.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+        return text.strip()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_resume_pdfs(tmp, args.documents)
+        documents = []
+        for path in paths:
+            with open(path, "rb") as f:
+                documents.append(f.read())
+        long_documents = documents[args.long_every - 1::args.long_every] if args.long_every else []
+        print(f"{len(documents)} generated PDFs ({len(long_documents)} of 24 pages), "
+              f"{sum(map(len, documents)) / 1e6:.1f} MB")
+
+        def run(label, extract, docs):
+            start = time.perf_counter()
+            texts = [extract(data) for data in docs]
+            seconds = time.perf_counter() - start
+            print(f"  {label:<44}{seconds / len(docs) * 1000:>9.1f} ms/document")
+            return texts
+
+        baseline = run("pdfplumber, sequential (original)", original, documents)
+        extractor = DocumentExtractor()
+        fast = run("fast path, cold cache", lambda data: extractor.extract(data, "x.pdf"), documents)
+        run("cached (same bytes again)", lambda data: extractor.extract(data, "x.pdf"), documents)
+        stats = extractor.stats
+        print(f"    {stats['fast_pages']} pages on the fast path, {stats['fallback_pages']} fell back to pdfplumber")
+
+        # pdfplumber and PyPDF2 differ in line spacing and in mapping the
+        # StandardEncoding quote to ’ or '; compare words with quotes unified
+        def words(text):
+            return text.replace("\u2019", "'").split()
+        same = sum(words(a) == words(b) for a, b in zip(baseline, fast))
+        print(f"    {same} of {len(documents)} texts match the original extraction word for word")
+
+        if long_documents:
+            for workers in args.workers:
+                extractor = DocumentExtractor(workers=workers)
+                run(f"24-page PDFs, {workers} worker(s), cold", lambda data: extractor.extract(data, "x.pdf"),
+                    long_documents)
+                extractor.close()
+            print(f"    ({os.cpu_count()} CPUs available)")
+
+
+def bench_ingest(args):
+    import os
+    import shutil
+    import tempfile
+    from document_extractor import DocumentExtractor
+    from ingest import Ingester, file_category, iter_files
+    from parsed_store import ParsedResumeStore
+    from resume_parser import ResumeParser
+    from skill_extractor import SkillExtractor
+
+    matcher = None
+    if args.embed:
+        from matcher import ResumeJDMatcher
+        matcher = ResumeJDMatcher()
+    skill_extractor = SkillExtractor("skill_ontology.json")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "resumes")
+        for folder in range(4):
+            write_resume_pdfs(os.path.join(root, f"folder_{folder}"), args.documents // 4, args.long_every,
+                              seed=folder)
+        paths = list(iter_files(root))
+        print(f"{len(paths)} generated PDFs in 4 folders, embedding {'on' if matcher else 'off'}")
+
+        def sequential():
+            # One file at a time through every stage, one append at the end
+            extractor = DocumentExtractor()
+            parser = ResumeParser(None, stream=True)
+            rows, texts = [], []
+            for i, path in enumerate(paths):
+                row = parser.parse_spans(str(i), extractor.extract(path), file_category(root, path))
+                row["skills"] = skill_extractor.extract(row["text"], raw_skills=row["skills"])["normalized_skills"]
+                if matcher:
+                    matcher.embed(row["text"])
+                rows.append(row)
+            ParsedResumeStore(os.path.join(tmp, "sequential")).add(rows)
+
+        def run(label, fn):
+            start = time.perf_counter()
+            fn()
+            seconds = time.perf_counter() - start
+            print(f"  {label:<44}{seconds:>7.2f} s  {len(paths) / seconds:>8.0f} files/s")
+
+        run("sequential, file by file", sequential)
+        for workers in args.workers:
+            store_dir = os.path.join(tmp, f"store_{workers}")
+            corpus_dir = os.path.join(tmp, f"corpus_{workers}")
+            run(f"pipelined, {workers} extraction worker(s)",
+                lambda: Ingester(store_dir, corpus_dir, skill_extractor, matcher, workers=workers).ingest(root))
+            run("  rerun (all files already ingested)",
+                lambda: Ingester(store_dir, corpus_dir, skill_extractor, matcher, workers=workers).ingest(root))
+            shutil.rmtree(store_dir)
+        print(f"    ({os.cpu_count()} CPUs available)")
+
+
+def bench_dedup(args):
+    import numpy as np
+    from near_duplicates import MinHashLSH
+
+    index = MinHashLSH()
+    # Generated resumes and copies of them with their first line dropped
+    texts = mixed_resumes(500)
+    texts += ["\n".join(text.splitlines()[1:]) for text in texts]
+
+    # Distinct documents: random signatures stand in for a large corpus
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for first in range(0, args.documents, 100_000):
+        count = min(100_000, args.documents - first)
+        signatures = rng.integers(0, 2**32, (count, index.num_perm), dtype=np.uint32)
+        index.insert_signatures([f"synthetic-{first + i}" for i in range(count)], signatures)
+    insert_s = time.perf_counter() - start
+    index.insert_many([f"resume-{i}" for i in range(len(texts))], texts)
+
+    single_ms = timeit(lambda: index.insert("incoming", SAMPLE_RESUME), repeat=args.repeat)
+    signature_ms = timeit(lambda: index.signature(SAMPLE_RESUME), repeat=args.repeat)
+    query_ms = timeit(lambda: index.query(SAMPLE_RESUME), repeat=args.repeat)
+    many_ms = timeit(lambda: index.query_many(texts), repeat=args.repeat)
+    flagged = sum(len(matches) > 1 for matches in index.query_many(texts))  # beyond itself
+
+    print(f"{len(index):,} documents indexed ({args.documents / insert_s:,.0f} signatures/s)")
+    print(f"  signature of one resume {signature_ms:.2f} ms, insert {single_ms:.2f} ms, query {query_ms:.2f} ms")
+    print(f"  batch query: {many_ms / len(texts):.2f} ms/resume "
+          f"({flagged} of {len(texts)} resumes matched a near-duplicate)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    p = sub.add_parser("encoding", help="response serialization cost and payload size")
+    p.add_argument("--batch-size", type=int, default=1000)
+    p.set_defaults(func=bench_encoding)
+
+    p = sub.add_parser("scoring", help="scalar vs vectorized ATS scoring")
+    p.add_argument("--candidates", type=int, default=100000)
+    p.set_defaults(func=bench_scoring)
+
+    p = sub.add_parser("reweight", help="re-rank persisted component scores")
+    p.add_argument("--candidates", type=int, default=1000000)
+    p.set_defaults(func=bench_reweight)
+
+    p = sub.add_parser("incremental", help="full vs incremental re-analysis of an edited resume")
+    p.set_defaults(func=bench_incremental)
+
+    p = sub.add_parser("detector", help="multi-pass vs single-pass AI content detection")
+    p.add_argument("--repeat", type=int, default=200)
+    p.set_defaults(func=bench_detector)
+
+    p = sub.add_parser("detector-batch", help="per-document vs batch AI content detection")
+    p.add_argument("--documents", type=int, default=20000)
+    p.add_argument("--workers", type=int, default=4)
+    p.set_defaults(func=bench_detector_batch)
+
+    p = sub.add_parser("parser", help="original regex engine vs ResumeParser.parse on a synthetic CSV")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--baseline-rows", type=int, default=20000, help="rows parsed by the slow original engine")
+    p.set_defaults(func=bench_parser)
+
+    p = sub.add_parser("stream", help="peak memory of save_json vs streaming save_jsonl")
+    p.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--max-json-rows", type=int, default=100_000, help="largest input for the in-memory save_json")
+    p.set_defaults(func=bench_stream)
+
+    p = sub.add_parser("parallel", help="sharded multi-process parsing throughput by worker count")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    p.add_argument("--shard-size", type=int, default=10000)
+    p.set_defaults(func=bench_parallel)
+
+    p = sub.add_parser("store", help="columnar parsed-resume store vs JSON: loading one column")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--max-json-rows", type=int, default=1_000_000, help="rows written to the JSON baseline")
+    p.set_defaults(func=bench_store)
+
+    p = sub.add_parser("reparse", help="incremental store updates: full vs unchanged vs partly edited input")
+    p.add_argument("--rows", type=int, default=200_000)
+    p.add_argument("--changed", type=float, default=0.01, help="fraction of rows edited before the last run")
+    p.set_defaults(func=bench_reparse)
+
+    p = sub.add_parser("extract", help="PDF text extraction: pdfplumber vs fast path, cache, parallel pages")
+    p.add_argument("--documents", type=int, default=200)
+    p.add_argument("--long-every", type=int, default=10, help="every n-th document has 24 pages")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    p.set_defaults(func=bench_extract)
+
+    p = sub.add_parser("ingest", help="bulk ingestion of a folder tree: sequential vs pipelined stages")
+    p.add_argument("--documents", type=int, default=1000)
+    p.add_argument("--long-every", type=int, default=10, help="every n-th PDF has 24 pages (0: none)")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    p.add_argument("--embed", action="store_true", help="include the embedding model (slow on CPU)")
+    p.set_defaults(func=bench_ingest)
+
+    p = sub.add_parser("dedup", help="MinHash-LSH near-duplicate index inserts and queries")
+    p.add_argument("--documents", type=int, default=1_000_000)
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_dedup)
+
+    p = sub.add_parser("cascade", help="full vs early-exit (cascade) AI content detection")
+    p.add_argument("--documents", type=int, default=2000)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_cascade)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# calibrate_weights.py
+"""
+Offline calibration of ATSScorer weights against hire/reject labels.
+
+Loads persisted component scores (score store) and a labels CSV with
+columns candidate_id,label[,job_id] (label: 1 = hired, 0 = rejected),
+searches weight vectors on the simplex, and writes a weights file that
+ATSScorer.from_file() loads.
+
+Methods:
+    random    Dirichlet random search; all candidate weight vectors are
+              scored with one matrix product per chunk and ranked by AUC
+    logistic  simplex-constrained logistic fit (weights = softmax(theta)),
+              full-batch gradient descent with Adam
+
+Usage:
+    python calibrate_weights.py --labels labels.csv --out weights.json
+    python calibrate_weights.py --labels labels.csv --method logistic --job-id <id>
+"""
+
+import argparse
+import json
+import time
+import numpy as np
+import pandas as pd
+from ats_scorer import ATSScorer
+from score_store import ScoreStore, COMPONENTS, candidate_key
+
+SEMANTIC = COMPONENTS.index("semantic_match")
+
+
+# -------------------------------
+# Data Loading
+# -------------------------------
+def load_training_data(store, labels_path, job_id=None):
+    """
+    Join labels to the latest stored component scores.
+    Returns (X, y): X is (n, 5) with NaN for unavailable semantic scores.
+    """
+    labels = pd.read_csv(labels_path, dtype={"candidate_id": str})
+    rows = store.select(job_id)
+
+    store_keys = np.asarray(store.table.column("candidate_key")[rows]).view(np.uint64)
+    label_keys = np.array([candidate_key(c) for c in labels["candidate_id"]], dtype=np.int64).view(np.uint64)
+
+    # Labels that carry a job_id join on (job, candidate), otherwise on candidate
+    if "job_id" in labels.columns:
+        mult = np.uint64(0x9E3779B97F4A7C15)
+        store_keys = store_keys ^ (np.asarray(store.table.column("job_id")[rows], dtype=np.uint64) * mult)
+        codes = [store.table.code("job_id", j) for j in labels["job_id"].fillna("").astype(str)]
+        known = np.array([c is not None for c in codes])
+        label_codes = np.array([-1 if c is None else c for c in codes], dtype=np.int64).astype(np.uint64)
+        label_keys = np.where(known, label_keys ^ (label_codes * mult), np.uint64(0))
+
+    order = np.argsort(store_keys, kind="stable")
+    sorted_keys = store_keys[order]
+    position = np.minimum(np.searchsorted(sorted_keys, label_keys), len(sorted_keys) - 1)
+    found = sorted_keys[position] == label_keys if len(sorted_keys) else np.zeros(len(label_keys), bool)
+
+    matched_rows = rows[order[position[found]]]
+    components = store.components(matched_rows)
+    X = np.column_stack([components[name] for name in COMPONENTS])
+    y = labels["label"].to_numpy()[found].astype(np.float64)
+
+    print(f"Joined {found.sum():,} of {len(labels):,} labels to stored scores")
+    return X, y
+
+
+# -------------------------------
+# Vectorized Evaluation
+# -------------------------------
+def weighted_scores(X, W):
+    """
+    Final scores for every row under every weight vector: (n, k).
+    Mirrors ATSScorer: weights are normalized over the available
+    components, so rows without a semantic score drop its weight.
+    """
+    missing = np.isnan(X[:, SEMANTIC])
+    S = np.nan_to_num(X) @ W.T
+    S[~missing] /= W.sum(axis=1)
+    if missing.any():
+        S[missing] /= W.sum(axis=1) - W[:, SEMANTIC]
+    return S
+
+
+def auc_columns(S, y):
+    """ROC AUC of every column of S against binary labels y (ties averaged)"""
+    n, k = S.shape
+    positives = y.sum()
+    negatives = n - positives
+    if positives == 0 or negatives == 0:
+        raise ValueError("Labels need both positive and negative examples")
+
+    order = np.argsort(S, axis=0, kind="stable")
+    sorted_scores = np.take_along_axis(S, order, axis=0)
+    sorted_labels = y[order]
+
+    aucs = np.empty(k)
+    for j in range(k):
+        column = sorted_scores[:, j]
+        # Average 1-based rank of each run of tied scores
+        is_start = np.append(True, column[1:] != column[:-1])
+        starts = np.flatnonzero(is_start)
+        ends = np.append(starts[1:], n)
+        average_rank = (starts + ends + 1) / 2
+        group = np.cumsum(is_start) - 1
+        rank_sum = average_rank[group] @ sorted_labels[:, j]
+        aucs[j] = (rank_sum - positives * (positives + 1) / 2) / (positives * negatives)
+    return aucs
+
+
+def random_search(X, y, samples, chunk_size, seed=0):
+    rng = np.random.default_rng(seed)
+    baseline = np.array([ATSScorer().weights[name] for name in COMPONENTS])
+    W = np.vstack([baseline, rng.dirichlet(np.ones(len(COMPONENTS)), size=samples)])
+
+    aucs = np.empty(len(W))
+    for start in range(0, len(W), chunk_size):
+        chunk = W[start:start + chunk_size]
+        aucs[start:start + chunk_size] = auc_columns(weighted_scores(X, chunk), y)
+        print(f"  evaluated {min(start + chunk_size, len(W)):,}/{len(W):,} weight vectors", end="\r")
+    print()
+
+    best = int(np.argmax(aucs))
+    return W[best], aucs[best], aucs[0]
+
+
+def logistic_fit(X, y, iterations=500, learning_rate=0.05):
+    """Fit p = sigmoid(a * X @ softmax(theta) + b) on rows with every component"""
+    complete = ~np.isnan(X).any(axis=1)
+    X, y = X[complete], y[complete]
+    n = len(y)
+
+    theta = np.log(np.array([ATSScorer().weights[name] for name in COMPONENTS]))
+    params = np.concatenate([theta, [5.0, -2.5]])  # theta, scale a, bias b
+    m = np.zeros_like(params)
+    v = np.zeros_like(params)
+
+    for t in range(1, iterations + 1):
+        theta, a, b = params[:-2], params[-2], params[-1]
+        w = np.exp(theta - theta.max())
+        w /= w.sum()
+        s = X @ w
+        p = 1 / (1 + np.exp(-(a * s + b)))
+        error = (p - y) / n
+
+        grad_s = a * error
+        grad_w = X.T @ grad_s
+        grad_theta = w * (grad_w - w @ grad_w)  # softmax Jacobian
+        grad = np.concatenate([grad_theta, [error @ s, error.sum()]])
+
+        m = 0.9 * m + 0.1 * grad
+        v = 0.999 * v + 0.001 * grad ** 2
+        params -= learning_rate * (m / (1 - 0.9 ** t)) / (np.sqrt(v / (1 - 0.999 ** t)) + 1e-8)
+
+    theta = params[:-2]
+    w = np.exp(theta - theta.max())
+    return w / w.sum()
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", required=True, help="CSV with candidate_id,label[,job_id]")
+    parser.add_argument("--store", default="datasets/score_store", help="score store directory")
+    parser.add_argument("--job-id", default=None, help="only use scores for this job")
+    parser.add_argument("--method", choices=["random", "logistic"], default="random")
+    parser.add_argument("--samples", type=int, default=2000, help="random search: weight vectors to try")
+    parser.add_argument("--chunk-size", type=int, default=16, help="random search: weight vectors per matrix product")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="ats_weights.json")
+    args = parser.parse_args()
+
+    start = time.time()
+    X, y = load_training_data(ScoreStore(args.store), args.labels, args.job_id)
+
+    baseline = np.array([ATSScorer().weights[name] for name in COMPONENTS])
+    baseline_auc = auc_columns(weighted_scores(X, baseline[None, :]), y)[0]
+
+    if args.method == "random":
+        best, best_auc, _ = random_search(X, y, args.samples, args.chunk_size, args.seed)
+    else:
+        best = logistic_fit(X, y)
+        best_auc = auc_columns(weighted_scores(X, best[None, :]), y)[0]
+
+    weights = {name: round(float(w), 6) for name, w in zip(COMPONENTS, best)}
+    result = {
+        "weights": weights,
+        "method": args.method,
+        "metric": "auc",
+        "auc": round(float(best_auc), 6),
+        "baseline_auc": round(float(baseline_auc), 6),
+        "rows": int(len(y)),
+        "job_id": args.job_id,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"Baseline AUC: {baseline_auc:.4f}  ->  calibrated AUC: {best_auc:.4f}")
+    print(f"Weights: {weights}")
+    print(f"✓ Saved to {args.out} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
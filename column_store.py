@@ -0,0 +1,350 @@
+# backend/column_store.py
+"""
+Append-only columnar table stored as one file per column.
+
+Column types:
+    numeric dtypes ("float64", "int64", "bool", ...)
+        <name>.bin      raw little-endian values, memory-mapped on read
+    "str"
+        <name>.bin      UTF-8 bytes of all values back to back
+        <name>.off      int64 end offset of every value (start = previous end)
+    "dict"              dictionary-encoded strings for low-cardinality fields
+        <name>.bin      int32 code per row
+        <name>.dict     JSON list of distinct values (code = index)
+    "list"              lists of dictionary-encoded strings (e.g. skills)
+        <name>.bin      int32 code of every element, rows back to back
+        <name>.off      int64 end offset (in elements) of every row
+        <name>.dict     JSON list of distinct elements (code = index)
+    "spans"             lists of (start, end) pairs, e.g. offsets into a "str" value
+        <name>.bin      int32 start, end of every pair, rows back to back
+        <name>.off      int64 end offset (in pairs) of every row
+
+table.json holds the schema and the committed row count. Appends write the
+column files first and bump the row count last, so a crashed append is
+ignored (and truncated away) by the next writer. Appends through one
+ColumnStore are serialized; separate processes must not append at once.
+"""
+
+import json
+import os
+import threading
+import numpy as np
+
+
+class StringColumn:
+    """Lazy view over a "str" column; values are decoded on access"""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def span(self, row):
+        start = int(self.offsets[row - 1]) if row > 0 else 0
+        return start, int(self.offsets[row])
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return self.take(range(*row.indices(len(self))))
+        start, end = self.span(row)
+        return bytes(self.data[start:end]).decode("utf-8")
+
+    def take(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return []
+        # Offsets and bytes read through plain arrays, not one memmap slice per value
+        offsets = np.asarray(self.offsets)
+        ends = offsets[rows]
+        starts = np.where(rows > 0, offsets[rows - 1], 0)
+        data = memoryview(np.asarray(self.data))
+        return [str(data[start:end], "utf-8") for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def to_list(self):
+        return self[:]
+
+
+class ListColumn:
+    """Lazy view over a "list" column; elements are decoded on access"""
+
+    def __init__(self, codes, offsets, values):
+        self.codes = codes
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def span(self, row):
+        start = int(self.offsets[row - 1]) if row > 0 else 0
+        return start, int(self.offsets[row])
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            start, stop, step = row.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._decode(start, stop)
+        start, end = self.span(row)
+        return self._elements(self.codes[start:end])
+
+    def _elements(self, codes):
+        return np.asarray(self.values, dtype=object)[codes].tolist()
+
+    def _decode(self, first, last):
+        """Rows first..last-1, decoded with one vectorized lookup"""
+        if first >= last:
+            return []
+        base = int(self.offsets[first - 1]) if first > 0 else 0
+        ends = np.asarray(self.offsets[first:last]) - base
+        return self._split(self.codes[base:base + int(ends[-1])], ends)
+
+    def _split(self, codes, ends):
+        """Decode all elements at once, then cut them into one list per row"""
+        elements = self._elements(codes)
+        ends = ends.tolist()
+        return [elements[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+    def take(self, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return []
+        offsets = np.asarray(self.offsets)
+        ends = offsets[rows]
+        starts = np.where(rows > 0, offsets[rows - 1], 0)
+        lengths = ends - starts
+        # Element positions of all requested rows, concatenated
+        row_ends = np.cumsum(lengths)
+        positions = np.arange(int(row_ends[-1])) + np.repeat(starts - (row_ends - lengths), lengths)
+        return self._split(self.codes[positions], row_ends)
+
+    def to_list(self):
+        return self._decode(0, len(self))
+
+
+class SpanColumn(ListColumn):
+    """Lazy view over a "spans" column; each row is a list of [start, end] pairs"""
+
+    def __init__(self, pairs, offsets):
+        super().__init__(pairs, offsets, None)
+
+    def _elements(self, pairs):
+        return np.asarray(pairs).tolist()
+
+
+class ColumnStore:
+    def __init__(self, store_dir, schema=None):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+        if os.path.exists(self._path("table.json")):
+            with open(self._path("table.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if schema is not None and schema != meta["schema"]:
+                raise ValueError(f"Schema mismatch for existing table at {store_dir}")
+            self.schema = meta["schema"]
+            self.rows = meta["rows"]
+        else:
+            if schema is None:
+                raise ValueError(f"No table at {store_dir} and no schema given")
+            self.schema = dict(schema)
+            self.rows = 0
+            self._commit()
+
+        self._lock = threading.Lock()
+
+        self._dictionaries = {
+            name: self._load_dictionary(name)
+            for name, kind in self.schema.items() if kind in ("dict", "list")
+        }
+
+    def __len__(self):
+        return self.rows
+
+    # -------------------------------
+    # Files
+    # -------------------------------
+    def _path(self, name):
+        return os.path.join(self.store_dir, name)
+
+    def _commit(self):
+        tmp_path = self._path("table.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"schema": self.schema, "rows": self.rows}, f)
+        os.replace(tmp_path, self._path("table.json"))
+
+    def _load_dictionary(self, name):
+        path = self._path(f"{name}.dict")
+        if not os.path.exists(path):
+            return {"values": [], "codes": {}}
+        with open(path, "r", encoding="utf-8") as f:
+            values = json.load(f)
+        return {"values": values, "codes": {v: i for i, v in enumerate(values)}}
+
+    def _truncate(self, path, size):
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+    def _repair(self):
+        """Drop bytes left behind by an append that never committed"""
+        for name, kind in self.schema.items():
+            if kind == "str":
+                offsets = self._read_numeric(f"{name}.off", "int64")
+                self._truncate(self._path(f"{name}.off"), self.rows * 8)
+                self._truncate(self._path(f"{name}.bin"), int(offsets[-1]) if self.rows else 0)
+            elif kind in ("list", "spans"):
+                offsets = self._read_numeric(f"{name}.off", "int64")
+                element_size = 4 if kind == "list" else 8
+                self._truncate(self._path(f"{name}.off"), self.rows * 8)
+                self._truncate(self._path(f"{name}.bin"), int(offsets[-1]) * element_size if self.rows else 0)
+            else:
+                dtype = "int32" if kind == "dict" else kind
+                self._truncate(self._path(f"{name}.bin"), self.rows * np.dtype(dtype).itemsize)
+
+    def _read_numeric(self, filename, dtype, rows=None):
+        rows = self.rows if rows is None else rows
+        if rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._path(filename), dtype=dtype, mode="r", shape=(rows,))
+
+    # -------------------------------
+    # Write
+    # -------------------------------
+    def append(self, columns):
+        """Append rows given as {column name: sequence of values}"""
+        lengths = {len(columns[name]) for name in self.schema}
+        if len(lengths) != 1:
+            raise ValueError("All columns must have the same number of rows")
+        count = lengths.pop()
+        if count == 0:
+            return
+
+        with self._lock:
+            self._append(columns, count)
+
+    def _append(self, columns, count):
+        self._repair()
+        dictionaries_changed = []
+
+        for name, kind in self.schema.items():
+            values = columns[name]
+
+            if kind == "str":
+                encoded = [str(v).encode("utf-8") for v in values]
+                base = int(self._read_numeric(f"{name}.off", "int64")[-1]) if self.rows else 0
+                offsets = base + np.cumsum([len(b) for b in encoded], dtype=np.int64)
+                with open(self._path(f"{name}.bin"), "ab") as f:
+                    f.write(b"".join(encoded))
+                with open(self._path(f"{name}.off"), "ab") as f:
+                    f.write(offsets.astype("<i8").tobytes())
+
+            elif kind == "dict":
+                codes = self._encode(name, values, dictionaries_changed)
+                with open(self._path(f"{name}.bin"), "ab") as f:
+                    f.write(codes.tobytes())
+
+            elif kind == "list":
+                lengths = [len(v) for v in values]
+                codes = self._encode(name, [e for v in values for e in v], dictionaries_changed)
+                base = int(self._read_numeric(f"{name}.off", "int64")[-1]) if self.rows else 0
+                offsets = base + np.cumsum(lengths, dtype=np.int64)
+                with open(self._path(f"{name}.bin"), "ab") as f:
+                    f.write(codes.tobytes())
+                with open(self._path(f"{name}.off"), "ab") as f:
+                    f.write(offsets.astype("<i8").tobytes())
+
+            elif kind == "spans":
+                lengths = [len(v) for v in values]
+                pairs = np.asarray([pair for v in values for pair in v], dtype="<i4").reshape(-1, 2)
+                base = int(self._read_numeric(f"{name}.off", "int64")[-1]) if self.rows else 0
+                offsets = base + np.cumsum(lengths, dtype=np.int64)
+                with open(self._path(f"{name}.bin"), "ab") as f:
+                    f.write(pairs.tobytes())
+                with open(self._path(f"{name}.off"), "ab") as f:
+                    f.write(offsets.astype("<i8").tobytes())
+
+            else:
+                array = np.asarray(values, dtype=np.dtype(kind).newbyteorder("<"))
+                with open(self._path(f"{name}.bin"), "ab") as f:
+                    f.write(array.tobytes())
+
+        for name in dictionaries_changed:
+            tmp_path = self._path(f"{name}.dict.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._dictionaries[name]["values"], f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(f"{name}.dict"))
+
+        self.rows += count
+        self._commit()
+
+    def _encode(self, name, values, dictionaries_changed):
+        """int32 dictionary codes of values, adding unseen ones to the dictionary"""
+        dictionary = self._dictionaries[name]
+        codes = np.empty(len(values), dtype="<i4")
+        for i, value in enumerate(values):
+            code = dictionary["codes"].get(value)
+            if code is None:
+                code = len(dictionary["values"])
+                dictionary["values"].append(value)
+                dictionary["codes"][value] = code
+                if name not in dictionaries_changed:
+                    dictionaries_changed.append(name)
+            codes[i] = code
+        return codes
+
+    # -------------------------------
+    # Read
+    # -------------------------------
+    def column(self, name):
+        """
+        Memory-mapped column: a numpy array for numeric/dict columns (dict
+        columns return codes, see dictionary()), a StringColumn for strings,
+        a ListColumn for lists, a SpanColumn for spans
+        """
+        kind = self.schema[name]
+        if kind == "str":
+            offsets = self._read_numeric(f"{name}.off", "int64")
+            size = int(offsets[-1]) if self.rows else 0
+            data = self._read_numeric(f"{name}.bin", "uint8", rows=size)
+            return StringColumn(data, offsets)
+        if kind == "list":
+            offsets = self._read_numeric(f"{name}.off", "int64")
+            size = int(offsets[-1]) if self.rows else 0
+            codes = self._read_numeric(f"{name}.bin", "int32", rows=size)
+            return ListColumn(codes, offsets, self._dictionaries[name]["values"])
+        if kind == "spans":
+            offsets = self._read_numeric(f"{name}.off", "int64")
+            size = int(offsets[-1]) if self.rows else 0
+            pairs = self._read_numeric(f"{name}.bin", "int32", rows=2 * size).reshape(-1, 2)
+            return SpanColumn(pairs, offsets)
+        if kind == "dict":
+            return self._read_numeric(f"{name}.bin", "int32")
+        return self._read_numeric(f"{name}.bin", kind)
+
+    def dictionary(self, name):
+        """Distinct values of a dict column, indexed by code"""
+        return self._dictionaries[name]["values"]
+
+    def code(self, name, value):
+        """Code of `value` in a dict column, or None if it never occurs"""
+        return self._dictionaries[name]["codes"].get(value)
+
+    def where(self, name, values):
+        """
+        Rows whose dict column `name` holds one of `values`, compared on
+        the memory-mapped codes without decoding any value
+        """
+        codes = [self.code(name, value) for value in values]
+        codes = [code for code in codes if code is not None]
+        if not codes:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(np.isin(self.column(name), codes))
+
+    def decode(self, name, rows):
+        """Values of a dict column for the given rows"""
+        values = self._dictionaries[name]["values"]
+        codes = np.asarray(self.column(name))[np.asarray(rows, dtype=np.int64)]
+        return [values[code] for code in codes.tolist()]
@@ -0,0 +1,67 @@
+# backend/deadline.py
+"""
+Per-request latency budgets for the analyze pipeline.
+
+A Deadline is created when the request arrives and passed down to every
+stage; stages ask it whether their expected cost still fits before they
+start. LatencyTracker keeps a moving average of observed stage latencies
+so that estimate is based on how the service is actually behaving.
+"""
+
+import threading
+import time
+
+
+class Deadline:
+    def __init__(self, budget_ms=None):
+        self.start = time.monotonic()
+        self.budget = None if budget_ms is None else budget_ms / 1000.0
+
+    def remaining(self):
+        """Seconds left, or None when the request has no deadline"""
+        if self.budget is None:
+            return None
+        return max(0.0, self.budget - (time.monotonic() - self.start))
+
+    def allows(self, estimate):
+        """Whether a stage expected to take `estimate` seconds still fits"""
+        remaining = self.remaining()
+        return remaining is None or (estimate or 0.0) <= remaining
+
+    def expired(self):
+        """Whether the budget is spent (never, without a deadline)"""
+        return self.remaining() == 0.0
+
+    def elapsed_ms(self):
+        return round((time.monotonic() - self.start) * 1000, 2)
+
+
+class LatencyTracker:
+    def __init__(self, alpha=0.2):
+        self.alpha = alpha
+        self._estimates = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            previous = self._estimates.get(stage)
+            if previous is None:
+                self._estimates[stage] = seconds
+            else:
+                self._estimates[stage] = previous + self.alpha * (seconds - previous)
+
+    def decay(self, stage):
+        """
+        Shrink an estimate when its stage was skipped, so a stage that was
+        slow once gets re-measured instead of being skipped forever
+        """
+        with self._lock:
+            if stage in self._estimates:
+                self._estimates[stage] *= 1 - self.alpha
+
+    def estimate(self, stage):
+        return self._estimates.get(stage)
+
+    def snapshot(self):
+        with self._lock:
+            return {stage: round(s * 1000, 2) for stage, s in self._estimates.items()}
@@ -0,0 +1,286 @@
+# backend/document_extractor.py
+"""
+Text extraction from resume files (PDF, DOCX, plain text) with a cache.
+
+Every file is fingerprinted by its bytes; extracted text is cached in
+memory (LRU) and optionally on disk, so the same upload or file is only
+extracted once. PDF pages are read from the text layer with PyPDF2 (fast
+path); only pages where that yields nothing usable are re-extracted with
+the layout-aware pdfplumber, as are whole files PyPDF2 cannot open.
+Documents with many pages are split into page ranges extracted in a
+process pool, and batches of files (extract_many) are extracted file by
+file in the same pool.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import PyPDF2
+import pdfplumber
+from docx import Document
+from lru_cache import LRUCache
+
+PDF = "pdf"
+DOCX = "docx"
+TEXT = "txt"
+
+MIME_TYPES = {
+    "application/pdf": PDF,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DOCX,
+    "text/plain": TEXT,
+}
+EXTENSIONS = {".pdf": PDF, ".docx": DOCX, ".txt": TEXT}
+
+
+def fingerprint(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_kind(filename=None, mime_type=None):
+    """PDF, DOCX or TEXT from a MIME type or file name; ValueError if unsupported"""
+    kind = MIME_TYPES.get(mime_type) or EXTENSIONS.get(os.path.splitext(filename or "")[1].lower())
+    if kind is None:
+        raise ValueError(f"Unsupported file type: {mime_type or filename}")
+    return kind
+
+
+def usable(text):
+    """
+    Whether fast-path page text can be kept: not empty, and not the
+    letter-by-letter or undecodable output of a broken text layer
+    """
+    words = text.split()
+    if not words:
+        return False
+    single_letters = sum(len(word) == 1 for word in words)
+    return single_letters < len(words) / 2 and text.count("\ufffd") < len(text) / 20
+
+
+def extract_pdf_pages(data, pages):
+    """
+    Texts of the given page indices: PyPDF2 first, pdfplumber for pages
+    whose fast text is not usable. Returns (texts, fallback page count).
+    """
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+    except Exception:
+        reader = None
+    texts = []
+    fallback = []
+    for page in pages:
+        try:
+            text = reader.pages[page].extract_text() or ""
+        except Exception:
+            text = ""
+        if not usable(text):
+            fallback.append(len(texts))
+        texts.append(text)
+
+    if fallback:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for i in fallback:
+                texts[i] = pdf.pages[pages[i]].extract_text() or ""
+
+    return texts, len(fallback)
+
+
+def extract_pdf_plumber(data):
+    """All page texts with pdfplumber, for PDFs PyPDF2 cannot open."""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages]
+
+
+def extract_docx(data):
+    return "\n".join(paragraph.text for paragraph in Document(io.BytesIO(data)).paragraphs)
+
+
+# Extractor of a pool worker (no cache of its own), created on first use
+_worker_extractor = None
+
+
+def _extract_uncached(data, kind):
+    """(text, stats) of one document in a pool worker; stats are this call's page counters"""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = DocumentExtractor(cache_size=1)
+    before = dict(_worker_extractor.stats)
+    text = _worker_extractor._extract_kind(data, kind)
+    return text, {name: value - before[name] for name, value in _worker_extractor.stats.items()}
+
+
+class DocumentExtractor:
+    def __init__(self, cache_dir=None, cache_size=256, workers=1, parallel_pages=8):
+        """
+        cache_dir: optional directory of <fingerprint>.txt files shared
+        across processes and runs. With workers > 1, PDFs of at least
+        parallel_pages pages are split into page ranges extracted in a
+        process pool.
+        """
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.workers = workers
+        self.parallel_pages = parallel_pages
+        self._cache = LRUCache(cache_size)
+        self._pool = None
+        # Guards the pool and the counters: one extractor serves many threads
+        self._lock = threading.Lock()
+
+        # Counters: cache hits, extracted files, fast-path and fallback pages
+        self.stats = {"hits": 0, "extracted": 0, "fast_pages": 0, "fallback_pages": 0}
+
+    def _count(self, name, value=1):
+        with self._lock:
+            self.stats[name] += value
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    # -------------------------------
+    # Cache
+    # -------------------------------
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def _cached(self, key):
+        text = self._cache.get(key)
+        if text is None and self.cache_dir and os.path.exists(self._cache_path(key)):
+            with open(self._cache_path(key), "r", encoding="utf-8") as f:
+                text = f.read()
+            self._cache.put(key, text)
+        return text
+
+    def _store(self, key, text):
+        self._cache.put(key, text)
+        if self.cache_dir:
+            tmp_path = self._cache_path(key) + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self._cache_path(key))
+
+    # -------------------------------
+    # Extraction
+    # -------------------------------
+    def extract(self, data, filename=None, mime_type=None):
+        """
+        Text of one document given as bytes, a file-like object or a path.
+        The type comes from mime_type or the file name (ValueError if
+        unsupported).
+        """
+        if isinstance(data, (str, os.PathLike)):
+            filename = filename or os.fspath(data)
+            with open(data, "rb") as f:
+                data = f.read()
+        elif not isinstance(data, bytes):
+            data = data.getvalue() if hasattr(data, "getvalue") else data.read()
+
+        kind = file_kind(filename, mime_type)
+        key = fingerprint(data)
+        text = self._cached(key)
+        if text is not None:
+            self._count("hits")
+            return text
+
+        text = self._extract_kind(data, kind)
+        self._count("extracted")
+        self._store(key, text)
+        return text
+
+    def _extract_kind(self, data, kind):
+        if kind == PDF:
+            return self.extract_pdf(data)
+        if kind == DOCX:
+            return extract_docx(data).strip()
+        return data.decode("utf-8", errors="replace")
+
+    def extract_many(self, documents):
+        """
+        Extract (data, filename, mime_type) documents, yielding (index,
+        text, error) in completion order: cached documents first, the rest
+        file by file in the process pool when workers > 1. A document that
+        fails yields its error message instead of raising.
+        """
+        pending = []
+        for index, (data, filename, mime_type) in enumerate(documents):
+            try:
+                kind = file_kind(filename, mime_type)
+            except ValueError as e:
+                yield index, None, str(e)
+                continue
+            key = fingerprint(data)
+            text = self._cached(key)
+            if text is None:
+                pending.append((index, key, data, kind))
+            else:
+                self._count("hits")
+                yield index, text, None
+
+        if self.workers <= 1 or len(pending) <= 1:
+            for index, key, data, kind in pending:
+                try:
+                    text = self._extract_kind(data, kind)
+                except Exception as e:
+                    yield index, None, f"{type(e).__name__}: {e}"
+                    continue
+                self._count("extracted")
+                self._store(key, text)
+                yield index, text, None
+            return
+
+        pool = self._get_pool()
+        futures = {
+            pool.submit(_extract_uncached, data, kind): (index, key)
+            for index, key, data, kind in pending
+        }
+        for future in as_completed(futures):
+            index, key = futures[future]
+            try:
+                text, stats = future.result()
+            except Exception as e:
+                yield index, None, f"{type(e).__name__}: {e}"
+                continue
+            for name, value in stats.items():
+                self._count(name, value)
+            self._count("extracted")
+            self._store(key, text)
+            yield index, text, None
+
+    def extract_pdf(self, data):
+        try:
+            page_count = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+        except Exception:
+            # PyPDF2 cannot read the file at all: pdfplumber for the whole document
+            texts = extract_pdf_plumber(data)
+            self._count("fallback_pages", len(texts))
+            return "\n".join(text.strip() for text in texts if text.strip())
+        pages = list(range(page_count))
+
+        if self.workers > 1 and page_count >= self.parallel_pages:
+            pool = self._get_pool()
+            size = -(-page_count // self.workers)
+            futures = [
+                pool.submit(extract_pdf_pages, data, pages[first:first + size])
+                for first in range(0, page_count, size)
+            ]
+            results = [future.result() for future in futures]
+        else:
+            results = [extract_pdf_pages(data, pages)]
+
+        texts = [text for page_texts, _ in results for text in page_texts]
+        fallback = sum(count for _, count in results)
+        self._count("fast_pages", page_count - fallback)
+        self._count("fallback_pages", fallback)
+
+        # PyPDF2 ends pages with a newline, pdfplumber does not
+        return "\n".join(text.strip() for text in texts if text.strip())
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
@@ -6,7 +6,7 @@ class EmbeddingModel:
     def __init__(self, model_name="all-mpnet-base-v2"):
         self.model = SentenceTransformer(model_name)
 
-    def encode(self, texts):
+    def encode(self, texts, batch_size=32):
         if isinstance(texts, str):
             texts = [texts]
-        return self.model.encode(texts, convert_to_tensor=True)
+        return self.model.encode(texts, batch_size=batch_size, convert_to_tensor=True)
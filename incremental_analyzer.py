@@ -0,0 +1,239 @@
+# incremental_analyzer.py
+"""
+Incremental re-analysis of an edited resume.
+
+The resume is split into blocks (paragraphs, long paragraphs into groups of
+lines). Every block is fingerprinted and its skill matches, AI-detector
+features and embedding are cached by fingerprint, so re-analysing after a
+small edit only recomputes the blocks that changed and merges them with the
+cached results for the rest.
+
+Merging reproduces the full-text skills and detector metrics: sentences
+and regex pattern matches that cross a block boundary are re-assembled
+from the neighbouring blocks. The semantic score uses the word-count
+weighted mean of the block embeddings rather than one embedding of the
+whole text.
+"""
+
+import hashlib
+import re
+from collections import Counter
+import numpy as np
+from ai_detector import SENTENCE_SPLIT, TextFeatures
+from lru_cache import LRUCache
+
+BLOCK_SPLIT = re.compile(r'(\n\s*\n)')
+MAX_BLOCK_LINES = 3
+# Characters kept from each side of a block boundary to find pattern
+# matches spanning it (longer than any AI-pattern match)
+BOUNDARY_WINDOW = 100
+
+
+def fingerprint(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class IncrementalAnalyzer:
+    def __init__(self, skill_extractor, matcher, ai_detector, cache_size=4096):
+        self.skill_extractor = skill_extractor
+        self.matcher = matcher
+        self.ai_detector = ai_detector
+
+        self._skills = LRUCache(cache_size)
+        self._detector = LRUCache(cache_size)
+        self._embeddings = LRUCache(cache_size)
+        self._jd_skills = LRUCache(64)
+        self._jd_embeddings = LRUCache(64)
+
+    # -------------------------------
+    # Blocks
+    # -------------------------------
+    def split_blocks(self, text):
+        """
+        Returns (blocks, separators) with
+        text == blocks[0] + separators[0] + blocks[1] + ... + blocks[-1]
+        """
+        parts = BLOCK_SPLIT.split(text)
+        blocks, separators = [], []
+
+        for i, part in enumerate(parts):
+            if i % 2:
+                separators.append(part)
+                continue
+
+            lines = part.split("\n")
+            for start in range(0, len(lines), MAX_BLOCK_LINES):
+                if start:
+                    separators.append("\n")
+                blocks.append("\n".join(lines[start:start + MAX_BLOCK_LINES]))
+
+        return blocks, separators
+
+    def _cached(self, cache, stage, blocks, compute, stats=None):
+        """
+        Look up every block, computing only the ones not cached. When given
+        a dict, stats[stage] is set to the blocks seen / recomputed.
+        """
+        keys = [fingerprint(block) for block in blocks]
+        results = [cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+
+        for i in missing:
+            results[i] = compute(blocks[i])
+            cache.put(keys[i], results[i])
+
+        if stats is not None:
+            stats[stage] = {"blocks": len(blocks), "recomputed": len(missing)}
+        return results
+
+    # -------------------------------
+    # Skills
+    # -------------------------------
+    def extract_skills(self, resume_text, stats=None):
+        """Same output as SkillExtractor.extract(resume_text)"""
+        blocks, _ = self.split_blocks(resume_text)
+        outputs = self._cached(self._skills, "skills", blocks, self.skill_extractor.extract, stats)
+
+        found_skills = set()
+        categorized_skills = {}
+        for output in outputs:
+            found_skills.update(output["normalized_skills"])
+            for category, skills in output["skill_categories"].items():
+                categorized_skills.setdefault(category, set()).update(skills)
+
+        # Keep the ontology's category order, as extract() does
+        return {
+            "normalized_skills": sorted(found_skills),
+            "skill_categories": {
+                category: sorted(categorized_skills[category])
+                for category in self.skill_extractor.ontology
+                if category in categorized_skills
+            }
+        }
+
+    def extract_jd_skills(self, job_description):
+        key = fingerprint(job_description)
+        output = self._jd_skills.get(key)
+        if output is None:
+            output = self.skill_extractor.extract(job_description)
+            self._jd_skills.put(key, output)
+        return output
+
+    # -------------------------------
+    # AI Detection
+    # -------------------------------
+    def _detector_features(self, block):
+        detector = self.ai_detector
+        features = TextFeatures(block)
+        lower = features.lower
+        return {
+            "word_freq": features.word_freq,
+            "total_words": features.total_words,
+            "formal_count": detector.formal_count(features.word_freq),
+            "phrases": {p for p in detector.ai_phrases if p in lower},
+            "pattern_hits": detector.pattern_hits(lower),
+            "pieces": SENTENCE_SPLIT.split(lower),
+            "head": lower[:BOUNDARY_WINDOW],
+            "tail": lower[-BOUNDARY_WINDOW:]
+        }
+
+    def _boundary_pattern_hits(self, tail, separator, head):
+        """Pattern matches that start before a block boundary and end after it"""
+        window = tail + separator + head
+        hits = 0
+        for regex in self.ai_detector.pattern_regexes:
+            for match in regex.finditer(window):
+                if match.start() < len(tail) + len(separator) and match.end() > len(tail):
+                    hits += 1
+        return hits
+
+    def detect_ai_content(self, resume_text, stats=None):
+        """Same output as AIContentDetector.detect_ai_content(resume_text)"""
+        if not resume_text or len(resume_text.strip()) < 50:
+            return False, 0, {"error": "Text too short to analyze"}
+
+        blocks, separators = self.split_blocks(resume_text)
+        features = self._cached(self._detector, "detector", blocks, self._detector_features, stats)
+
+        word_freq = Counter()
+        total_words = formal_count = pattern_hits = 0
+        phrases = set()
+        pieces = []
+
+        for i, block_features in enumerate(features):
+            # Counter.update keeps first-occurrence order, like Counter(words)
+            word_freq.update(block_features["word_freq"])
+            total_words += block_features["total_words"]
+            formal_count += block_features["formal_count"]
+            pattern_hits += block_features["pattern_hits"]
+            phrases |= block_features["phrases"]
+
+            if i:
+                pattern_hits += self._boundary_pattern_hits(
+                    features[i - 1]["tail"], separators[i - 1].lower(), block_features["head"]
+                )
+
+            # The last sentence of a block continues into the next block
+            block_pieces = block_features["pieces"]
+            if pieces:
+                pieces[-1] = pieces[-1] + separators[i - 1] + block_pieces[0]
+                pieces.extend(block_pieces[1:])
+            else:
+                pieces.extend(block_pieces)
+
+        sentences = [s.strip() for s in pieces if s.strip()]
+        detector = self.ai_detector
+
+        # The language model scores the whole text (n-grams cross blocks)
+        if detector.language_model is None:
+            lm_perplexity = None
+            perplexity = detector.perplexity_from_counts(word_freq, total_words)
+        else:
+            lm_perplexity = detector.language_model.perplexity(resume_text)
+            perplexity = detector.perplexity_from_lm(lm_perplexity, total_words)
+
+        is_ai, ai_score, details = detector.score_metrics(
+            perplexity=perplexity,
+            burstiness=detector.burstiness_from_lengths([len(s.split()) for s in sentences]),
+            ai_phrase_count=len(phrases) + pattern_hits,
+            repetition=detector.repetition_from_sentences(sentences),
+            formality=detector.formality_from_counts(formal_count, total_words),
+            lm_perplexity=lm_perplexity
+        )
+        # Shingles cross blocks too; the index query is cheap on the full text
+        if detector.duplicate_index is not None:
+            details["near_duplicates"] = detector.duplicate_index.query(resume_text)
+        return is_ai, ai_score, details
+
+    # -------------------------------
+    # Semantic Match
+    # -------------------------------
+    def semantic_match(self, resume_text, job_description, stats=None):
+        """
+        Cosine similarity of the block-mean resume embedding and the JD.
+        When given a dict, stats["embeddings"] is set to the blocks seen /
+        re-encoded by this call.
+        """
+        blocks, _ = self.split_blocks(resume_text)
+        keys = [fingerprint(block) for block in blocks]
+        embeddings = [self._embeddings.get(key) for key in keys]
+        missing = [i for i, e in enumerate(embeddings) if e is None]
+
+        # Encode all changed blocks in one batch
+        if missing:
+            for i, embedding in zip(missing, self.matcher.embed_batch([blocks[i] for i in missing])):
+                embeddings[i] = embedding
+                self._embeddings.put(keys[i], embedding)
+        if stats is not None:
+            stats["embeddings"] = {"blocks": len(blocks), "recomputed": len(missing)}
+
+        weights = np.array([max(len(block.split()), 1) for block in blocks], dtype=np.float64)
+        resume_embedding = np.average(np.vstack(embeddings), axis=0, weights=weights)
+
+        jd_key = fingerprint(job_description)
+        jd_embedding = self._jd_embeddings.get(jd_key)
+        if jd_embedding is None:
+            jd_embedding = self.matcher.embed(job_description)
+            self._jd_embeddings.put(jd_key, jd_embedding)
+
+        return self.matcher.match_embeddings(resume_embedding, jd_embedding)
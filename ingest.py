@@ -0,0 +1,340 @@
+# backend/ingest.py
+"""
+Bulk ingestion of resume files (PDF, DOCX, TXT) from a directory tree.
+
+Files are fingerprinted by their bytes; fingerprints already in the store
+(and, when embedding, in the corpus) are skipped, so re-running over a
+shared folder only ingests new files, and embeds files that an earlier
+--no-embed or interrupted run left out of the corpus.
+The remaining files flow through a pipeline of stages connected by
+bounded queues, each stage working on the next file while the following
+one is busy:
+
+    extract   DocumentExtractor, in a process pool
+    parse     ResumeParser.parse_spans (sections as byte spans)
+    tag       SkillExtractor (ontology-normalized skills and bitsets)
+    embed     ResumeJDMatcher.embed_batch, batch_size files at a time
+
+Committed files are appended to a ParsedResumeStore (resume_id is the file
+fingerprint, category the folder, skills the normalized ones) and, when
+embedding, to the ResumeCorpus searched by /search. The corpus is locked
+across processes, so ingesting while the API runs is safe and /search
+sees the new resumes. ingest_files.jsonl in the store directory maps
+fingerprints back to file paths.
+
+Usage:
+    python ingest.py shared/resumes
+    python ingest.py shared/resumes --store datasets/ingested_store --workers 8
+    python ingest.py shared/resumes --no-embed
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from document_extractor import EXTENSIONS, DocumentExtractor
+from parsed_store import ParsedResumeStore
+from resume_corpus import ResumeCorpus
+from resume_parser import ResumeParser
+from skill_extractor import SkillExtractor
+
+# End of a stage's input
+DONE = object()
+
+# Extractor of a pool worker, created on first use in that process
+_extractor = None
+
+
+def _extract(data, filename):
+    """(text, error) of one file, in a worker process"""
+    global _extractor
+    if _extractor is None:
+        _extractor = DocumentExtractor(cache_dir=os.environ.get("EXTRACTION_CACHE_DIR"))
+    try:
+        return _extractor.extract(data, filename), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def iter_files(root):
+    """Paths of supported files under root, in a stable order"""
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in EXTENSIONS:
+                yield os.path.join(directory, filename)
+
+
+def file_category(root, path):
+    """Folder of the file relative to root ("" at the top level)"""
+    folder = os.path.dirname(os.path.relpath(path, root))
+    return folder.replace(os.sep, "/")
+
+
+class Ingester:
+    def __init__(self, store_dir="datasets/ingested_store", corpus_dir="datasets/resume_corpus",
+                 skill_extractor=None, matcher=None, workers=4, batch_size=64, commit_size=1024,
+                 queue_size=256):
+        """
+        matcher: ResumeJDMatcher for the embed stage; without one, resumes
+        are parsed and tagged into the store only and corpus_dir is unused.
+        Files are embedded batch_size at a time and written commit_size at
+        a time; queue_size bounds the items waiting between two stages.
+        """
+        self.store = ParsedResumeStore(store_dir)
+        self.manifest_path = os.path.join(store_dir, "ingest_files.jsonl")
+        self.corpus = ResumeCorpus(corpus_dir) if matcher is not None else None
+        self.parser = ResumeParser(None, stream=True)
+        self.skill_extractor = skill_extractor or SkillExtractor("skill_ontology.json")
+        self.matcher = matcher
+        self.workers = workers
+        self.batch_size = batch_size
+        self.commit_size = commit_size
+        self.queue_size = queue_size
+
+        self.stats = {"files": 0, "skipped": 0, "failed": 0, "ingested": 0}
+        self.failures = []
+        # Fingerprints already in the store and the corpus
+        self._stored = set()
+        self._embedded = set()
+
+    # -------------------------------
+    # Stages
+    # -------------------------------
+    def _read(self, root, known, errors):
+        """(fingerprint, path, bytes) of files not ingested yet; duplicates are skipped"""
+        for path in iter_files(root):
+            if errors:
+                return
+            self.stats["files"] += 1
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                self.stats["failed"] += 1
+                self.failures.append((path, f"{type(e).__name__}: {e}"))
+                continue
+            key = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if key in known:
+                self.stats["skipped"] += 1
+                continue
+            known.add(key)
+            yield key, path, data
+
+    def _extract_all(self, root, known, outbox, errors):
+        """Extract files in a process pool, at most 2 * workers in flight"""
+        def emit(key, path, result):
+            text, error = result
+            if error is None:
+                outbox.put((key, path, text))
+            else:
+                self.stats["failed"] += 1
+                self.failures.append((path, error))
+
+        files = self._read(root, known, errors)
+        if self.workers <= 1:
+            for key, path, data in files:
+                emit(key, path, _extract(data, path))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = {}
+            for key, path, data in files:
+                if len(pending) >= 2 * self.workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        emit(*pending.pop(future), future.result())
+                pending[pool.submit(_extract, data, path)] = (key, path)
+            for future in wait(pending).done:
+                emit(*pending.pop(future), future.result())
+
+    def _parse(self, item, root):
+        key, path, text = item
+        return path, self.parser.parse_spans(key, text, file_category(root, path))
+
+    def _tag(self, item):
+        path, row = item
+        skill_output = self.skill_extractor.extract(row["text"], raw_skills=row["skills"])
+        row["skills"] = skill_output["normalized_skills"]
+        return path, row, skill_output
+
+    def _run_stage(self, work, inbox, outbox, errors):
+        """Apply work to every item of inbox; after an error, drain inbox so upstream never blocks"""
+        try:
+            for item in iter(inbox.get, DONE):
+                if not errors:
+                    outbox.put(work(item))
+        except BaseException as e:
+            errors.append(e)
+            for _ in iter(inbox.get, DONE):
+                pass
+        finally:
+            outbox.put(DONE)
+
+    def _producer(self, root, known, outbox, errors):
+        try:
+            self._extract_all(root, known, outbox, errors)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            outbox.put(DONE)
+
+    def _embed_stage(self, inbox, outbox, errors):
+        """Group tagged files into batches of batch_size and embed each batch at once"""
+        def flush(batch):
+            embeddings = None
+            if self.matcher is not None:
+                embeddings = self.matcher.embed_batch([row["text"] for _, row, _ in batch],
+                                                      batch_size=self.batch_size)
+            outbox.put((batch, embeddings))
+
+        batch = []
+        try:
+            for item in iter(inbox.get, DONE):
+                if errors:
+                    continue
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    flush(batch)
+                    batch = []
+            if batch and not errors:
+                flush(batch)
+        except BaseException as e:
+            errors.append(e)
+            for _ in iter(inbox.get, DONE):
+                pass
+        finally:
+            outbox.put(DONE)
+
+    # -------------------------------
+    # Sink
+    # -------------------------------
+    def _commit(self, batches):
+        """
+        Append embedded batches to the corpus, the store and the file
+        manifest, each only with the files it does not hold yet
+        """
+        items = [item for batch, _ in batches for item in batch]
+        rows = [row for _, row, _ in items]
+
+        if self.corpus is not None:
+            embeddings = np.concatenate([embeddings for _, embeddings in batches])
+            new = [i for i, row in enumerate(rows) if row["resume_id"] not in self._embedded]
+            skill_outputs = [items[i][2] for i in new]
+            self.corpus.add(
+                resume_ids=[rows[i]["resume_id"] for i in new],
+                resume_texts=[rows[i]["text"] for i in new],
+                skill_vectors=[self.skill_extractor.skill_vector(o["normalized_skills"]) for o in skill_outputs],
+                skill_outputs=skill_outputs,
+                embeddings=embeddings[new]
+            )
+            self._embedded.update(rows[i]["resume_id"] for i in new)
+
+        new = [(path, row) for path, row, _ in items if row["resume_id"] not in self._stored]
+        self.store.add([row for _, row in new])
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            for path, row in new:
+                f.write(json.dumps({"resume_id": row["resume_id"], "path": os.path.abspath(path)}) + "\n")
+        self._stored.update(row["resume_id"] for _, row in new)
+        self.stats["ingested"] += len(rows)
+
+    # -------------------------------
+    # Run
+    # -------------------------------
+    def ingest(self, root, progress=None):
+        """
+        Ingest every new supported file under root. progress(stats) is
+        called after each commit. Returns the stats.
+        """
+        # A file is done once it is in the store and, when embedding, the corpus
+        self._stored = set(self.store.column("resume_id"))
+        known = set(self._stored)
+        if self.corpus is not None:
+            self._embedded = set(self.corpus.resume_ids())
+            known &= self._embedded
+        errors = []
+        extracted, parsed, tagged, embedded = (queue.Queue(self.queue_size) for _ in range(4))
+        threads = [
+            threading.Thread(target=self._producer, args=(root, known, extracted, errors), daemon=True),
+            threading.Thread(target=self._run_stage, daemon=True,
+                             args=(lambda item: self._parse(item, root), extracted, parsed, errors)),
+            threading.Thread(target=self._run_stage, args=(self._tag, parsed, tagged, errors), daemon=True),
+            threading.Thread(target=self._embed_stage, args=(tagged, embedded, errors), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+
+        def commit(batches):
+            self._commit(batches)
+            if progress:
+                progress(self.stats)
+
+        # ResumeCorpus.add rewrites its arrays, so commits gather commit_size files
+        batches = []
+        drained = False
+        try:
+            for batch in iter(embedded.get, DONE):
+                if errors:
+                    continue
+                batches.append(batch)
+                if sum(len(items) for items, _ in batches) >= self.commit_size:
+                    commit(batches)
+                    batches = []
+            drained = True
+            if batches and not errors:
+                commit(batches)
+        except BaseException as e:
+            # Stop the stages and let them run out before re-raising
+            errors.append(e)
+            if not drained:
+                for _ in iter(embedded.get, DONE):
+                    pass
+
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        return self.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("root", help="directory searched recursively for .pdf, .docx and .txt files")
+    parser.add_argument("--store", default="datasets/ingested_store", help="parsed-resume store directory")
+    parser.add_argument("--corpus", default=os.environ.get("RESUME_CORPUS_DIR", "datasets/resume_corpus"),
+                        help="resume corpus directory (embeddings for /search)")
+    parser.add_argument("--no-embed", action="store_true", help="parse and tag only, skip the embedding model")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="extraction processes")
+    parser.add_argument("--batch-size", type=int, default=64, help="files per embedding batch")
+    parser.add_argument("--commit-size", type=int, default=1024, help="files per store and corpus append")
+    parser.add_argument("--queue-size", type=int, default=256, help="files buffered between two stages")
+    args = parser.parse_args()
+
+    matcher = None
+    if not args.no_embed:
+        from matcher import ResumeJDMatcher
+        matcher = ResumeJDMatcher()
+
+    start = time.time()
+    ingester = Ingester(args.store, args.corpus, matcher=matcher, workers=args.workers,
+                        batch_size=args.batch_size, commit_size=args.commit_size, queue_size=args.queue_size)
+
+    def progress(stats):
+        print(f"  {stats['ingested']:,} ingested, {stats['skipped']:,} skipped, "
+              f"{stats['failed']:,} failed", end="\r")
+
+    stats = ingester.ingest(args.root, progress)
+    print()
+    for path, error in ingester.failures:
+        print(f"  ✗ {path}: {error}")
+    print(f"✓ Ingested {stats['ingested']:,} of {stats['files']:,} files into {args.store} "
+          f"in {time.time() - start:.1f}s ({stats['skipped']:,} already ingested, {stats['failed']:,} failed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# backend/job_store.py
+"""
+Persistent store for registered job descriptions.
+
+Each job keeps the JD-side work that /analyze would otherwise redo on every
+request: normalized skills, skill categories and the JD embedding. Metadata
+is stored as <job_id>.json and the embedding as <job_id>.npy, so a job
+survives restarts and is loaded into memory once per process.
+"""
+
+import json
+import os
+import time
+import uuid
+import numpy as np
+
+
+class JobStore:
+    def __init__(self, store_dir="datasets/job_store", default_ttl_days=90):
+        self.store_dir = store_dir
+        self.default_ttl_days = default_ttl_days
+        self._cache = {}
+        os.makedirs(store_dir, exist_ok=True)
+
+    # -------------------------------
+    # Paths
+    # -------------------------------
+    def _meta_path(self, job_id):
+        return os.path.join(self.store_dir, f"{job_id}.json")
+
+    def _embedding_path(self, job_id):
+        return os.path.join(self.store_dir, f"{job_id}.npy")
+
+    def _is_expired(self, job, now=None):
+        expires_at = job.get("expires_at")
+        return expires_at is not None and expires_at <= (now or time.time())
+
+    # -------------------------------
+    # Write
+    # -------------------------------
+    def add(self, job_description, skill_output, embedding, title=None, ttl_days=None):
+        """
+        Store a JD with its precomputed skills and embedding.
+        Returns the stored job (including the embedding).
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        ttl_days = self.default_ttl_days if ttl_days is None else ttl_days
+
+        job = {
+            "job_id": job_id,
+            "title": title,
+            "job_description": job_description,
+            "normalized_skills": skill_output["normalized_skills"],
+            "skill_categories": skill_output["skill_categories"],
+            "created_at": now,
+            "expires_at": now + ttl_days * 86400 if ttl_days else None
+        }
+
+        embedding = np.asarray(embedding, dtype=np.float32)
+        np.save(self._embedding_path(job_id), embedding)
+
+        # Write metadata last and atomically: a job is visible only once complete
+        tmp_path = self._meta_path(job_id) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self._meta_path(job_id))
+
+        job["embedding"] = embedding
+        self._cache[job_id] = job
+        return job
+
+    def delete(self, job_id):
+        self._cache.pop(job_id, None)
+        removed = False
+        for path in (self._meta_path(job_id), self._embedding_path(job_id)):
+            if os.path.exists(path):
+                os.remove(path)
+                removed = True
+        return removed
+
+    def purge_expired(self):
+        """Delete every expired job, returns the removed job IDs"""
+        now = time.time()
+        expired = [job["job_id"] for job in self._iter_meta() if self._is_expired(job, now)]
+        for job_id in expired:
+            self.delete(job_id)
+        return expired
+
+    # -------------------------------
+    # Read
+    # -------------------------------
+    def _iter_meta(self):
+        for name in os.listdir(self.store_dir):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.store_dir, name), "r", encoding="utf-8") as f:
+                yield json.load(f)
+
+    def get(self, job_id):
+        """
+        Return the job (with its embedding) or None if unknown or expired.
+        Loaded jobs are served from memory afterwards.
+        """
+        job = self._cache.get(job_id)
+
+        if job is None:
+            # Job IDs are uuid hex strings, anything else never touches the disk
+            if not all(c in "0123456789abcdef" for c in job_id):
+                return None
+            if not os.path.exists(self._meta_path(job_id)):
+                return None
+            with open(self._meta_path(job_id), "r", encoding="utf-8") as f:
+                job = json.load(f)
+            job["embedding"] = np.load(self._embedding_path(job_id))
+            self._cache[job_id] = job
+
+        if self._is_expired(job):
+            self.delete(job_id)
+            return None
+
+        return job
+
+    def list(self):
+        """List stored jobs without their embeddings, expired jobs are dropped"""
+        self.purge_expired()
+        jobs = sorted(self._iter_meta(), key=lambda job: job["created_at"])
+        for job in jobs:
+            job.pop("job_description", None)
+        return jobs
@@ -1,10 +1,22 @@
 # backend/main.py
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Response
+from pydantic import BaseModel, Field
 from skill_extractor import SkillExtractor
 from matcher import ResumeJDMatcher
 from ats_scorer import ATSScorer
+from resume_parser import ResumeParser
+from job_store import JobStore
+from resume_corpus import ResumeCorpus
+from score_store import ScoreStore
+from deadline import Deadline, LatencyTracker
+import response_encoding
 
 app = FastAPI(
     title="AI Resume Analyzer API",
@@ -16,61 +28,161 @@ app = FastAPI(
 # Load Models Once
 # -------------------------------
 skill_extractor = SkillExtractor("skill_ontology.json")
+resume_parser = ResumeParser(None, stream=True)
 matcher = ResumeJDMatcher()
-scorer = ATSScorer()
+scorer = ATSScorer.from_file(os.environ["ATS_WEIGHTS_FILE"]) if os.environ.get("ATS_WEIGHTS_FILE") else ATSScorer()
+job_store = JobStore(os.environ.get("JOB_STORE_DIR", "datasets/job_store"))
+resume_corpus = ResumeCorpus(os.environ.get("RESUME_CORPUS_DIR", "datasets/resume_corpus"))
+score_store = ScoreStore(os.environ.get("SCORE_STORE_DIR", "datasets/score_store"))
+
+# Candidates re-scored with ATSScorer per requested result in /search
+SHORTLIST_FACTOR = 2
+
+# -------------------------------
+# Latency Budget & Metrics
+# -------------------------------
+# Default /analyze budget in ms (unset = no deadline), overridable per request
+# with the X-Deadline-Ms header
+DEFAULT_DEADLINE_MS = (
+    float(os.environ["ANALYZE_DEADLINE_MS"]) if os.environ.get("ANALYZE_DEADLINE_MS") else None
+)
+EMBEDDING_WORKERS = int(os.environ.get("EMBEDDING_WORKERS", "4"))
+embedding_pool = ThreadPoolExecutor(max_workers=EMBEDDING_WORKERS)
+# Semantic stages holding a worker, including ones whose request already gave up
+embedding_slots = threading.BoundedSemaphore(EMBEDDING_WORKERS)
+latency = LatencyTracker()
+
+metrics = Counter()
+metrics_lock = threading.Lock()
+
+def count(name, value=1):
+    with metrics_lock:
+        metrics[name] += value
 
 # -------------------------------
 # Request Schema
 # -------------------------------
 class AnalyzeRequest(BaseModel):
     resume_text: str
+    job_description: Optional[str] = None
+    job_id: Optional[str] = None
+    candidate_id: Optional[str] = None
+
+class BatchAnalyzeRequest(BaseModel):
+    resumes: list[str] = Field(..., min_length=1, max_length=1000)
+    job_description: Optional[str] = None
+    job_id: Optional[str] = None
+    candidate_ids: Optional[list[str]] = None
+
+class JobRequest(BaseModel):
     job_description: str
+    title: Optional[str] = None
+    ttl_days: Optional[float] = None
+
+class ResumeItem(BaseModel):
+    resume_id: str
+    resume_text: str
+
+class AddResumesRequest(BaseModel):
+    resumes: list[ResumeItem] = Field(..., min_length=1)
+
+class SearchRequest(BaseModel):
+    job_description: Optional[str] = None
+    job_id: Optional[str] = None
+    top_n: int = Field(50, ge=1, le=1000)
+    min_skill_match: float = Field(0.0, ge=0.0, le=1.0)
+
+class ReweightRequest(BaseModel):
+    weights: dict[str, float]
+    job_id: Optional[str] = None
+    top_k: int = Field(50, ge=1, le=10000)
 
 # -------------------------------
 # Response Schema
 # -------------------------------
-class AnalyzeResponse(BaseModel):
+class AnalyzeResult(BaseModel):
     ats_score: float
-    semantic_match: float
+    semantic_match: Optional[float] = None
     skill_match: float
     section_completeness: float
     category_balance: float
     formatting: float
     extracted_skills: list
+    stages: list
+    unavailable: list
+    degraded: bool
 
-# -------------------------------
-# API Endpoint
-# -------------------------------
-@app.post("/analyze", response_model=AnalyzeResponse)
-def analyze_resume(data: AnalyzeRequest):
+class AnalyzeResponse(AnalyzeResult):
+    elapsed_ms: float
 
-    resume_text = data.resume_text
-    jd_text = data.job_description
+class BatchAnalyzeResponse(BaseModel):
+    results: list[AnalyzeResult]
+    elapsed_ms: float
 
-    # Skill extraction
-    resume_skills = skill_extractor.extract(resume_text)
-    jd_skills = skill_extractor.extract(jd_text)["normalized_skills"]
+class JobResponse(BaseModel):
+    job_id: str
+    title: Optional[str] = None
+    normalized_skills: list
+    skill_categories: dict
+    created_at: float
+    expires_at: Optional[float] = None
 
-    # Semantic matching
-    semantic_score = matcher.match(resume_text, jd_text)
+class CandidateResult(BaseModel):
+    resume_id: str
+    ats_score: float
+    semantic_match: float
+    skill_match: float
+    section_completeness: float
+    category_balance: float
+    formatting: float
 
-    # Minimal resume JSON for scoring
-    resume_json = {
-        "skills": resume_skills["normalized_skills"],
-        "experience": resume_text,
-        "education": resume_text,
-        "projects": resume_text
-    }
+class SearchResponse(BaseModel):
+    candidates_considered: int
+    results: list[CandidateResult]
 
-    # ATS scoring
+class RankedCandidate(BaseModel):
+    rank: int
+    candidate_id: str
+    job_id: str
+    ats_score: float
+
+class ReweightResponse(BaseModel):
+    weights: dict[str, float]
+    candidates: int
+    elapsed_ms: float
+    results: list[RankedCandidate]
+
+# -------------------------------
+# Helpers
+# -------------------------------
+def build_resume_json(resume_text, skill_output):
+    """
+    Structured resume (SG_parser.json fields) for scoring, from one
+    segmentation pass; skills are the ontology-normalized ones
+    """
+    resume_json = resume_parser.parse_sections(resume_text)
+    resume_json["skills"] = skill_output["normalized_skills"]
+    return resume_json
+
+def score_resume(resume_text, resume_skills, jd_skills, semantic_score, stages, skill_ids=False):
+    """
+    Run ATS scoring and shape one analyze result.
+    With skill_ids=True skills are returned as ontology vocabulary IDs.
+    """
     final_score, breakdown = scorer.calculate_score(
-        resume_json=resume_json,
+        resume_json=build_resume_json(resume_text, resume_skills),
         skill_output=resume_skills,
         jd_skills=jd_skills,
         semantic_score=semantic_score,
         resume_text=resume_text
     )
 
+    extracted_skills = resume_skills["normalized_skills"]
+    if skill_ids:
+        extracted_skills = [skill_extractor.skill_ids[s] for s in extracted_skills]
+
+    unavailable = [k for k, v in breakdown.items() if v is None]
+
     return {
         "ats_score": final_score,
         "semantic_match": breakdown["semantic_match"],
@@ -78,5 +190,277 @@ def analyze_resume(data: AnalyzeRequest):
         "section_completeness": breakdown["section_completeness"],
         "category_balance": breakdown["category_balance"],
         "formatting": breakdown["formatting"],
-        "extracted_skills": resume_skills["normalized_skills"]
+        "extracted_skills": extracted_skills,
+        "stages": stages + ["ats_scoring"],
+        "unavailable": unavailable,
+        "degraded": bool(unavailable)
+    }
+
+# -------------------------------
+# Content Negotiation
+# -------------------------------
+def negotiate(accept):
+    try:
+        return response_encoding.choose_encoding(accept)
+    except response_encoding.NotAcceptable as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+def respond(payload, media_type):
+    """
+    JSON goes through the declared response model, other encodings are
+    serialized directly and skip pydantic
+    """
+    if media_type == response_encoding.JSON:
+        return payload
+    return Response(
+        content=response_encoding.encode(payload, media_type),
+        media_type=media_type
+    )
+
+# -------------------------------
+# JD Resolution
+# -------------------------------
+def resolve_job(job_id=None, job_description=None, embed=True):
+    """
+    Return (jd_skills, jd_embedding) either from the job store
+    or by running the JD-side pipeline on inline text.
+    With embed=False an inline JD is not embedded (jd_embedding is None).
+    """
+    if job_id:
+        job = job_store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown or expired job_id: {job_id}")
+        return job["normalized_skills"], job["embedding"]
+
+    if not job_description:
+        raise HTTPException(status_code=422, detail="Provide either job_id or job_description")
+
+    jd_skills = skill_extractor.extract(job_description)["normalized_skills"]
+    return jd_skills, matcher.embed(job_description) if embed else None
+
+# -------------------------------
+# Semantic Stage
+# -------------------------------
+def check_deadline(deadline):
+    """Fail the request with 504 once its budget is spent"""
+    if deadline.expired():
+        count("analyze_timeouts")
+        raise HTTPException(status_code=504, detail="Deadline exceeded")
+
+def run_semantic_stage(resume_text, jd_embedding, jd_text, deadline):
+    """
+    Run the embedding stage in a worker thread under the request deadline.
+    Returns the semantic score, or None when it does not fit the budget or,
+    for requests with a deadline, when every embedding worker is busy.
+    """
+    if not deadline.allows(latency.estimate("semantic_match")):
+        latency.decay("semantic_match")
+        return None
+    if not embedding_slots.acquire(blocking=deadline.remaining() is None):
+        count("semantic_saturated")
+        return None
+
+    def stage():
+        try:
+            start = time.monotonic()
+            jd_vector = matcher.embed(jd_text) if jd_embedding is None else jd_embedding
+            score = matcher.match_embeddings(matcher.embed(resume_text), jd_vector)
+            # Recorded even when the request already gave up on it
+            latency.record("semantic_match", time.monotonic() - start)
+            return score
+        finally:
+            embedding_slots.release()
+
+    try:
+        future = embedding_pool.submit(stage)
+    except BaseException:
+        embedding_slots.release()
+        raise
+    try:
+        return future.result(timeout=deadline.remaining())
+    except FutureTimeout:
+        return None
+
+# -------------------------------
+# Job Endpoints
+# -------------------------------
+@app.post("/jobs", response_model=JobResponse)
+def register_job(data: JobRequest):
+    jd_output = skill_extractor.extract(data.job_description)
+    return job_store.add(
+        job_description=data.job_description,
+        skill_output=jd_output,
+        embedding=matcher.embed(data.job_description),
+        title=data.title,
+        ttl_days=data.ttl_days
+    )
+
+@app.get("/jobs", response_model=list[JobResponse])
+def list_jobs():
+    return job_store.list()
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job_id: {job_id}")
+    return job
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: str):
+    if not job_store.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown job_id: {job_id}")
+    return {"deleted": job_id}
+
+# -------------------------------
+# API Endpoint
+# -------------------------------
+@app.post("/analyze", response_model=AnalyzeResponse)
+def analyze_resume(
+    data: AnalyzeRequest,
+    skill_ids: bool = False,
+    x_deadline_ms: Optional[float] = Header(None),
+    accept: Optional[str] = Header(None)
+):
+
+    deadline = Deadline(x_deadline_ms if x_deadline_ms is not None else DEFAULT_DEADLINE_MS)
+    media_type = negotiate(accept)
+    resume_text = data.resume_text
+    jd_skills, jd_embedding = resolve_job(data.job_id, data.job_description, embed=False)
+    stages = []
+
+    # Skill extraction
+    check_deadline(deadline)
+    resume_skills = skill_extractor.extract(resume_text)
+    stages.append("skill_extraction")
+
+    # Semantic matching (skipped when it would exceed the deadline)
+    semantic_score = run_semantic_stage(resume_text, jd_embedding, data.job_description, deadline)
+    if semantic_score is not None:
+        stages.append("semantic_match")
+
+    result = score_resume(resume_text, resume_skills, jd_skills, semantic_score, stages, skill_ids)
+
+    if data.candidate_id:
+        score_store.add([data.candidate_id], data.job_id, [result], data.job_description)
+
+    count("analyze_requests")
+    if result["degraded"]:
+        count("analyze_degraded")
+
+    result["elapsed_ms"] = deadline.elapsed_ms()
+    return respond(result, media_type)
+
+@app.post("/analyze/batch", response_model=BatchAnalyzeResponse)
+def analyze_batch(
+    data: BatchAnalyzeRequest,
+    skill_ids: bool = False,
+    accept: Optional[str] = Header(None)
+):
+
+    deadline = Deadline()
+    media_type = negotiate(accept)
+    if data.candidate_ids and len(data.candidate_ids) != len(data.resumes):
+        raise HTTPException(status_code=422, detail="candidate_ids must match resumes one-to-one")
+    jd_skills, jd_embedding = resolve_job(data.job_id, data.job_description)
+
+    # One batched encoder call for all resumes
+    resume_embeddings = matcher.embed_batch(data.resumes)
+
+    results = []
+    for resume_text, resume_embedding in zip(data.resumes, resume_embeddings):
+        resume_skills = skill_extractor.extract(resume_text)
+        semantic_score = matcher.match_embeddings(resume_embedding, jd_embedding)
+        results.append(score_resume(
+            resume_text, resume_skills, jd_skills, semantic_score,
+            ["skill_extraction", "semantic_match"], skill_ids
+        ))
+
+    if data.candidate_ids:
+        score_store.add(data.candidate_ids, data.job_id, results, data.job_description)
+
+    count("analyze_batch_requests")
+    count("analyze_batch_resumes", len(results))
+
+    return respond({"results": results, "elapsed_ms": deadline.elapsed_ms()}, media_type)
+
+@app.get("/skills/vocabulary")
+def skill_vocabulary():
+    """Skill names indexed by the integer IDs returned with ?skill_ids=true"""
+    return {"vocabulary": skill_extractor.vocabulary}
+
+@app.get("/metrics")
+def get_metrics():
+    with metrics_lock:
+        counters = dict(metrics)
+    return {"counters": counters, "stage_latency_ms": latency.snapshot()}
+
+# -------------------------------
+# Candidate Search
+# -------------------------------
+@app.post("/resumes")
+def add_resumes(data: AddResumesRequest):
+    texts = [item.resume_text for item in data.resumes]
+    skill_outputs = [skill_extractor.extract(text) for text in texts]
+
+    resume_corpus.add(
+        resume_ids=[item.resume_id for item in data.resumes],
+        resume_texts=texts,
+        skill_vectors=[skill_extractor.skill_vector(o["normalized_skills"]) for o in skill_outputs],
+        skill_outputs=skill_outputs,
+        embeddings=matcher.embed_batch(texts)
+    )
+    return {"added": len(texts), "corpus_size": len(resume_corpus)}
+
+@app.post("/search", response_model=SearchResponse)
+def search_candidates(data: SearchRequest):
+    jd_skills, jd_embedding = resolve_job(data.job_id, data.job_description)
+
+    # Skill prefilter + semantic ranking over the whole corpus
+    rows, similarities, considered = resume_corpus.shortlist(
+        jd_skill_vector=skill_extractor.skill_vector(jd_skills),
+        jd_embedding=jd_embedding,
+        top_n=data.top_n * SHORTLIST_FACTOR,
+        min_skill_match=data.min_skill_match
+    )
+
+    # Full ATS scoring for the shortlist only
+    results = []
+    for record, similarity in zip(resume_corpus.records(rows), similarities):
+        final_score, breakdown = scorer.calculate_score(
+            resume_json=build_resume_json(record["resume_text"], record["skill_output"]),
+            skill_output=record["skill_output"],
+            jd_skills=jd_skills,
+            semantic_score=round(float(similarity), 4),
+            resume_text=record["resume_text"]
+        )
+        results.append({"resume_id": record["resume_id"], "ats_score": final_score, **breakdown})
+
+    score_store.add([r["resume_id"] for r in results], data.job_id, results, data.job_description)
+
+    results.sort(key=lambda r: r["ats_score"], reverse=True)
+    return {"candidates_considered": considered, "results": results[:data.top_n]}
+
+# -------------------------------
+# Re-weighting Stored Scores
+# -------------------------------
+@app.post("/scores/reweight", response_model=ReweightResponse)
+def reweight_scores(data: ReweightRequest):
+    deadline = Deadline()
+    try:
+        weights = ATSScorer({**scorer.weights, **data.weights}).weights
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    rows, final_scores, ranking = score_store.reweight(weights, data.job_id, data.top_k)
+    candidate_ids, job_ids = score_store.describe(rows[ranking])
+
+    return {
+        "weights": weights,
+        "candidates": len(rows),
+        "elapsed_ms": deadline.elapsed_ms(),
+        "results": [
+            {"rank": rank, "candidate_id": c, "job_id": j, "ats_score": float(final_scores[i])}
+            for rank, (i, c, j) in enumerate(zip(ranking, candidate_ids, job_ids), 1)
+        ]
     }
@@ -23,13 +23,31 @@ class ResumeJDMatcher:
 
         return " ".join(parts)
 
-    def match(self, resume_text, job_description):
-        resume_embedding = self.embedder.encode(resume_text)
-        jd_embedding = self.embedder.encode(job_description)
+    def embed(self, text):
+        """
+        Encode a single text into a 1-D numpy vector
+        """
+        return self.embedder.encode(text).cpu().numpy()[0]
+
+    def embed_batch(self, texts, batch_size=32):
+        """
+        Encode many texts at once into an (n, dim) numpy array
+        """
+        return self.embedder.encode(texts, batch_size=batch_size).cpu().numpy()
 
+    def match_embeddings(self, resume_embedding, jd_embedding):
+        """
+        Score two precomputed embeddings (e.g. a stored JD vector)
+        """
         score = cosine_similarity(
-            resume_embedding.cpu().numpy(),
-            jd_embedding.cpu().numpy()
+            np.asarray(resume_embedding).reshape(1, -1),
+            np.asarray(jd_embedding).reshape(1, -1)
         )[0][0]
 
         return round(float(score), 4)
+
+    def match(self, resume_text, job_description):
+        return self.match_embeddings(
+            self.embed(resume_text),
+            self.embed(job_description)
+        )
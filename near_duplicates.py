@@ -0,0 +1,317 @@
+# backend/near_duplicates.py
+"""
+Corpus-level near-duplicate detection with MinHash and banded LSH.
+
+Every resume is reduced to the set of its word shingles (k consecutive
+tokens) and summarized by a MinHash signature: for each of num_perm hash
+functions, the minimum hash over its shingles. Two signatures agree in a
+position with probability equal to the Jaccard similarity of the shingle
+sets.
+
+The signature is cut into bands of rows; resumes sharing any whole band
+land in the same bucket and become candidates, which are then verified
+by signature similarity. With 16 bands of 8 rows, pairs at Jaccard 0.8
+are found with probability ~0.98 and pairs at 0.4 only ~0.01.
+
+Buckets live in one sorted uint64 array of band keys (binary search per
+query) plus a small dict of recent inserts, merged into the sorted array
+in batches, so inserts are incremental and queries stay sub-linear.
+
+Index directory:
+    meta.json           parameters and the document count
+    ids.json            document id of every row
+    signatures.npy      (rows, num_perm) uint32 MinHash signatures
+    keys.npy            sorted uint64 band keys
+    rows.npy            row of each band key
+
+Usage:
+    python near_duplicates.py build --input resumes.csv --column Resume --out datasets/dedup_index
+    python near_duplicates.py query --index datasets/dedup_index resume.txt
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from ngram_lm import HASH_MULTIPLIER, encode_documents, ending_keys, iter_texts
+
+# Bound on the (hash functions, shingles) temporaries of one signature pass
+MAX_BLOCK_ELEMENTS = 2**22
+
+
+class MinHashLSH:
+    def __init__(self, num_perm=128, bands=16, shingle_size=5, threshold=0.8,
+                 seed=1, merge_size=65536):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.seed = seed
+        self.merge_size = merge_size
+
+        # Hash functions h(x) = high 32 bits of (a * x + b) mod 2**64, a odd
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self._band_mix = (
+            rng.integers(0, 2**63, (bands, self.rows_per_band), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        )
+
+        self.ids = []
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._keys = np.zeros(0, dtype=np.uint64)
+        self._rows = np.zeros(0, dtype=np.int64)
+        self._pending = {}
+        self._pending_keys = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    # -------------------------------
+    # Signatures
+    # -------------------------------
+    def signatures(self, texts):
+        """
+        MinHash signatures of a batch: (n, num_perm) uint32, plus a bool mask
+        of the texts that have at least one shingle (the others cannot be
+        compared and are never indexed or matched)
+        """
+        n = len(texts)
+        k = self.shingle_size
+        signatures = np.full((n, self.num_perm), 2**32 - 1, dtype=np.uint32)
+        if n == 0:
+            return signatures, np.zeros(0, dtype=bool)
+
+        hashes, doc_ids = encode_documents(texts, "word", 1)
+        if len(hashes) < k:
+            return signatures, np.zeros(n, dtype=bool)
+        keys = ending_keys(hashes, k)[k - 1:]
+        key_docs = doc_ids[k - 1:]
+        within = key_docs == doc_ids[:len(doc_ids) - k + 1]
+        keys, key_docs = keys[within], key_docs[within]
+
+        # Shingles are grouped by document, in document order
+        has_shingles = np.bincount(key_docs, minlength=n) > 0
+        starts = np.flatnonzero(np.append(True, key_docs[1:] != key_docs[:-1]))
+        docs = key_docs[starts]
+        block = max(1, min(self.num_perm, MAX_BLOCK_ELEMENTS // len(keys)))
+        for lo in range(0, self.num_perm, block):
+            hi = lo + block
+            values = (keys[None, :] * self._a[lo:hi, None] + self._b[lo:hi, None]) >> np.uint64(32)
+            signatures[docs, lo:hi] = np.minimum.reduceat(values, starts, axis=1).T
+        return signatures, has_shingles
+
+    def signature(self, text):
+        signatures, has_shingles = self.signatures([text])
+        return signatures[0] if has_shingles[0] else None
+
+    def band_keys(self, signatures):
+        """One uint64 bucket key per band: (n, bands)"""
+        bands = signatures.astype(np.uint64).reshape(-1, self.bands, self.rows_per_band)
+        keys = (bands * self._band_mix).sum(axis=2)
+        return keys ^ (np.arange(self.bands, dtype=np.uint64) * HASH_MULTIPLIER)
+
+    # -------------------------------
+    # Index
+    # -------------------------------
+    def insert_many(self, doc_ids, texts):
+        """Add documents; returns how many had shingles and were indexed"""
+        signatures, has_shingles = self.signatures(list(texts))
+        doc_ids = [doc_id for doc_id, ok in zip(doc_ids, has_shingles) if ok]
+        return self.insert_signatures(doc_ids, signatures[has_shingles])
+
+    def insert_signatures(self, doc_ids, signatures):
+        if not len(signatures):
+            return 0
+
+        # Signature rows grow by doubling, so single inserts stay amortized O(1)
+        first = len(self.ids)
+        if first + len(signatures) > len(self._signatures):
+            grown = np.empty((max(2 * len(self._signatures), first + len(signatures), 1024), self.num_perm),
+                             dtype=np.uint32)
+            grown[:first] = self._signatures[:first]
+            self._signatures = grown
+        self._signatures[first:first + len(signatures)] = signatures
+        self.ids.extend(doc_ids)
+
+        for row, keys in enumerate(self.band_keys(signatures).tolist(), start=first):
+            for key in keys:
+                self._pending.setdefault(key, []).append(row)
+        self._pending_keys += len(signatures) * self.bands
+        if self._pending_keys >= self.merge_size:
+            self._merge()
+        return len(signatures)
+
+    def insert(self, doc_id, text):
+        return self.insert_many([doc_id], [text]) == 1
+
+    def _merge(self):
+        """Move the pending buckets into the sorted key array (one linear pass)"""
+        if not self._pending:
+            return
+        keys = np.fromiter(
+            (key for key, rows in self._pending.items() for _ in rows), dtype=np.uint64, count=self._pending_keys
+        )
+        rows = np.fromiter(
+            (row for rows in self._pending.values() for row in rows), dtype=np.int64, count=self._pending_keys
+        )
+        order = np.argsort(keys, kind="stable")
+        keys, rows = keys[order], rows[order]
+
+        positions = np.searchsorted(self._keys, keys, side="right")
+        self._keys = np.insert(self._keys, positions, keys)
+        self._rows = np.insert(self._rows, positions, rows)
+        self._pending = {}
+        self._pending_keys = 0
+
+    def _candidates(self, band_keys):
+        lo = np.searchsorted(self._keys, band_keys, side="left")
+        hi = np.searchsorted(self._keys, band_keys, side="right")
+        rows = [self._rows[l:h] for l, h in zip(lo, hi) if h > l]
+        rows.extend(np.asarray(self._pending[key]) for key in band_keys.tolist() if key in self._pending)
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(rows))
+
+    def query_signature(self, signature, threshold=None, limit=10, exclude=None):
+        threshold = self.threshold if threshold is None else threshold
+        candidates = self._candidates(self.band_keys(signature[None, :])[0])
+        if exclude is not None:
+            candidates = candidates[[self.ids[row] != exclude for row in candidates.tolist()]]
+        if not len(candidates):
+            return []
+
+        similarity = (self._signatures[candidates] == signature).mean(axis=1)
+        keep = similarity >= threshold
+        candidates, similarity = candidates[keep], similarity[keep]
+        order = np.argsort(-similarity, kind="stable")[:limit]
+        return [
+            {"doc_id": self.ids[row], "similarity": round(float(similarity[i]), 3)}
+            for i, row in zip(order.tolist(), candidates[order].tolist())
+        ]
+
+    def query(self, text, threshold=None, limit=10, exclude=None):
+        """
+        Indexed documents whose estimated Jaccard similarity to `text` is at
+        least `threshold`, most similar first:
+        [{'doc_id': ..., 'similarity': 0.0-1.0}, ...]
+        exclude: doc_id to leave out (the text itself, if indexed)
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        return self.query_signature(signature, threshold, limit, exclude)
+
+    def query_many(self, texts, threshold=None, limit=10):
+        signatures, has_shingles = self.signatures(list(texts))
+        return [
+            self.query_signature(signature, threshold, limit) if ok else []
+            for signature, ok in zip(signatures, has_shingles)
+        ]
+
+    # -------------------------------
+    # Persistence
+    # -------------------------------
+    def save(self, index_dir):
+        self._merge()
+        os.makedirs(index_dir, exist_ok=True)
+        meta = {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "threshold": self.threshold,
+            "seed": self.seed,
+            "documents": len(self.ids)
+        }
+        with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        with open(os.path.join(index_dir, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump(self.ids, f)
+        np.save(os.path.join(index_dir, "signatures.npy"), self._signatures[:len(self.ids)])
+        np.save(os.path.join(index_dir, "keys.npy"), self._keys)
+        np.save(os.path.join(index_dir, "rows.npy"), self._rows)
+        return meta
+
+    @classmethod
+    def load(cls, index_dir, mmap=False):
+        """
+        Load a saved index. mmap=True memory-maps the arrays (shared through
+        the page cache); the first insert after that copies them into memory.
+        """
+        with open(os.path.join(index_dir, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(num_perm=meta["num_perm"], bands=meta["bands"], shingle_size=meta["shingle_size"],
+                    threshold=meta["threshold"], seed=meta["seed"])
+        with open(os.path.join(index_dir, "ids.json"), "r", encoding="utf-8") as f:
+            index.ids = json.load(f)
+
+        mmap_mode = "r" if mmap else None
+        index._signatures = np.load(os.path.join(index_dir, "signatures.npy"), mmap_mode=mmap_mode)
+        index._keys = np.load(os.path.join(index_dir, "keys.npy"), mmap_mode=mmap_mode)
+        index._rows = np.load(os.path.join(index_dir, "rows.npy"), mmap_mode=mmap_mode)
+        return index
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def build(args):
+    start = time.time()
+    if os.path.exists(os.path.join(args.out, "meta.json")):
+        index = MinHashLSH.load(args.out)
+    else:
+        index = MinHashLSH(num_perm=args.num_perm, bands=args.bands,
+                           shingle_size=args.shingle_size, threshold=args.threshold)
+
+    for texts in iter_texts(args.input, args.column, args.chunk_size):
+        first = len(index)
+        index.insert_many([f"{args.prefix}{first + i}" for i in range(len(texts))], texts)
+        print(f"  {len(index):,} documents indexed", end="\r")
+    print()
+
+    index.save(args.out)
+    print(f"✓ Saved {len(index):,} documents to {args.out} in {time.time() - start:.1f}s")
+
+
+def query(args):
+    index = MinHashLSH.load(args.index, mmap=True)
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            matches = index.query(f.read(), threshold=args.threshold)
+        print(f"{path}: {len(matches)} near-duplicate(s)")
+        for match in matches:
+            print(f"  {match['doc_id']}  similarity {match['similarity']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="index a resume corpus (appends to an existing index)")
+    p.add_argument("--input", required=True, help="CSV file (see --column) or a .txt file")
+    p.add_argument("--column", default="Resume", help="CSV column holding the resume text")
+    p.add_argument("--out", default="datasets/dedup_index")
+    p.add_argument("--prefix", default="", help="prefix of the generated document ids")
+    p.add_argument("--num-perm", type=int, default=128)
+    p.add_argument("--bands", type=int, default=16)
+    p.add_argument("--shingle-size", type=int, default=5)
+    p.add_argument("--threshold", type=float, default=0.8)
+    p.add_argument("--chunk-size", type=int, default=10000)
+    p.set_defaults(func=build)
+
+    p = sub.add_parser("query", help="near-duplicates of text files")
+    p.add_argument("--index", default="datasets/dedup_index")
+    p.add_argument("--threshold", type=float, default=None)
+    p.add_argument("files", nargs="+")
+    p.set_defaults(func=query)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+# backend/ngram_lm.py
+"""
+Compact hashed n-gram language model trained on a local resume corpus.
+
+Every k-gram (k = 1..order) is stored as a 64-bit hash of its tokens in a
+sorted array next to its count, so a lookup is a binary search and the
+arrays can be memory-mapped and shared (read-only, through the page
+cache) by every worker process.
+
+Model directory:
+    meta.json           order, unit, interpolation weights, token totals
+                        and the reference perplexity of held-out resumes
+    keys_<k>.npy        sorted uint64 hash of every k-gram
+    counts_<k>.npy      uint32 count of each k-gram
+
+Probabilities interpolate the maximum-likelihood estimates of every
+order with an add-one unigram; orders whose context was never seen
+hand their weight to the lower orders.
+
+Usage:
+    python ngram_lm.py train --input resumes.csv --column Resume --out datasets/ngram_lm
+    python ngram_lm.py score --model datasets/ngram_lm resume.txt
+"""
+
+import argparse
+import json
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+
+TOKEN = re.compile(r"\w+|[^\w\s]")
+WHITESPACE = re.compile(r"\s+")
+BOS = "<s>"
+EOS = "</s>"
+# Multiplier of the rolling n-gram hash (odd, so it is invertible mod 2**64)
+HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def tokenize(text, unit="word"):
+    """Lowercased word/punctuation tokens, or characters (whitespace collapsed)"""
+    text = text.lower()
+    if unit == "char":
+        return list(WHITESPACE.sub(" ", text).strip())
+    return TOKEN.findall(text)
+
+
+def encode_documents(texts, unit, order):
+    """
+    Token hashes of all documents back to back, each document padded with
+    order - 1 BOS tokens and one EOS. Returns (hashes, doc_ids).
+    """
+    tokens, lengths = [], []
+    padding = [BOS] * (order - 1)
+    for text in texts:
+        doc_tokens = tokenize(text, unit)
+        tokens.extend(padding)
+        tokens.extend(doc_tokens)
+        tokens.append(EOS)
+        lengths.append(len(doc_tokens) + order)
+
+    hashes = pd.util.hash_array(np.array(tokens, dtype=object))
+    doc_ids = np.repeat(np.arange(len(lengths)), lengths)
+    return hashes, doc_ids
+
+
+def ending_keys(hashes, k):
+    """
+    Hash of the k-gram ending at every position (entries before position
+    k - 1 are meaningless)
+    """
+    keys = hashes.copy()
+    for j in range(1, k):
+        keys[j:] = keys[j:] ^ (hashes[:-j] * (HASH_MULTIPLIER + np.uint64(2 * j)))
+    return keys
+
+
+def ngram_keys(hashes, doc_ids, k):
+    """Hashes of every k-gram that lies within one document"""
+    if len(hashes) < k:
+        return np.zeros(0, dtype=np.uint64)
+    keys = ending_keys(hashes, k)[k - 1:]
+    return keys[doc_ids[k - 1:] == doc_ids[:len(doc_ids) - k + 1]]
+
+
+def merge_counts(keys, counts):
+    """
+    Sum counts of equal keys; returns (sorted unique keys, uint32 counts
+    saturating at 2**32 - 1)
+    """
+    order = np.argsort(keys, kind="stable")
+    keys, counts = keys[order], counts[order]
+    if len(keys) == 0:
+        return keys, counts.astype(np.uint32)
+    starts = np.flatnonzero(np.append(True, keys[1:] != keys[:-1]))
+    totals = np.add.reduceat(counts.astype(np.uint64), starts)
+    return keys[starts], np.minimum(totals, 2**32 - 1).astype(np.uint32)
+
+
+# -------------------------------
+# Training
+# -------------------------------
+class NGramCounter:
+    """
+    Accumulates k-gram counts chunk by chunk. Chunk counts are buffered and
+    merged once the buffer outgrows the table; when a table exceeds
+    max_entries, k-grams seen once so far are dropped to bound memory.
+    """
+
+    def __init__(self, order=3, unit="word", max_entries=50_000_000):
+        self.order = order
+        self.unit = unit
+        self.max_entries = max_entries
+        self.tables = {k: (np.zeros(0, np.uint64), np.zeros(0, np.uint32)) for k in range(1, order + 1)}
+        self.buffers = {k: [] for k in range(1, order + 1)}
+        self.documents = 0
+        self.tokens = 0
+        self.pruned = 0
+
+    def add(self, texts):
+        hashes, doc_ids = encode_documents(texts, self.unit, self.order)
+        self.documents += len(texts)
+        # BOS padding is context only, never a predicted token
+        self.tokens += len(hashes) - len(texts) * (self.order - 1)
+
+        for k in range(1, self.order + 1):
+            keys, counts = np.unique(ngram_keys(hashes, doc_ids, k), return_counts=True)
+            self.buffers[k].append((keys, counts.astype(np.uint32)))
+            if sum(len(b[0]) for b in self.buffers[k]) > max(len(self.tables[k][0]), 1_000_000):
+                self._merge(k)
+
+    def _merge(self, k):
+        parts = [self.tables[k]] + self.buffers[k]
+        keys, counts = merge_counts(
+            np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+        )
+        self.buffers[k] = []
+        if len(keys) > self.max_entries:
+            keep = counts > 1
+            self.pruned += int(len(keys) - keep.sum())
+            keys, counts = keys[keep], counts[keep]
+        self.tables[k] = (keys, counts)
+
+    def save(self, out_dir, min_count=1, interpolation=None, holdout_texts=()):
+        """
+        Write the model. k-grams (k > 1) seen fewer than min_count times are
+        dropped. The reference perplexity is the median over holdout_texts.
+        """
+        os.makedirs(out_dir, exist_ok=True)
+        entries = {}
+        for k in range(1, self.order + 1):
+            self._merge(k)
+            keys, counts = self.tables[k]
+            if k > 1 and min_count > 1:
+                keep = counts >= min_count
+                keys, counts = keys[keep], counts[keep]
+            np.save(os.path.join(out_dir, f"keys_{k}.npy"), keys)
+            np.save(os.path.join(out_dir, f"counts_{k}.npy"), counts)
+            entries[k] = int(len(keys))
+
+        if interpolation is None:
+            interpolation = [2.0 ** k for k in range(self.order)]
+        meta = {
+            "order": self.order,
+            "unit": self.unit,
+            "interpolation": [w / sum(interpolation) for w in interpolation],
+            "documents": self.documents,
+            "tokens": self.tokens,
+            "vocabulary": entries[1],
+            "entries": entries,
+            "min_count": min_count,
+            "pruned_singletons": self.pruned,
+            "reference_perplexity": None,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if holdout_texts:
+            model = NGramLM(out_dir)
+            meta["reference_perplexity"] = float(np.median(model.perplexity_many(holdout_texts)))
+            meta["holdout_documents"] = len(holdout_texts)
+            with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+        return meta
+
+
+# -------------------------------
+# Scoring
+# -------------------------------
+class NGramLM:
+    def __init__(self, model_dir):
+        self.model_dir = model_dir
+        with open(os.path.join(model_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.order = self.meta["order"]
+        self.unit = self.meta["unit"]
+        self.interpolation = np.array(self.meta["interpolation"])
+        self.reference_perplexity = self.meta.get("reference_perplexity")
+
+        self.keys, self.counts = {}, {}
+        for k in range(1, self.order + 1):
+            self.keys[k] = np.load(os.path.join(model_dir, f"keys_{k}.npy"), mmap_mode="r")
+            self.counts[k] = np.load(os.path.join(model_dir, f"counts_{k}.npy"), mmap_mode="r")
+
+        # Add-one unigram denominator (+1 for unseen tokens)
+        self.unigram_total = self.meta["tokens"] + self.meta["vocabulary"] + 1
+
+    def lookup(self, k, keys):
+        """Counts of the given k-gram hashes (0 when unseen)"""
+        table = self.keys[k]
+        if len(table) == 0:
+            return np.zeros(len(keys), dtype=np.float64)
+        position = np.minimum(np.searchsorted(table, keys), len(table) - 1)
+        found = table[position] == keys
+        return np.where(found, self.counts[k][position], 0).astype(np.float64)
+
+    def log2_probabilities(self, hashes, doc_ids):
+        """log2 P(token | history) of every predicted token (BOS excluded)"""
+        starts = np.flatnonzero(np.append(True, doc_ids[1:] != doc_ids[:-1]))
+        position_in_doc = np.arange(len(hashes)) - np.repeat(starts, np.diff(np.append(starts, len(hashes))))
+        predicted = np.flatnonzero(position_in_doc >= self.order - 1)
+
+        probability = np.zeros(len(predicted))
+        weight = np.zeros(len(predicted))
+        context_counts = None
+        for k in range(1, self.order + 1):
+            counts = self.lookup(k, ending_keys(hashes, k)[predicted])
+            if k == 1:
+                numerator, denominator = counts + 1, np.full(len(predicted), float(self.unigram_total))
+            else:
+                numerator, denominator = counts, context_counts
+            available = denominator > 0
+            w = self.interpolation[k - 1] * available
+            probability += w * np.divide(numerator, denominator, out=np.zeros(len(predicted)), where=available)
+            weight += w
+            if k < self.order:
+                # Context of the next order: the k-gram ending one token earlier
+                context_counts = self.lookup(k, ending_keys(hashes, k)[predicted - 1])
+
+        return np.log2(probability / weight), doc_ids[predicted]
+
+    def perplexity_many(self, texts):
+        """Perplexity of every text, scored in one vectorized pass"""
+        texts = list(texts)
+        if not texts:
+            return np.zeros(0)
+        hashes, doc_ids = encode_documents(texts, self.unit, self.order)
+        log2_p, docs = self.log2_probabilities(hashes, doc_ids)
+        total = np.bincount(docs, weights=log2_p, minlength=len(texts))
+        return 2 ** (-total / np.bincount(docs, minlength=len(texts)))
+
+    def perplexity(self, text):
+        return float(self.perplexity_many([text])[0])
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+def iter_texts(path, column, chunk_size):
+    """Text chunks from a CSV column, or one chunk per .txt file"""
+    if path.endswith(".csv"):
+        for chunk in pd.read_csv(path, usecols=[column], chunksize=chunk_size):
+            yield chunk[column].fillna("").astype(str).tolist()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield [f.read()]
+
+
+def train(args):
+    start = time.time()
+    counter = NGramCounter(order=args.order, unit=args.unit, max_entries=args.max_entries)
+    holdout = []
+    for texts in iter_texts(args.input, args.column, args.chunk_size):
+        # Every holdout-th document is kept out of training for the reference perplexity
+        offset = counter.documents + len(holdout)
+        is_holdout = [(offset + i) % args.holdout == 0 for i in range(len(texts))]
+        holdout.extend(t for t, h in zip(texts, is_holdout) if h)
+        counter.add([t for t, h in zip(texts, is_holdout) if not h])
+        print(f"  {counter.documents:,} documents, {counter.tokens:,} tokens", end="\r")
+    print()
+
+    meta = counter.save(args.out, min_count=args.min_count, holdout_texts=holdout)
+    print(f"Entries per order: {meta['entries']}")
+    print(f"Reference perplexity (median of {len(holdout):,} held-out documents): {meta['reference_perplexity']}")
+    print(f"✓ Saved to {args.out} in {time.time() - start:.1f}s")
+
+
+def score(args):
+    model = NGramLM(args.model)
+    texts = []
+    for path in args.files:
+        with open(path, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    for path, perplexity in zip(args.files, model.perplexity_many(texts)):
+        print(f"{path}: perplexity {perplexity:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("train", help="count n-grams of a resume corpus")
+    p.add_argument("--input", required=True, help="CSV file (see --column) or a .txt file")
+    p.add_argument("--column", default="Resume", help="CSV column holding the resume text")
+    p.add_argument("--out", default="datasets/ngram_lm")
+    p.add_argument("--order", type=int, default=3)
+    p.add_argument("--unit", choices=["word", "char"], default="word")
+    p.add_argument("--min-count", type=int, default=1, help="drop k-grams (k > 1) seen fewer times")
+    p.add_argument("--max-entries", type=int, default=50_000_000, help="per order, before pruning singletons")
+    p.add_argument("--holdout", type=int, default=50, help="hold out every n-th document")
+    p.add_argument("--chunk-size", type=int, default=10000)
+    p.set_defaults(func=train)
+
+    p = sub.add_parser("score", help="perplexity of text files")
+    p.add_argument("--model", default="datasets/ngram_lm")
+    p.add_argument("files", nargs="+")
+    p.set_defaults(func=score)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# backend/parsed_store.py
+"""
+Columnar store of parsed resumes.
+
+One ColumnStore table, one set of files per field, so a consumer reads
+only the columns it needs: categories or skills for a million resumes are
+memory-mapped arrays rather than a JSON document to parse in full.
+
+    resume_id           "str"   (stored as text, so CSV rows and files share one table)
+    category            "dict"  (filters compare int32 codes, see rows())
+    skills              "list"  (dictionary-encoded elements)
+    text                "str"   (full original resumes, one contiguous UTF-8 blob)
+    education,
+    experience,
+    projects,
+    certifications      "spans" (byte offsets into the row's text, no copied strings)
+
+Rows are written from ResumeParser.parse_spans() output; records() turns
+them back into SG_parser.json-shaped dicts, with the full text as
+"full_text".
+
+A store maintained by ResumeParser.update_store also has a row map,
+row_map.npy: row i of the store (resume_id i, the CSV row) is stored row
+row_map[i]. Rows replaced by an update stay in the column files, unmapped,
+until the store is compacted.
+"""
+
+import os
+import numpy as np
+from column_store import ColumnStore
+
+SPAN_FIELDS = ["education", "experience", "projects", "certifications"]
+# Span fields read back as one whitespace-normalized string; the others as item lists
+JOINED_FIELDS = {"education", "experience"}
+
+SCHEMA = {
+    "resume_id": "str",
+    "category": "dict",
+    "skills": "list",
+    "text": "str",
+    **{name: "spans" for name in SPAN_FIELDS}
+}
+
+RECORD_FIELDS = ["resume_id", "category", "skills", *SPAN_FIELDS, "full_text"]
+
+
+def byte_spans(text, spans):
+    """
+    Convert character (start, end) spans of text into UTF-8 byte offsets.
+    spans maps field -> list of spans; ASCII text needs no conversion.
+    """
+    if text.isascii():
+        return {name: [(start, end) for start, end in field] for name, field in spans.items()}
+
+    # One walk over the sorted distinct positions, encoding each gap once
+    positions = sorted({p for field in spans.values() for span in field for p in span})
+    offsets = {}
+    char_position = byte_position = 0
+    for position in positions:
+        byte_position += len(text[char_position:position].encode("utf-8"))
+        char_position = position
+        offsets[position] = byte_position
+    return {name: [(offsets[start], offsets[end]) for start, end in field] for name, field in spans.items()}
+
+
+def save_array_atomic(path, array):
+    """np.save through a temporary file, so readers never see a partial array"""
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, array)
+    os.replace(path + ".tmp", path)
+
+
+class ParsedResumeStore:
+    def __init__(self, store_dir="datasets/parsed_store"):
+        self.store_dir = store_dir
+        self.table = ColumnStore(store_dir, schema=SCHEMA)
+        map_path = os.path.join(store_dir, "row_map.npy")
+        self.row_map = np.load(map_path) if os.path.exists(map_path) else None
+
+    def __len__(self):
+        return len(self.table) if self.row_map is None else len(self.row_map)
+
+    # -------------------------------
+    # Write
+    # -------------------------------
+    def add(self, rows):
+        """Append rows (dicts as returned by ResumeParser.parse_spans)"""
+        first = len(self.table)
+        count = self.append_stored(rows)
+        if self.row_map is not None:
+            self.set_row_map(np.append(self.row_map, np.arange(first, first + count)))
+        return count
+
+    def append_stored(self, rows):
+        """Append rows to the column files only, without mapping them"""
+        rows = list(rows)
+        columns = {name: [r[name] for r in rows] for name in SCHEMA}
+        columns["resume_id"] = [str(resume_id) for resume_id in columns["resume_id"]]
+        self.table.append(columns)
+        return len(rows)
+
+    def set_row_map(self, row_map):
+        """Replace the row map (stored row of every row), e.g. after an update"""
+        self.row_map = np.asarray(row_map, dtype=np.int64)
+        save_array_atomic(os.path.join(self.store_dir, "row_map.npy"), self.row_map)
+
+    def add_stream(self, rows, batch_size=10000):
+        """Append rows from an iterator in batches (memory bounded by one batch)"""
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                count += self.add(batch)
+                batch = []
+        return count + self.add(batch)
+
+    # -------------------------------
+    # Read
+    # -------------------------------
+    def column(self, name, rows=None):
+        """
+        One stored column for all rows, a row range (slice) or the given
+        row indices, as a list of values
+        """
+        if self.row_map is not None:
+            rows = self._row_indices(rows)
+            if name == "resume_id":
+                return [str(row) for row in rows.tolist()]
+            rows = self.row_map[rows]
+
+        if self.table.schema[name] == "dict":
+            rows = range(len(self))[rows] if rows is None or isinstance(rows, slice) else rows
+            return self.table.decode(name, rows)
+
+        column = self.table.column(name)
+        if rows is None:
+            return column.to_list()
+        if isinstance(rows, slice):
+            return column[rows]
+        return column.take(rows)
+
+    def rows(self, category=None, start=0, stop=None):
+        """
+        Row indices in [start, stop), optionally only those whose category
+        is `category` (or one of a list of categories). The filter runs on
+        the memory-mapped category codes, before any other column is read.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if category is None:
+            return np.arange(start, max(start, stop))
+        categories = [category] if isinstance(category, str) else category
+        rows = self.table.where("category", categories)
+        if self.row_map is not None:
+            rows = np.flatnonzero(np.isin(self.row_map, rows))
+        return rows[(rows >= start) & (rows < stop)]
+
+    def _row_indices(self, rows):
+        if rows is None:
+            return self.rows()
+        if isinstance(rows, slice):
+            return self.rows(start=rows.start or 0, stop=rows.stop)
+        return np.asarray(rows, dtype=np.int64)
+
+    def _stored(self, rows):
+        """Stored row indices of the given row indices"""
+        return rows if self.row_map is None else self.row_map[rows]
+
+    def text_view(self, row):
+        """UTF-8 bytes of one full resume text: a memoryview of the mapped blob, no copy"""
+        text = self.table.column("text")
+        start, end = text.span(int(self._stored(row)))
+        return memoryview(np.asarray(text.data))[start:end]
+
+    def text_views(self, rows=None):
+        """text_view() for many rows, looking the blob and offsets up once"""
+        rows = self._stored(self._row_indices(rows))
+        text = self.table.column("text")
+        blob = memoryview(np.asarray(text.data))
+        offsets = np.asarray(text.offsets)
+        starts = np.where(rows > 0, offsets[rows - 1], 0) if len(rows) else rows
+        for start, end in zip(starts.tolist(), offsets[rows].tolist()):
+            yield blob[start:end]
+
+    def texts(self, rows=None):
+        """Full original texts for the given rows"""
+        return self.column("text", self._row_indices(rows))
+
+    def span_rows(self, rows=None):
+        """Stored rows as written by add() (text plus byte spans), for copying between stores"""
+        rows = self._row_indices(rows)
+        values = {name: self.column(name, rows) for name in SCHEMA}
+        return [dict(zip(SCHEMA, row)) for row in zip(*(values[name] for name in SCHEMA))]
+
+    def records(self, rows=None, columns=None):
+        """
+        SG_parser.json-shaped records for the given rows, with all or only
+        the named fields (RECORD_FIELDS). Span fields are sliced out of the
+        text blob; only the spans of the requested fields are read.
+        """
+        rows = self._row_indices(rows)
+        columns = columns or RECORD_FIELDS
+        values = {
+            name: self.column(name, rows)
+            for name in columns if name in SCHEMA and name not in SPAN_FIELDS
+        }
+
+        span_fields = [name for name in columns if name in SPAN_FIELDS]
+        if span_fields or "full_text" in columns:
+            stored = self._stored(rows)
+            text = self.table.column("text")
+            blob = memoryview(np.asarray(text.data))
+            offsets = np.asarray(text.offsets)
+            starts = np.where(stored > 0, offsets[stored - 1], 0).tolist() if len(stored) else []
+
+            for name in span_fields:
+                spans = self.column(name, rows)
+                pieces = [
+                    [str(blob[base + start:base + end], "utf-8") for start, end in row_spans]
+                    for base, row_spans in zip(starts, spans)
+                ]
+                if name in JOINED_FIELDS:
+                    values[name] = [" ".join(" ".join(row_pieces).split()) for row_pieces in pieces]
+                else:
+                    values[name] = pieces
+
+            if "full_text" in columns:
+                values["full_text"] = text.take(stored)
+
+        return [dict(zip(columns, row)) for row in zip(*(values[name] for name in columns))]
@@ -0,0 +1,111 @@
+# backend/response_encoding.py
+"""
+Content negotiation for the analyze endpoints.
+
+Supported response encodings (chosen from the Accept header):
+
+    application/json                      default, validated through pydantic
+    application/vnd.resume-analyzer+json  same JSON document, serialized with
+                                          orjson and no response-model pass
+    application/msgpack                   MessagePack (application/x-msgpack
+                                          is accepted as an alias)
+
+MessagePack schema: the payload is the same document as the JSON response,
+encoded as a MessagePack map with string keys.
+
+    /analyze        map  {ats_score: float64, semantic_match: float64 | nil,
+                          skill_match, section_completeness, category_balance,
+                          formatting: float64, extracted_skills: [str] | [int],
+                          stages: [str], unavailable: [str], degraded: bool,
+                          elapsed_ms: float64}
+    /analyze/batch  map  {results: [<analyze map without elapsed_ms>],
+                          elapsed_ms: float64}
+
+With ?skill_ids=true, extracted_skills holds integer IDs into the ontology
+vocabulary (GET /skills/vocabulary, index = ID) instead of skill names.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional binary format
+    msgpack = None
+
+JSON = "application/json"
+FAST_JSON = "application/vnd.resume-analyzer+json"
+MSGPACK = "application/msgpack"
+
+MEDIA_ALIASES = {
+    "application/json": JSON,
+    "*/*": JSON,
+    "application/*": JSON,
+    FAST_JSON: FAST_JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+
+class NotAcceptable(Exception):
+    """Raised when no requested encoding can be produced"""
+
+
+def choose_encoding(accept_header):
+    """
+    Pick the response media type from an Accept header.
+    Media ranges are tried by q-value, then in the order given; JSON is the
+    default when the header is missing or names nothing supported, unless
+    it is excluded with application/json;q=0.
+    """
+    if not accept_header:
+        return JSON
+
+    ranges = []
+    for position, item in enumerate(accept_header.split(",")):
+        parts = [p.strip() for p in item.split(";")]
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        ranges.append((-quality, position, parts[0].lower()))
+
+    # An explicit application/json;q=0 also overrides wildcards mapped to JSON
+    json_excluded = (0.0, JSON) in {(-q, media_type) for q, _, media_type in ranges}
+
+    for negative_quality, _, media_type in sorted(ranges):
+        encoding = MEDIA_ALIASES.get(media_type)
+        if encoding is None or negative_quality == 0 or (encoding == JSON and json_excluded):
+            continue
+        if encoding == MSGPACK and msgpack is None:
+            continue
+        return encoding
+
+    if not json_excluded:
+        return JSON
+    raise NotAcceptable(f"Supported encodings: {JSON}, {FAST_JSON}, {MSGPACK}")
+
+
+def encode(payload, media_type):
+    """Serialize a response payload to bytes for a non-default encoding"""
+    if media_type == MSGPACK:
+        return msgpack.packb(payload, use_bin_type=True)
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode(content, media_type):
+    """Client-side counterpart of encode (used by tests and benchmarks)"""
+    if media_type == MSGPACK:
+        return msgpack.unpackb(content, raw=False)
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
@@ -0,0 +1,225 @@
+# backend/resume_corpus.py
+"""
+Persisted resume corpus for ranked candidate search.
+
+Layout of the corpus directory:
+    skills.npy      packed skill bitsets (n x ceil(vocab/8) uint8)
+    embeddings.npy  L2-normalized resume embeddings (n x dim float32)
+    records.jsonl   one record per resume (id, text, skill output)
+    offsets.npy     byte offset of every record in records.jsonl
+    corpus.lock     lock file shared by every process using the corpus
+
+Arrays are memory-mapped, so search only touches the skill bitsets and
+embeddings; full records are read back for the shortlisted rows only.
+Appends are serialized by a file lock, so the API and the ingester can
+write to the same corpus, and replace the array files, so a search running
+alongside keeps reading the arrays it started with. Every append and search
+first reloads the arrays if another process (or instance) appended since
+they were loaded.
+"""
+
+import json
+import math
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class ResumeCorpus:
+    def __init__(self, corpus_dir="datasets/resume_corpus"):
+        self.corpus_dir = corpus_dir
+        os.makedirs(corpus_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._arrays = (None, None, np.zeros(0, dtype=np.int64))
+        self._version = None
+        self._refresh()
+
+    def _path(self, name):
+        return os.path.join(self.corpus_dir, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive=True):
+        """Lock the corpus against other processes; shared for reloads"""
+        with open(self._path("corpus.lock"), "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass
+            # Closing the file releases the lock
+            yield
+
+    def _disk_version(self):
+        """offsets.npy is replaced (and grows) on every append"""
+        try:
+            stat = os.stat(self._path("offsets.npy"))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _refresh(self):
+        """Reload the arrays if they changed on disk since the last load"""
+        if self._disk_version() != self._version:
+            with self._file_lock(exclusive=False):
+                self._load()
+
+    def _load(self):
+        """Call with the file lock held, so no append replaces files midway"""
+        version = self._disk_version()
+        if version is not None:
+            skills = np.load(self._path("skills.npy"), mmap_mode="r")
+            embeddings = np.load(self._path("embeddings.npy"), mmap_mode="r")
+            offsets = np.load(self._path("offsets.npy"))
+        else:
+            skills = embeddings = None
+            offsets = np.zeros(0, dtype=np.int64)
+        # Swapped in one assignment, so readers never mix two versions
+        self._arrays = (skills, embeddings, offsets)
+        self._version = version
+
+    @property
+    def skills(self):
+        return self._arrays[0]
+
+    @property
+    def embeddings(self):
+        return self._arrays[1]
+
+    @property
+    def offsets(self):
+        return self._arrays[2]
+
+    def _save(self, name, array):
+        """Write to a temporary file and rename it: open memory maps keep the old file"""
+        tmp_path = self._path(name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, self._path(name))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # -------------------------------
+    # Write
+    # -------------------------------
+    def add(self, resume_ids, resume_texts, skill_vectors, skill_outputs, embeddings):
+        """
+        Append a batch of resumes. Add in batches: the arrays are rewritten
+        on every call. Concurrent calls, from this or other processes, are
+        applied one after the other.
+        """
+        if not len(resume_ids):
+            return
+
+        with self._lock, self._file_lock():
+            # Rows appended by other processes come first
+            self._load()
+            self._append(resume_ids, resume_texts, skill_vectors, skill_outputs, embeddings)
+
+    def _append(self, resume_ids, resume_texts, skill_vectors, skill_outputs, embeddings):
+        skill_bits = np.packbits(np.asarray(skill_vectors, dtype=bool), axis=1)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.where(norms == 0, 1, norms)
+
+        offsets = []
+        with open(self._path("records.jsonl"), "ab") as f:
+            position = f.tell()
+            for resume_id, text, skill_output in zip(resume_ids, resume_texts, skill_outputs):
+                line = json.dumps({
+                    "resume_id": resume_id,
+                    "resume_text": text,
+                    "skill_output": skill_output
+                }, ensure_ascii=False).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets.append(position)
+                position += len(line)
+
+        if len(self):
+            skill_bits = np.concatenate([self.skills, skill_bits])
+            embeddings = np.concatenate([self.embeddings, embeddings])
+        offsets = np.concatenate([self.offsets, np.asarray(offsets, dtype=np.int64)])
+
+        # offsets.npy last: it defines the row count when the corpus is reopened
+        self._save("skills.npy", skill_bits)
+        self._save("embeddings.npy", embeddings)
+        self._save("offsets.npy", offsets)
+        self._load()
+
+    # -------------------------------
+    # Read
+    # -------------------------------
+    def records(self, rows):
+        """Read full records for the given row indices"""
+        records = []
+        with open(self._path("records.jsonl"), "rb") as f:
+            for row in rows:
+                f.seek(int(self.offsets[row]))
+                records.append(json.loads(f.readline()))
+        return records
+
+    def resume_ids(self):
+        """IDs of all resumes, in row order"""
+        self._refresh()
+        ids = []
+        if not len(self):
+            return ids
+        with open(self._path("records.jsonl"), "rb") as f:
+            for offset in self.offsets.tolist():
+                f.seek(offset)
+                ids.append(json.loads(f.readline())["resume_id"])
+        return ids
+
+    # -------------------------------
+    # Search
+    # -------------------------------
+    def shortlist(self, jd_skill_vector, jd_embedding, top_n=50, min_skill_match=0.0):
+        """
+        Prefilter by required JD skills, then rank the survivors semantically.
+        Returns (rows, semantic_scores, candidates_considered), best first.
+        """
+        # One consistent snapshot, even if an append swaps the arrays meanwhile
+        self._refresh()
+        skills, embeddings, offsets = self._arrays
+        if not len(offsets):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32), 0
+
+        jd_skill_vector = np.asarray(jd_skill_vector, dtype=bool)
+        required = int(jd_skill_vector.sum())
+
+        if required:
+            jd_bits = np.packbits(jd_skill_vector)
+            matched = np.unpackbits(skills & jd_bits, axis=1).sum(axis=1)
+            min_matched = max(1, math.ceil(min_skill_match * required))
+            rows = np.flatnonzero(matched >= min_matched)
+        else:
+            rows = np.arange(len(offsets))
+
+        if not len(rows):
+            return rows, np.zeros(0, dtype=np.float32), 0
+
+        jd_embedding = np.asarray(jd_embedding, dtype=np.float32)
+        jd_embedding = jd_embedding / (np.linalg.norm(jd_embedding) or 1.0)
+
+        if len(rows) == len(offsets):
+            similarity = embeddings @ jd_embedding
+        else:
+            similarity = embeddings[rows] @ jd_embedding
+
+        top_n = min(top_n, len(rows))
+        best = np.argpartition(-similarity, top_n - 1)[:top_n]
+        best = best[np.argsort(-similarity[best], kind="stable")]
+
+        return rows[best], similarity[best], len(rows)
@@ -1,90 +1,415 @@
 # backend/resume_parser.py
 
+import argparse
+import hashlib
+import os
+import shutil
+import numpy as np
 import pandas as pd
 import json
 from tqdm import tqdm
 import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from section_segmenter import BULLETS, HEADER_LEXICON, segment
+from parsed_store import JOINED_FIELDS, SCHEMA, ParsedResumeStore, byte_spans, save_array_atomic
+
+try:
+    import orjson
+except ImportError:  # optional fast serializer
+    orjson = None
+
+# Bump whenever parse_resume output changes, so incremental runs re-parse everything
+PARSER_VERSION = 1
+
+SKILL_DELIMITERS = re.compile(r',|\||;|•|·|\*')
+DEGREE = re.compile(r'\b(?:bachelor|master|phd|b\.e|b\.tech|m\.tech|m\.s)\b')
+
+
+def content_hash(resume_text, category):
+    """Stable 64-bit key of everything parse_resume reads from one CSV row"""
+    digest = hashlib.blake2b(f"{category}\0{resume_text}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def parser_fingerprint():
+    """Identifies the parsing rules: parser version and section header lexicon"""
+    rules = json.dumps({"version": PARSER_VERSION, "headers": HEADER_LEXICON}, sort_keys=True)
+    return hashlib.blake2b(rules.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def column(df, name):
+    """Column values as str (empty strings when the column is missing)"""
+    if name not in df.columns:
+        return [""] * len(df)
+    return [str(value) for value in df[name].tolist()]
+
+
+def dumps_line(record):
+    """One JSON Lines record as UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.dumps(record) + b"\n"
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def write_json_atomic(path, data):
+    """Write to a temporary file and rename it, so readers never see a partial file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _parse_shard(shard, rows, shard_path):
+    """Parse one shard of (resume_id, text, category) rows into its own JSONL file"""
+    parser = ResumeParser(None, stream=True)
+    with open(shard_path + ".tmp", "wb") as f:
+        for row in rows:
+            f.write(dumps_line(parser.parse_resume(*row)))
+    os.replace(shard_path + ".tmp", shard_path)
+    return shard, len(rows)
+
 
 class ResumeParser:
-    def __init__(self, csv_path):
+    def __init__(self, csv_path, stream=False):
+        """
+        stream=True skips loading the CSV; iter_records() and save_jsonl()
+        then read it chunk by chunk
+        """
+        self.csv_path = csv_path
+        self.df = None
+        if stream:
+            return
         self.df = pd.read_csv(csv_path)
         self.df.fillna("", inplace=True)
         print(f"Loaded {len(self.df)} resumes from {csv_path}")
         print(f"Columns: {self.df.columns.tolist()}")
 
     def clean_text(self, text):
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        # str.split() splits on exactly the characters \s matches
+        return ' '.join(text.split())
 
-    def extract_skills(self, resume_text):
-        """Extract skills from resume text using simple pattern matching"""
+    def extract_skills(self, resume_text, sections=None):
+        """Extract skills from the lines of the skills section(s)"""
+        if sections is None:
+            sections = segment(resume_text)
         skills = []
-        
-        # Common skill keywords and patterns
-        skill_patterns = [
-            r'Skills?\s*:?\s*([^\n]+)',
-            r'Technical Skills?\s*:?\s*([^\n]+)',
-            r'Programming Languages?\s*:?\s*([^\n]+)',
-            r'Tools?\s*:?\s*([^\n]+)'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, resume_text, re.IGNORECASE)
-            for match in matches:
-                # Split by common delimiters
-                skill_list = re.split(r',|\||;|•|·', match)
-                skills.extend([s.strip() for s in skill_list if s.strip()])
-        
+
+        for line in sections.lines("skills"):
+            # Split by common delimiters
+            skill_list = SKILL_DELIMITERS.split(line)
+            skills.extend([s.strip() for s in skill_list if s.strip()])
+
         return sorted(set(skills))
 
-    def extract_education(self, resume_text):
-        """Extract education information"""
-        edu_patterns = [
-            r'Education\s*(?:Details)?\s*:?\s*([^\n]+(?:\n(?!\w+:)[^\n]+)*)',
-            r'(?:Bachelor|Master|PhD|B\.E|B\.Tech|M\.Tech|M\.S)\s+[^\n]+'
-        ]
-        
-        education = []
-        for pattern in edu_patterns:
-            matches = re.findall(pattern, resume_text, re.IGNORECASE)
-            education.extend(matches)
-        
-        return ' '.join(education) if education else ""
-
-    def extract_experience(self, resume_text):
+    def education_spans(self, resume_text, sections):
+        """Spans of the education section, or of degree lines if there is none"""
+        if "education" in sections:
+            return sections.spans["education"]
+        spans = sorted(sum(sections.spans.values(), []))
+        return [(start, end) for start, end in spans if DEGREE.search(resume_text[start:end].lower())]
+
+    def experience_spans(self, resume_text, sections):
+        """Spans of the experience section, or the first 500 characters"""
+        if "experience" in sections:
+            return sections.spans["experience"]
+        return [(0, min(500, len(resume_text)))]
+
+    def item_spans(self, resume_text, sections, section):
+        """One span per line of a list section (projects, certifications), bullets removed"""
+        spans = []
+        for start, end in sections.spans.get(section, []):
+            line = resume_text[start:end]
+            item = line.lstrip(BULLETS)
+            start += len(line) - len(item.lstrip())
+            if item.strip():
+                spans.append((start, end))
+        return spans
+
+    def section_spans(self, resume_text, sections):
+        """Character spans of every text field, keyed by field name"""
+        return {
+            "education": self.education_spans(resume_text, sections),
+            "experience": self.experience_spans(resume_text, sections),
+            "projects": self.item_spans(resume_text, sections, "projects"),
+            "certifications": self.item_spans(resume_text, sections, "certifications")
+        }
+
+    def extract_education(self, resume_text, sections=None):
+        """Extract education information (degree lines if there is no section)"""
+        if sections is None:
+            sections = segment(resume_text)
+        return "\n".join(resume_text[start:end] for start, end in self.education_spans(resume_text, sections))
+
+    def extract_experience(self, resume_text, sections=None):
         """Extract experience information"""
-        exp_patterns = [
-            r'Experience\s*:?\s*([^\n]+(?:\n(?!\w+:)[^\n]+)*)',
-            r'Work Experience\s*:?\s*([^\n]+(?:\n(?!\w+:)[^\n]+)*)',
-        ]
-        
-        experience = []
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, resume_text, re.IGNORECASE)
-            experience.extend(matches)
-        
-        return ' '.join(experience) if experience else resume_text[:500]
+        if sections is None:
+            sections = segment(resume_text)
+        return "\n".join(resume_text[start:end] for start, end in self.experience_spans(resume_text, sections))
+
+    def parse_sections(self, resume_text):
+        """
+        All SG_parser.json fields from a single segmentation pass; each
+        extractor only sees the lines of its own section
+        """
+        sections = segment(resume_text)
+        fields = {"skills": self.extract_skills(resume_text, sections)}
+        for name, spans in self.section_spans(resume_text, sections).items():
+            pieces = [resume_text[start:end] for start, end in spans]
+            fields[name] = self.clean_text(" ".join(pieces)) if name in JOINED_FIELDS else pieces
+        return fields
+
+    def parse_resume(self, resume_id, resume_text, category=""):
+        return {
+            "resume_id": resume_id,
+            "category": category,
+            **self.parse_sections(resume_text),
+            "full_text": self.clean_text(resume_text)[:1000]  # Store first 1000 chars
+        }
+
+    def parse_spans(self, resume_id, resume_text, category=""):
+        """
+        Row for ParsedResumeStore: the full text plus byte spans into it
+        for every text field, instead of copied strings
+        """
+        sections = segment(resume_text)
+        return {
+            "resume_id": resume_id,
+            "category": category,
+            "skills": self.extract_skills(resume_text, sections),
+            "text": resume_text,
+            **byte_spans(resume_text, self.section_spans(resume_text, sections))
+        }
 
     def parse(self):
-        parsed_resumes = []
-
-        for idx, row in tqdm(self.df.iterrows(), total=len(self.df), desc="Parsing resumes"):
-            resume_text = str(row.get("Resume", ""))
-            category = str(row.get("Category", ""))
-            
-            resume_json = {
-                "resume_id": idx,
-                "category": category,
-                "skills": self.extract_skills(resume_text),
-                "education": self.clean_text(self.extract_education(resume_text)),
-                "experience": self.clean_text(self.extract_experience(resume_text)),
-                "projects": "",  # Not available in this dataset
-                "certifications": "",  # Not available in this dataset
-                "full_text": self.clean_text(resume_text)[:1000]  # Store first 1000 chars
-            }
-            parsed_resumes.append(resume_json)
-
-        return parsed_resumes
+        # Plain column lists: no per-row Series like iterrows() builds
+        rows = zip(self.df.index.tolist(), column(self.df, "Resume"), column(self.df, "Category"))
+        return [
+            self.parse_resume(idx, resume_text, category)
+            for idx, resume_text, category in tqdm(rows, total=len(self.df), desc="Parsing resumes")
+        ]
+
+    def iter_records(self, chunk_size=10000, spans=False):
+        """
+        Stream the CSV in chunks of rows and yield one record at a time, so
+        memory is bounded by one chunk. Resume and Category are read as
+        text (resume_id is the row position, as with the full read).
+        Progress is shown in bytes of the CSV read. spans=True yields
+        parse_spans() rows for a ParsedResumeStore instead.
+        """
+        parse = self.parse_spans if spans else self.parse_resume
+        with open(self.csv_path, "rb") as f, tqdm(
+            total=os.path.getsize(self.csv_path), desc="Parsing resumes", unit="B", unit_scale=True
+        ) as progress:
+            chunks = pd.read_csv(f, chunksize=chunk_size, usecols=lambda name: name in ("Resume", "Category"),
+                                 dtype=str)
+            for chunk in chunks:
+                chunk = chunk.fillna("")
+                rows = zip(chunk.index.tolist(), column(chunk, "Resume"), column(chunk, "Category"))
+                for idx, resume_text, category in rows:
+                    yield parse(idx, resume_text, category)
+                progress.update(f.tell() - progress.n)
+
+    def save_jsonl(self, output_path, chunk_size=10000):
+        """Write records as JSON Lines while they are parsed (constant memory)"""
+        count = 0
+        with open(output_path, "wb") as f:
+            for record in self.iter_records(chunk_size):
+                f.write(dumps_line(record))
+                count += 1
+
+        print(f"\n✓ Parsed {count} resumes saved to {output_path}")
+        return count
+
+    def save_store(self, store_dir, chunk_size=10000):
+        """
+        Append rows to a columnar ParsedResumeStore while they are parsed
+        (memory bounded by one chunk)
+        """
+        count = ParsedResumeStore(store_dir).add_stream(self.iter_records(chunk_size, spans=True), chunk_size)
+        print(f"\n✓ Parsed {count} resumes saved to store {store_dir}")
+        return count
+
+    def update_store(self, store_dir, chunk_size=10000):
+        """
+        Incremental save_store. Each row's content hash is looked up in the
+        hashes of the rows already stored: unchanged rows (wherever they
+        moved to) are reused in place, new and changed rows are parsed and
+        appended, and the store's row map is rewritten to point every CSV
+        row at its stored row. Replaced rows stay in the files unmapped
+        until they outnumber the live ones, when the store is compacted.
+        Nothing is reused when the parser fingerprint changed.
+
+        content_hashes.npy holds the hash of every stored row and
+        parse_manifest.json the fingerprint. Returns (rows, parsed).
+        """
+        manifest_path = os.path.join(store_dir, "parse_manifest.json")
+        fingerprint = parser_fingerprint()
+        reuse = False
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                reuse = json.load(f)["parser"] == fingerprint
+
+        # Without reusable rows the store is rebuilt next to the old one and swapped in
+        target = store_dir if reuse else store_dir.rstrip(os.sep) + ".new"
+        if not reuse:
+            shutil.rmtree(target, ignore_errors=True)
+        store = ParsedResumeStore(target)
+        hashes = np.load(os.path.join(target, "content_hashes.npy")).tolist() if reuse else []
+        stored = {}
+        for row, key in enumerate(hashes):
+            stored.setdefault(key, row)
+        # Rows appended by an interrupted run have no hash and are never reused
+        hashes.extend([0] * (len(store.table) - len(hashes)))
+
+        row_map = []
+        parsed = 0
+        # Parsed rows are appended chunk_size at a time, not once per shard
+        records = []
+        with tqdm(desc="Updating parsed resumes", unit=" rows") as progress:
+            for _, rows in self.iter_shards(chunk_size):
+                for idx, resume_text, category in rows:
+                    key = content_hash(resume_text, category)
+                    row = stored.get(key)
+                    if row is None:
+                        row = len(hashes)
+                        hashes.append(key)
+                        records.append(self.parse_spans(idx, resume_text, category))
+                    row_map.append(row)
+                if len(records) >= chunk_size:
+                    parsed += store.append_stored(records)
+                    records = []
+                progress.update(len(rows))
+            parsed += store.append_stored(records)
+
+        hashes = np.asarray(hashes, dtype=np.int64)
+        row_map = np.asarray(row_map, dtype=np.int64)
+        if reuse and len(hashes) > 2 * len(np.unique(row_map)):
+            target = store_dir.rstrip(os.sep) + ".new"
+            store, hashes, row_map = self._compact(store, target, hashes, row_map, chunk_size)
+
+        # Rows first, then hashes and map: readers keep the old map until the new one is complete
+        save_array_atomic(os.path.join(target, "content_hashes.npy"), hashes)
+        store.set_row_map(row_map)
+        write_json_atomic(os.path.join(target, "parse_manifest.json"), {
+            "parser": fingerprint,
+            "parser_version": PARSER_VERSION,
+            "csv_path": os.path.abspath(self.csv_path),
+            "rows": len(row_map),
+            "stored_rows": len(hashes)
+        })
+
+        if target != store_dir:
+            old_dir = store_dir.rstrip(os.sep) + ".old"
+            shutil.rmtree(old_dir, ignore_errors=True)
+            if os.path.exists(store_dir):
+                os.replace(store_dir, old_dir)
+            os.replace(target, store_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+        print(f"\n✓ {len(row_map)} resumes in store {store_dir} "
+              f"({parsed} parsed, {len(row_map) - parsed} unchanged)")
+        return len(row_map), parsed
+
+    def _compact(self, store, target, hashes, row_map, chunk_size):
+        """Copy only the mapped rows of store into a new store at target"""
+        shutil.rmtree(target, ignore_errors=True)
+        compacted = ParsedResumeStore(target)
+        live = np.unique(row_map)
+        for first in range(0, len(live), chunk_size):
+            rows = live[first:first + chunk_size]
+            records = [dict(zip(SCHEMA, values)) for values in zip(*(
+                store.table.column(name).take(rows) if store.table.schema[name] != "dict"
+                else store.table.decode(name, rows) for name in SCHEMA
+            ))]
+            compacted.append_stored(records)
+        return compacted, hashes[live], np.searchsorted(live, row_map)
+
+    def iter_shards(self, shard_size):
+        """(shard index, rows) for consecutive row ranges of the CSV"""
+        chunks = pd.read_csv(self.csv_path, chunksize=shard_size,
+                             usecols=lambda name: name in ("Resume", "Category"), dtype=str)
+        for shard, chunk in enumerate(chunks):
+            chunk = chunk.fillna("")
+            yield shard, list(zip(chunk.index.tolist(), column(chunk, "Resume"), column(chunk, "Category")))
+
+    def save_jsonl_parallel(self, output_path, workers=4, shard_size=10000, work_dir=None):
+        """
+        Parse row-range shards of the CSV in a process pool and merge them,
+        in order, into one JSON Lines file (same records as save_jsonl).
+
+        Every shard is written to its own file in work_dir and recorded in
+        work_dir/manifest.json once complete. Re-running after an
+        interruption skips the recorded shards. The work directory is
+        removed after the merge.
+        """
+        work_dir = work_dir or output_path + ".shards"
+        os.makedirs(work_dir, exist_ok=True)
+        manifest_path = os.path.join(work_dir, "manifest.json")
+        source = {
+            "csv_path": os.path.abspath(self.csv_path),
+            "csv_size": os.path.getsize(self.csv_path),
+            "csv_mtime": os.path.getmtime(self.csv_path),
+            "shard_size": shard_size
+        }
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if {key: manifest.get(key) for key in source} != source:
+                raise ValueError(f"{manifest_path} belongs to another input or shard size; remove {work_dir}")
+            print(f"Resuming: {len(manifest['shards'])} shard(s) already parsed")
+        else:
+            manifest = dict(source, shards={}, total_shards=None)
+            write_json_atomic(manifest_path, manifest)
+
+        def shard_path(shard):
+            return os.path.join(work_dir, f"shard_{shard:06d}.jsonl")
+
+        progress = tqdm(desc="Parsing resumes", unit=" rows",
+                        initial=sum(manifest["shards"].values()))
+
+        def record(result):
+            shard, rows = result
+            manifest["shards"][str(shard)] = rows
+            write_json_atomic(manifest_path, manifest)
+            progress.update(rows)
+
+        todo = (
+            (shard, rows) for shard, rows in self.iter_shards(shard_size)
+            if str(shard) not in manifest["shards"]
+        )
+        with progress:
+            if workers <= 1:
+                for shard, rows in todo:
+                    record(_parse_shard(shard, rows, shard_path(shard)))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    # At most 2 * workers shards in flight, so memory stays bounded
+                    pending = set()
+                    for shard, rows in todo:
+                        if len(pending) >= 2 * workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                record(future.result())
+                        pending.add(pool.submit(_parse_shard, shard, rows, shard_path(shard)))
+                    for future in wait(pending).done:
+                        record(future.result())
+
+        # Shard indices are consecutive from 0; the highest seen is the last
+        total_shards = max(map(int, manifest["shards"]), default=-1) + 1
+        manifest["total_shards"] = total_shards
+        write_json_atomic(manifest_path, manifest)
+
+        with open(output_path + ".tmp", "wb") as out:
+            for shard in range(total_shards):
+                with open(shard_path(shard), "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(output_path + ".tmp", output_path)
+        shutil.rmtree(work_dir)
+
+        count = sum(manifest["shards"].values())
+        print(f"\n✓ Parsed {count} resumes in {total_shards} shard(s) saved to {output_path}")
+        return count
 
     def save_json(self, output_path):
         data = self.parse()
@@ -93,3 +418,30 @@ class ResumeParser:
 
         print(f"\n✓ Parsed {len(data)} resumes saved to {output_path}")
         return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a resume CSV into JSON Lines, streaming")
+    parser.add_argument("csv_path")
+    parser.add_argument("output_path", help=".jsonl output (store directory with --store)")
+    parser.add_argument("--store", action="store_true", help="append to a columnar parsed-resume store")
+    parser.add_argument("--incremental", action="store_true",
+                        help="update a store, parsing only rows that are new or changed since the last run")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per chunk (shard with --workers)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parse shards in a process pool; an interrupted run resumes from its manifest")
+    args = parser.parse_args()
+
+    resume_parser = ResumeParser(args.csv_path, stream=True)
+    if args.incremental:
+        resume_parser.update_store(args.output_path, args.chunk_size)
+    elif args.store:
+        resume_parser.save_store(args.output_path, args.chunk_size)
+    elif args.workers > 1:
+        resume_parser.save_jsonl_parallel(args.output_path, args.workers, args.chunk_size)
+    else:
+        resume_parser.save_jsonl(args.output_path, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# backend/score_store.py
+"""
+Columnar store of per-candidate ATS component scores.
+
+Every scoring event appends one row (candidate, job, five component
+scores), so final scores and rankings can be recomputed for any weighting
+without re-running extraction or embeddings. Scores against an inline job
+description are stored under job_key(None, text), "jd:" plus a hash of it.
+"""
+
+import hashlib
+import time
+import numpy as np
+from ats_scorer import ATSScorer
+from column_store import ColumnStore
+
+COMPONENTS = [
+    "skill_match",
+    "semantic_match",
+    "section_completeness",
+    "category_balance",
+    "formatting"
+]
+
+SCHEMA = {
+    "candidate_id": "str",
+    "candidate_key": "int64",
+    "job_id": "dict",
+    "scored_at": "float64",
+    **{name: "float64" for name in COMPONENTS}
+}
+
+
+def candidate_key(candidate_id):
+    """Stable 64-bit key of a candidate ID, used for vectorized de-duplication"""
+    digest = hashlib.blake2b(str(candidate_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def job_key(job_id, job_description=None):
+    """job_id of a stored job, or "jd:<hash>" of an inline job description"""
+    if job_id:
+        return job_id
+    digest = hashlib.blake2b((job_description or "").encode("utf-8"), digest_size=8).hexdigest()
+    return f"jd:{digest}"
+
+
+class ScoreStore:
+    def __init__(self, store_dir="datasets/score_store"):
+        self.table = ColumnStore(store_dir, schema=SCHEMA)
+
+    def __len__(self):
+        return len(self.table)
+
+    def add(self, candidate_ids, job_id, breakdowns, job_description=None):
+        """
+        Persist component scores for a batch of candidates scored against
+        one job, a stored job_id or else the inline job_description.
+        Missing components (None) are stored as NaN.
+        """
+        now = time.time()
+        columns = {
+            "candidate_id": list(candidate_ids),
+            "candidate_key": [candidate_key(c) for c in candidate_ids],
+            "job_id": [job_key(job_id, job_description)] * len(breakdowns),
+            "scored_at": [now] * len(breakdowns)
+        }
+        for name in COMPONENTS:
+            columns[name] = [np.nan if b[name] is None else b[name] for b in breakdowns]
+        self.table.append(columns)
+
+    def select(self, job_id=None, latest_only=True):
+        """
+        Row indices for a job (all jobs when job_id is None). With
+        latest_only, a candidate re-scored for the same job keeps only its
+        most recent row.
+        """
+        jobs = self.table.column("job_id")
+
+        if job_id is None:
+            rows = np.arange(len(self))
+        else:
+            code = self.table.code("job_id", job_id)
+            if code is None:
+                return np.zeros(0, dtype=np.int64)
+            rows = np.flatnonzero(jobs == code)
+
+        if latest_only and len(rows):
+            # One 64-bit key per (job, candidate) pair
+            keys = self.table.column("candidate_key")[rows].view(np.uint64) ^ (
+                np.asarray(jobs[rows], dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+            )
+            # Stable sort keeps insertion order within a key: the last one is the latest
+            order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[order]
+            is_last = np.append(sorted_keys[1:] != sorted_keys[:-1], True)
+            rows = np.sort(rows[order[is_last]])
+
+        return rows
+
+    def components(self, rows=None):
+        """Component score arrays ({name: (n,) float64}) for the given rows"""
+        columns = {name: self.table.column(name) for name in COMPONENTS}
+        if rows is None:
+            return {name: np.asarray(col) for name, col in columns.items()}
+        return {name: col[rows] for name, col in columns.items()}
+
+    def reweight(self, weights, job_id=None, top_k=50):
+        """
+        Recompute final scores for every stored candidate under new weights
+        in one vectorized pass. Returns (rows, final_scores, ranking) where
+        ranking holds the indices (into rows) of the top_k candidates.
+        """
+        scorer = ATSScorer(weights)
+        rows = self.select(job_id)
+        final_scores = scorer.combine_batch(self.components(rows))
+
+        top_k = min(top_k, len(rows))
+        if top_k == 0:
+            return rows, final_scores, np.zeros(0, dtype=np.int64)
+
+        best = np.argpartition(-final_scores, top_k - 1)[:top_k]
+        ranking = best[np.argsort(-final_scores[best], kind="stable")]
+        return rows, final_scores, ranking
+
+    def describe(self, rows):
+        """Candidate and job IDs for the given rows"""
+        return (
+            self.table.column("candidate_id").take(rows),
+            self.table.decode("job_id", rows)
+        )
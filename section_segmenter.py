@@ -0,0 +1,113 @@
+# backend/section_segmenter.py
+"""
+Single-pass, line-oriented resume section segmenter.
+
+Every line is either a section header or content. Headers are recognized
+by one anchored alternation over a lexicon of header phrases, matched at
+the start of the lowercased line (after leading bullets), and must be
+followed by nothing, an optional "details", or a separator such as ':'
+with inline content. A small state machine assigns each content line to
+the section of the last header seen; lines before the first header, and
+under headers such as "Summary" or "Hobbies", belong to "other".
+
+Each line is visited once and the header match is anchored with no
+unbounded backtracking, so segmentation is O(n) in the text length
+whatever the input looks like.
+"""
+
+import re
+
+SECTIONS = ["skills", "experience", "education", "projects", "certifications"]
+OTHER = "other"
+
+HEADER_LEXICON = {
+    "skills": [
+        "skills", "skill", "technical skills", "key skills", "core skills", "skill set", "skillset",
+        "core competencies", "competencies", "technologies", "technical proficiency",
+        "programming languages", "programming language", "tools", "tools and technologies",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "employment history",
+        "employment", "work history", "career history", "company details", "internships", "internship",
+    ],
+    "education": [
+        "education", "educational qualifications", "academic qualifications", "qualifications",
+        "academic background", "academics",
+    ],
+    "projects": [
+        "projects", "project", "personal projects", "academic projects", "key projects", "project details",
+    ],
+    "certifications": [
+        "certifications", "certification", "certificates", "certificate", "licenses and certifications",
+        "courses", "trainings", "training",
+    ],
+    OTHER: [
+        "summary", "professional summary", "profile", "objective", "career objective", "about me",
+        "personal details", "personal information", "contact", "languages", "hobbies", "interests",
+        "achievements", "awards", "publications", "references", "declaration", "strengths",
+    ],
+}
+
+# Longest phrases first, so "work experience" wins over "work"-less prefixes
+_PHRASES = sorted(
+    ((phrase, section) for section, phrases in HEADER_LEXICON.items() for phrase in phrases),
+    key=lambda item: -len(item[0])
+)
+HEADER_SECTION = {phrase: section for phrase, section in _PHRASES}
+HEADER = re.compile(
+    "(" + "|".join(re.escape(phrase) for phrase, _ in _PHRASES) + r")(?: details)?[ \t]*(?:[:\-–*|•][ \t]*|$)"
+)
+BULLETS = " \t\r•*-#>·"
+
+
+class Sections:
+    """
+    Content spans of one resume grouped by section: spans[section] is a
+    list of (start, end) character offsets into text, one per line
+    (stripped, non-empty). Header lines contribute only their inline
+    content.
+    """
+    def __init__(self, text, spans):
+        self.text = text
+        self.spans = spans
+
+    def lines(self, section):
+        return [self.text[start:end] for start, end in self.spans.get(section, [])]
+
+    def section_text(self, section):
+        return "\n".join(self.lines(section))
+
+    def __contains__(self, section):
+        return bool(self.spans.get(section))
+
+
+def segment(text):
+    """Assign every non-empty line of text to a section; returns Sections"""
+    spans = {}
+    current = OTHER
+    position = 0
+
+    for line in text.split("\n"):
+        line_start = position
+        position += len(line) + 1
+
+        # Offsets of the stripped line within text
+        stripped = line.strip()
+        if not stripped:
+            continue
+        start = line_start + (len(line) - len(line.lstrip()))
+        end = start + len(stripped)
+
+        body = stripped.lstrip(BULLETS)
+        lower = body.lower()
+        # Lowercasing that changes the length (rare) would shift the offsets
+        match = HEADER.match(lower) if body and len(lower) == len(body) else None
+        if match is not None:
+            current = HEADER_SECTION[match.group(1)]
+            start = end - len(body[match.end():].lstrip(BULLETS))
+            if start >= end:
+                continue
+
+        spans.setdefault(current, []).append((start, end))
+
+    return Sections(text, spans)
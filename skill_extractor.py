@@ -2,12 +2,28 @@
 
 import json
 import re
+import numpy as np
 
 class SkillExtractor:
     def __init__(self, ontology_path):
         with open(ontology_path, "r", encoding="utf-8") as f:
             self.ontology = json.load(f)
 
+        # Stable integer IDs for canonical skills (used for bitsets / compact output)
+        self.vocabulary = sorted(
+            {canonical for skills in self.ontology.values() for canonical in skills}
+        )
+        self.skill_ids = {skill: i for i, skill in enumerate(self.vocabulary)}
+
+    def skill_vector(self, skills):
+        """
+        Boolean vector over the ontology vocabulary for a list of canonical skills
+        """
+        vector = np.zeros(len(self.vocabulary), dtype=bool)
+        ids = [self.skill_ids[s] for s in skills if s in self.skill_ids]
+        vector[ids] = True
+        return vector
+
     def normalize_text(self, text):
         text = text.lower()
         text = re.sub(r'[^a-z0-9+\s]', ' ', text)
@@ -0,0 +1,69 @@
+# backend/test_ai_detector.py
+# Regression test: the detector must reproduce the scores of the original
+# implementation recorded in ai_detector_regression.json (batch detection
+# to within floating-point summation order)
+
+import json
+from ai_detector import AIContentDetector
+
+detector = AIContentDetector()
+
+with open("ai_detector_regression.json", "r", encoding="utf-8") as f:
+    cases = json.load(f)["cases"]
+
+for i, case in enumerate(cases):
+    is_ai, score, details = detector.detect_ai_content(case["text"])
+    assert bool(is_ai) == case["is_ai"], (i, is_ai, case["is_ai"])
+    assert float(score) == case["score"], (i, score, case["score"])
+    assert details == case["details"], (i, details, case["details"])
+
+    # The per-metric methods share the same engine
+    if "error" not in details:
+        metrics = details["metrics"]
+        assert round(detector.calculate_perplexity(case["text"]), 2) == metrics["perplexity"]
+        assert round(detector.calculate_burstiness(case["text"]), 2) == metrics["burstiness"]
+        assert detector.detect_ai_phrases(case["text"]) == metrics["ai_phrases_found"]
+        assert round(detector.calculate_repetition_score(case["text"]), 2) == metrics["repetition_rate"]
+        assert round(detector.calculate_formality_score(case["text"]), 2) == metrics["formality_score"]
+
+print(f"AI detector reproduced {len(cases)} regression cases exactly")
+
+# Batch detection agrees with the per-document detector
+texts = [case["text"] for case in cases]
+batch = detector.detect_ai_content_many(texts)
+assert len(batch) == len(cases)
+
+for i, case in enumerate(cases):
+    row = batch.iloc[i]
+    assert bool(row["is_ai"]) == case["is_ai"], i
+    assert abs(row["ai_score"] - case["score"]) < 1e-9, (i, row["ai_score"], case["score"])
+    if "error" in case["details"]:
+        assert row["error"] == case["details"]["error"], i
+    else:
+        assert row["ai_phrases_found"] == case["details"]["metrics"]["ai_phrases_found"], i
+
+print(f"Batch detection matched {len(cases)} documents")
+
+# Cascade mode: the early exit never changes the verdict, and a cascade
+# that ran every metric returns the full result
+exits = 0
+for i, case in enumerate(cases):
+    is_ai, score, details = detector.detect_ai_content(case["text"], cascade=True)
+    assert bool(is_ai) == case["is_ai"], (i, is_ai, case["is_ai"])
+    if "error" in case["details"]:
+        assert details == case["details"], i
+        continue
+
+    cascade = details.pop("cascade")
+    low, high = cascade["ai_probability_bounds"]
+    assert low <= round(case["score"], 2) <= high, (i, cascade, case["score"])
+    if cascade["metrics_skipped"]:
+        exits += 1
+        assert details["verdict"] == case["details"]["verdict"], i
+        for name, value in details["metrics"].items():
+            assert value == case["details"]["metrics"][name], (i, name)
+    else:
+        assert float(score) == case["score"], (i, score, case["score"])
+        assert details == case["details"], i
+
+print(f"Cascade verdicts matched {len(cases)} cases ({exits} exited early)")
@@ -0,0 +1,45 @@
+# backend/test_analyze_deadline.py
+# /analyze under a deadline must degrade, not fail, when the semantic stage
+# is too slow: skills are scored and semantic_match comes back null
+
+import os
+import tempfile
+import time
+
+tmp = tempfile.TemporaryDirectory()
+for name in ("JOB_STORE_DIR", "RESUME_CORPUS_DIR", "SCORE_STORE_DIR"):
+    os.environ[name] = os.path.join(tmp.name, name.lower())
+
+from fastapi.testclient import TestClient
+import main
+
+
+class SlowMatcher:
+    """Stand-in for ResumeJDMatcher whose encoder takes 0.5 s per call"""
+    def embed(self, text):
+        time.sleep(0.5)
+        return [1.0, 0.0]
+
+    def match_embeddings(self, resume_embedding, jd_embedding):
+        return 1.0
+
+
+main.matcher = SlowMatcher()
+client = TestClient(main.app)
+request = {
+    "resume_text": "Jane Doe\nSkills: Python, Docker\nExperience\nBackend developer at Acme",
+    "job_description": "Python developer with Docker"
+}
+
+response = client.post("/analyze", json=request, headers={"X-Deadline-Ms": "100"})
+assert response.status_code == 200, (response.status_code, response.text)
+result = response.json()
+assert result["semantic_match"] is None and result["degraded"]
+assert "skill_extraction" in result["stages"] and "semantic_match" not in result["stages"]
+assert result["skill_match"] == 1.0 and result["ats_score"] > 0
+
+# A budget spent before any stage ran is still a 504
+assert client.post("/analyze", json=request, headers={"X-Deadline-Ms": "0"}).status_code == 504
+
+tmp.cleanup()
+print(f"Deadline degradation passed (ats_score {result['ats_score']} without semantic_match)")
@@ -0,0 +1,88 @@
+# backend/test_ats_batch.py
+# Property test: vectorized batch scoring must match calculate_score bit-for-bit
+
+import random
+import numpy as np
+from ats_scorer import ATSScorer
+from skill_extractor import SkillExtractor
+
+extractor = SkillExtractor("skill_ontology.json")
+scorer = ATSScorer()
+vocabulary = extractor.vocabulary
+categories = list(extractor.ontology)
+
+rng = random.Random(42)
+
+
+def random_candidate():
+    skills = rng.sample(vocabulary, rng.randint(0, len(vocabulary)))
+    skill_categories = {}
+    for category in rng.sample(categories, rng.randint(0, len(categories))):
+        skill_categories[category] = rng.sample(skills, min(len(skills), rng.randint(0, 3)))
+
+    resume_json = {sec: rng.choice(["", "some content"]) for sec in ATSScorer.SECTIONS}
+    text = rng.choice(["word ", "WORD ", "Mixed Case "]) * rng.randint(0, 120)
+    semantic = rng.choice([None, 0.0, 1.0, round(rng.random(), 4), rng.random()])
+
+    return resume_json, {"normalized_skills": sorted(skills), "skill_categories": skill_categories}, text, semantic
+
+
+trials = 0
+for _ in range(200):
+    jd_skills = sorted(rng.sample(vocabulary, rng.randint(0, len(vocabulary))))
+    candidates = [random_candidate() for _ in range(rng.randint(1, 50))]
+    resume_jsons, skill_outputs, texts, semantics = zip(*candidates)
+
+    inputs = scorer.build_batch_inputs(resume_jsons, skill_outputs, texts, vocabulary)
+    semantic_array = np.array([np.nan if s is None else s for s in semantics], dtype=np.float64)
+    jd_vector = extractor.skill_vector(jd_skills)
+
+    for packed in (False, True):
+        skill_matrix = inputs["skill_matrix"]
+        if packed:
+            skill_matrix = np.packbits(skill_matrix, axis=1)
+
+        batch_scores, batch_components = scorer.calculate_scores_batch(
+            skill_matrix=skill_matrix,
+            jd_skill_vector=jd_vector,
+            semantic_scores=semantic_array,
+            section_flags=inputs["section_flags"],
+            category_flags=inputs["category_flags"],
+            text_lengths=inputs["text_lengths"],
+            is_upper=inputs["is_upper"]
+        )
+
+        for i, (resume_json, skill_output, text, semantic) in enumerate(candidates):
+            final_score, breakdown = scorer.calculate_score(
+                resume_json, skill_output, jd_skills, semantic, text
+            )
+            assert batch_scores[i] == final_score, (batch_scores[i], final_score)
+            assert np.float64(final_score).tobytes() == batch_scores[i].tobytes()
+            for name, value in breakdown.items():
+                if value is None:
+                    assert np.isnan(batch_components[name][i])
+                else:
+                    assert float(batch_components[name][i]) == value, (name, batch_components[name][i], value)
+            trials += 1
+
+# Weights that do not sum to 1 are normalized, with or without semantic_match
+custom = ATSScorer({"skill_match": 1, "semantic_match": 1})
+perfect = ({"skills": ["Python"], "experience": "x", "education": "x", "projects": ["x"]},
+           {"normalized_skills": ["Python"], "skill_categories": {c: ["Python"] for c in "ABCD"}})
+for semantic in (1.0, None):
+    assert custom.calculate_score(*perfect, ["Python"], semantic, "x" * 300)[0] == 100.0
+full_and_degraded = {name: np.ones(2) for name in custom.weights}
+full_and_degraded["semantic_match"] = np.array([1.0, np.nan])
+assert custom.combine_batch(full_and_degraded).tolist() == [100.0, 100.0]
+
+# Weights that would leave nothing to re-normalize by are rejected up front
+for bad in ({"formatting": -0.1},
+            {"skill_match": 0, "section_completeness": 0, "category_balance": 0, "formatting": 0}):
+    try:
+        ATSScorer(bad)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError(f"accepted {bad}")
+
+print(f"Batch scoring matched calculate_score bit-for-bit on {trials} candidates")
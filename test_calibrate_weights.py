@@ -0,0 +1,46 @@
+# backend/test_calibrate_weights.py
+# Calibration on a small labeled set must produce weights on the simplex
+# that rank hires at least as well as the default weights, in a file that
+# ATSScorer.from_file loads back unchanged
+
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import calibrate_weights
+from ats_scorer import ATSScorer
+from score_store import COMPONENTS, ScoreStore
+
+rng = np.random.default_rng(7)
+n = 400
+X = rng.random((n, len(COMPONENTS)))
+X[rng.random(n) < 0.2, COMPONENTS.index("semantic_match")] = np.nan
+# Hires depend mostly on formatting and category balance, which the defaults underweight
+signal = 3 * X[:, COMPONENTS.index("formatting")] + 2 * X[:, COMPONENTS.index("category_balance")]
+y = (signal + rng.normal(0, 0.5, n) > 2.5).astype(int)
+
+with tempfile.TemporaryDirectory() as tmp:
+    store_dir = os.path.join(tmp, "scores")
+    labels_path = os.path.join(tmp, "labels.csv")
+    candidate_ids = [f"c{i}" for i in range(n)]
+    ScoreStore(store_dir).add(candidate_ids, "job-1", [
+        {name: None if np.isnan(v) else float(v) for name, v in zip(COMPONENTS, row)} for row in X
+    ])
+    pd.DataFrame({"candidate_id": candidate_ids, "label": y}).to_csv(labels_path, index=False)
+
+    for method in ("random", "logistic"):
+        out = os.path.join(tmp, f"{method}.json")
+        sys.argv = ["calibrate_weights.py", "--labels", labels_path, "--store", store_dir,
+                    "--method", method, "--samples", "300", "--out", out]
+        calibrate_weights.main()
+
+        with open(out, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        assert result["rows"] == n
+        assert abs(sum(result["weights"].values()) - 1) < 1e-5, result["weights"]
+        assert result["auc"] >= result["baseline_auc"], (method, result["auc"], result["baseline_auc"])
+        assert ATSScorer.from_file(out).weights == result["weights"]
+
+print(f"Weight calibration passed ({n} labeled candidates)")
@@ -0,0 +1,90 @@
+# backend/test_document_extractor.py
+# Extraction must read PDF text layers (pages in order, in parallel too), fall
+# back to pdfplumber for unusable pages and for files PyPDF2 cannot open, and
+# serve repeated files from the cache
+
+import io
+import os
+import tempfile
+from docx import Document
+from benchmark import write_pdf
+import document_extractor
+from document_extractor import DocumentExtractor, file_kind, usable
+
+pages = [[f"Page {page + 1} (of 12)", "Skills: Python, SQL", "Experience: 3 years at Acme"] for page in range(12)]
+
+with tempfile.TemporaryDirectory() as tmp:
+    pdf_path = os.path.join(tmp, "resume.pdf")
+    write_pdf(pdf_path, pages)
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+
+    extractor = DocumentExtractor(cache_dir=os.path.join(tmp, "cache"))
+    text = extractor.extract(pdf_path)
+    assert text.splitlines() == [line for page in pages for line in page]
+    assert extractor.stats == {"hits": 0, "extracted": 1, "fast_pages": 12, "fallback_pages": 0}
+
+    # Same bytes under another name: served from the cache
+    assert extractor.extract(io.BytesIO(pdf_bytes), "copy.pdf") == text
+    assert extractor.stats["hits"] == 1 and extractor.stats["extracted"] == 1
+
+    # The disk cache outlives the extractor
+    fresh = DocumentExtractor(cache_dir=os.path.join(tmp, "cache"))
+    assert fresh.extract(pdf_bytes, mime_type="application/pdf") == text
+    assert fresh.stats["hits"] == 1 and fresh.stats["fast_pages"] == 0
+
+    # Page ranges in a process pool, merged in page order
+    parallel = DocumentExtractor(workers=3, parallel_pages=4)
+    assert parallel.extract(pdf_bytes, "resume.pdf") == text
+    parallel.close()
+
+    # A page without a usable text layer goes to pdfplumber
+    write_pdf(pdf_path, [["Jane Doe"], []])
+    blank = DocumentExtractor()
+    assert blank.extract(pdf_path) == "Jane Doe"
+    assert blank.stats["fast_pages"] == 1 and blank.stats["fallback_pages"] == 1
+    assert usable("Senior engineer at Acme") and not usable("S e n i o r  e n g i n e e r") and not usable(" \n")
+
+    # A file PyPDF2 cannot open at all is extracted whole by pdfplumber
+    reader = document_extractor.PyPDF2.PdfReader
+    def broken_reader(*args, **kwargs):
+        raise document_extractor.PyPDF2.errors.PdfReadError("EOF marker not found")
+    document_extractor.PyPDF2.PdfReader = broken_reader
+    try:
+        broken = DocumentExtractor()
+        assert broken.extract(pdf_bytes, "resume.pdf") == text
+        assert broken.stats["fast_pages"] == 0 and broken.stats["fallback_pages"] == 12
+    finally:
+        document_extractor.PyPDF2.PdfReader = reader
+
+    # DOCX and plain text
+    docx_path = os.path.join(tmp, "resume.docx")
+    document = Document()
+    for line in ["Jane Doe", "Skills: Python"]:
+        document.add_paragraph(line)
+    document.save(docx_path)
+    assert extractor.extract(docx_path) == "Jane Doe\nSkills: Python"
+    assert extractor.extract("Jane Doe\n".encode("utf-8"), mime_type="text/plain") == "Jane Doe\n"
+
+    # Many documents: cached first, failures reported per file, the rest in the pool
+    documents = [(pdf_bytes, "a.pdf", None), (b"not a pdf", "b.pdf", None), (b"Jane\n", "c.txt", None),
+                 (b"", "d.doc", None)]
+    for workers in [1, 2]:
+        many = DocumentExtractor(workers=workers)
+        many.extract(pdf_bytes, "a.pdf")
+        results = list(many.extract_many(documents))
+        assert results[0] == (0, text, None) and many.stats["hits"] == 1
+        results = {index: (text, error) for index, text, error in results}
+        assert results[2] == ("Jane\n", None) and results[1][0] is None and "PdfminerException" in results[1][1]
+        assert results[3] == (None, "Unsupported file type: d.doc")
+        assert many.extract(b"Jane\n", "c.txt") == "Jane\n" and many.stats["hits"] == 2
+        many.close()
+
+    for name in ["resume.doc", None]:
+        try:
+            file_kind(name)
+            raise AssertionError(f"{name} accepted")
+        except ValueError:
+            pass
+
+print(f"Document extractor passed ({extractor.stats['hits']} cache hits)")
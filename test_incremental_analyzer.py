@@ -0,0 +1,57 @@
+# backend/test_incremental_analyzer.py
+# Block-wise analysis must give the same skills and AI-detection result as
+# the full-text extractor and detector, including sentences and pattern
+# matches that span block boundaries, and a one-line edit must only
+# recompute the edited block
+
+import json
+from ai_detector import AIContentDetector
+from incremental_analyzer import IncrementalAnalyzer
+from skill_extractor import SkillExtractor
+
+skill_extractor = SkillExtractor("skill_ontology.json")
+detector = AIContentDetector()
+analyzer = IncrementalAnalyzer(skill_extractor, None, detector)
+
+# Paragraphs longer than 3 lines are split into blocks of 3 lines, so the
+# sentences and patterns below cross block boundaries
+resume = """Jane Doe
+Results-driven professional with a proven
+track record of leveraging Python and Docker
+to spearhead data platforms. I am highly
+motivated individual and proficient in
+Machine Learning, SQL and Kubernetes.
+
+Experience
+Senior engineer at Acme. Demonstrated ability to
+orchestrate teams; we utilize best practices and
+streamline delivery with excellent
+communication skills. Led migration to AWS.
+
+Projects
+- Resume Analyzer in React and Node.js
+- Fraud detection with TensorFlow, proven ability
+to ship. Team player."""
+
+with open("ai_detector_regression.json", "r", encoding="utf-8") as f:
+    texts = [resume, resume.replace("\n", " "), resume.replace("\n\n", "\n")]
+    texts += [case["text"] for case in json.load(f)["cases"]]
+
+for i, text in enumerate(texts):
+    assert analyzer.extract_skills(text) == skill_extractor.extract(text), i
+    assert analyzer.detect_ai_content(text) == detector.detect_ai_content(text), i
+
+blocks, _ = analyzer.split_blocks(resume)
+assert len(blocks) > 5
+
+# A one-line edit recomputes only the block holding that line
+edited = resume.replace("Led migration to AWS.", "Led migration to GCP.")
+stats = {}
+analyzer.extract_skills(edited, stats)
+analyzer.detect_ai_content(edited, stats)
+assert stats["skills"] == {"blocks": len(blocks), "recomputed": 1}, stats
+assert stats["detector"] == {"blocks": len(blocks), "recomputed": 1}, stats
+assert analyzer.extract_skills(edited) == skill_extractor.extract(edited)
+assert analyzer.detect_ai_content(edited) == detector.detect_ai_content(edited)
+
+print(f"Incremental analysis matched {len(texts)} texts ({len(blocks)} blocks, 1 recomputed after an edit)")
@@ -0,0 +1,96 @@
+# backend/test_ingest.py
+# Bulk ingestion must extract, parse and tag every supported file of a tree
+# into the store, skip files (and copies of files) already ingested, and keep
+# going past files that fail to read or extract. Files missing from the
+# corpus (--no-embed or an interrupted run) are embedded by a later run
+
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from benchmark import write_pdf
+from ingest import Ingester
+from parsed_store import ParsedResumeStore
+from resume_corpus import ResumeCorpus
+
+
+class LengthMatcher:
+    """Stand-in for ResumeJDMatcher: a tiny deterministic embedding per text"""
+    def embed_batch(self, texts, batch_size=64):
+        return np.array([[len(text), text.count("\n") + 1, 1.0] for text in texts], dtype=np.float32)
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    root = os.path.join(tmp, "shared")
+    os.makedirs(os.path.join(root, "Data Science", "2026"))
+    os.makedirs(os.path.join(root, "HR", "archive"))
+    write_pdf(os.path.join(root, "Data Science", "jane.pdf"),
+              [["Jane Doe", "Skills: Python, Docker", "Education", "B.Tech in IT, 2019"], ["Projects", "- Resume Analyzer"]])
+    for i in range(30):
+        write_pdf(os.path.join(root, "Data Science", "2026", f"candidate_{i:02d}.pdf"),
+                  [[f"Candidate {i}", "Skills: Docker, Java"]])
+    with open(os.path.join(root, "HR", "john.txt"), "w", encoding="utf-8") as f:
+        f.write("John Roe\nSkills: Excel\nCertifications: SHRM-CP\n")
+    with open(os.path.join(root, "HR", "broken.pdf"), "wb") as f:
+        f.write(b"not a pdf")
+    with open(os.path.join(root, "notes.md"), "w", encoding="utf-8") as f:
+        f.write("ignored")
+    shutil.copy(os.path.join(root, "HR", "john.txt"), os.path.join(root, "HR", "archive", "john.txt"))
+
+    store_dir = os.path.join(tmp, "store")
+    ingester = Ingester(store_dir, workers=2, batch_size=4, commit_size=8, queue_size=4)
+    stats = ingester.ingest(root)
+    assert stats == {"files": 34, "skipped": 1, "failed": 1, "ingested": 32}, stats
+    assert [os.path.basename(path) for path, _ in ingester.failures] == ["broken.pdf"]
+
+    store = ParsedResumeStore(store_dir)
+    records = {r["full_text"].split("\n")[0]: r for r in store.records()}
+    assert len(store) == 32 and len(records) == 32
+    jane = records["Jane Doe"]
+    assert jane["category"] == "Data Science"
+    assert jane["skills"] == ["Docker", "Python"]
+    assert jane["education"] == "B.Tech in IT, 2019" and jane["projects"] == ["Resume Analyzer"]
+    assert records["Candidate 7"]["category"] == "Data Science/2026"
+    assert records["John Roe"]["certifications"] == ["SHRM-CP"] and records["John Roe"]["category"] == "HR"
+
+    with open(os.path.join(store_dir, "ingest_files.jsonl"), "r", encoding="utf-8") as f:
+        manifest = [json.loads(line) for line in f]
+    assert sorted(m["resume_id"] for m in manifest) == sorted(store.column("resume_id"))
+    assert {os.path.basename(m["path"]) for m in manifest} >= {"jane.pdf", "john.txt", "candidate_29.pdf"}
+
+    # A rerun ingests nothing; a new file is the only one ingested
+    assert Ingester(store_dir, workers=1).ingest(root)["ingested"] == 0
+    with open(os.path.join(root, "HR", "new.txt"), "w", encoding="utf-8") as f:
+        f.write("New Hire\nSkills: Python\n")
+    stats = Ingester(store_dir, workers=1).ingest(root)
+    assert stats == {"files": 35, "skipped": 33, "failed": 1, "ingested": 1}, stats
+    assert ParsedResumeStore(store_dir).records(slice(32, 33))[0]["category"] == "HR"
+
+    # Unreadable files are failures, not crashes
+    os.symlink(os.path.join(tmp, "missing.txt"), os.path.join(root, "HR", "dangling.txt"))
+    stats = Ingester(store_dir, workers=1).ingest(root)
+    assert stats == {"files": 36, "skipped": 34, "failed": 2, "ingested": 0}, stats
+
+    # Files ingested without embeddings are embedded (not re-stored) by an embedding run
+    corpus_dir = os.path.join(tmp, "corpus")
+    assert Ingester(store_dir, corpus_dir, matcher=LengthMatcher(), workers=1).ingest(root)["ingested"] == 33
+    assert len(ResumeCorpus(corpus_dir)) == 33 and len(ParsedResumeStore(store_dir)) == 33
+    assert Ingester(store_dir, corpus_dir, matcher=LengthMatcher(), workers=1).ingest(root)["ingested"] == 0
+
+    # A crash between the corpus and the store append is finished by the rerun, without duplicates
+    with open(os.path.join(root, "HR", "late.txt"), "w", encoding="utf-8") as f:
+        f.write("Late Hire\nSkills: SQL\n")
+    crashing = Ingester(store_dir, corpus_dir, matcher=LengthMatcher(), workers=1)
+    crashing.store.add = lambda rows: 1 / 0
+    try:
+        crashing.ingest(root)
+    except ZeroDivisionError:
+        pass
+    assert len(ResumeCorpus(corpus_dir)) == 34 and len(ParsedResumeStore(store_dir)) == 33
+    assert Ingester(store_dir, corpus_dir, matcher=LengthMatcher(), workers=1).ingest(root)["ingested"] == 1
+    corpus_ids = ResumeCorpus(corpus_dir).resume_ids()
+    assert len(corpus_ids) == len(set(corpus_ids)) == 34
+    assert sorted(corpus_ids) == sorted(ParsedResumeStore(store_dir).column("resume_id"))
+
+print(f"Ingestion passed ({len(records)} files)")
@@ -0,0 +1,85 @@
+# backend/test_near_duplicates.py
+# MinHash similarity must track the exact shingle Jaccard similarity, and the
+# LSH index must find near-duplicates across incremental inserts and reloads
+
+import random
+import tempfile
+from ai_detector import AIContentDetector
+from near_duplicates import MinHashLSH
+from ngram_lm import tokenize, EOS
+
+rng = random.Random(0)
+vocabulary = [f"word{i}" for i in range(3000)]
+
+
+def resume():
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(150, 300)))
+
+
+def edit(text, fraction):
+    words = text.split()
+    for _ in range(int(len(words) * fraction)):
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+    return " ".join(words)
+
+
+def jaccard(a, b, k=5):
+    def shingles(text):
+        tokens = tokenize(text) + [EOS]
+        return {tuple(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+
+corpus = [resume() for _ in range(300)]
+index = MinHashLSH(merge_size=1000)  # merges every ~60 documents
+index.insert_many([f"r{i}" for i in range(200)], corpus[:200])
+for i in range(200, 300):
+    assert index.insert(f"r{i}", corpus[i])
+assert len(index) == 300
+assert not index.insert("empty", "too short")
+
+# Batch and single signatures agree
+signatures, has_shingles = index.signatures(corpus[:10] + [""])
+assert has_shingles.tolist() == [True] * 10 + [False]
+for i in range(10):
+    assert (signatures[i] == index.signature(corpus[i])).all()
+
+# Similarity estimates and recall of near-duplicates
+errors, found, expected = [], 0, 0
+for i in range(100):
+    variant = edit(corpus[i], rng.choice([0.01, 0.03, 0.1, 0.3]))
+    exact = jaccard(corpus[i], variant)
+    matches = {m["doc_id"]: m["similarity"] for m in index.query(variant, threshold=0.0)}
+    if f"r{i}" in matches:
+        errors.append(abs(matches[f"r{i}"] - exact))
+    if exact >= 0.9:
+        expected += 1
+        found += f"r{i}" in matches
+assert max(errors) < 0.15, max(errors)
+assert found == expected, (found, expected)
+
+assert index.query(corpus[5])[0] == {"doc_id": "r5", "similarity": 1.0}
+assert index.query(corpus[5], exclude="r5") == []
+assert sum(len(index.query(resume())) for _ in range(50)) == 0
+assert index.query_many(corpus[:5]) == [index.query(text) for text in corpus[:5]]
+
+with tempfile.TemporaryDirectory() as index_dir:
+    index.save(index_dir)
+    loaded = MinHashLSH.load(index_dir, mmap=True)
+    assert loaded.query(corpus[7]) == index.query(corpus[7])
+    loaded.insert("copy", corpus[7])
+    assert {m["doc_id"] for m in loaded.query(corpus[7])} == {"r7", "copy"}
+
+    # Surfaced by the detector without changing its score
+    text = " ".join(["I built a resume parser.", corpus[3]])
+    plain = AIContentDetector().detect_ai_content(text)
+    is_ai, score, details = AIContentDetector(duplicate_index=index_dir).detect_ai_content(text)
+    assert details.pop("near_duplicates")[0]["doc_id"] == "r3"
+    assert (is_ai, score, details) == plain
+
+    batch = AIContentDetector(duplicate_index=index_dir).detect_ai_content_many([text, resume(), "short"])
+    assert batch["duplicate_of"][0] == "r3" and batch["near_duplicates"][1] == 0
+
+print(f"Near-duplicate index matched {found} of {expected} near-duplicates "
+      f"(max similarity error {max(errors):.3f})")
@@ -0,0 +1,58 @@
+# backend/test_ngram_lm.py
+# The hashed n-gram LM must match a brute-force interpolated model
+
+import math
+import tempfile
+from collections import Counter
+from ngram_lm import NGramCounter, NGramLM, tokenize, BOS, EOS
+
+corpus = [
+    "Built a resume ranking service in Python and PyTorch.",
+    "Built data pipelines in Python with Airflow and Spark.",
+    "Led a team of five engineers building a recommendation service.",
+    "Set up Docker based training pipelines on AWS.",
+] * 5
+text = "Built a ranking service in Python with Docker and an unseenword."
+
+with tempfile.TemporaryDirectory() as model_dir:
+    counter = NGramCounter(order=3)
+    counter.add(corpus[:10])
+    counter.add(corpus[10:])
+    meta = counter.save(model_dir, holdout_texts=corpus[:2])
+    model = NGramLM(model_dir)
+
+    # Brute-force counts over the same padded token sequences
+    counts = {k: Counter() for k in (1, 2, 3)}
+    for doc in corpus:
+        tokens = [BOS, BOS] + tokenize(doc) + [EOS]
+        for k in (1, 2, 3):
+            for i in range(len(tokens) - k + 1):
+                counts[k][tuple(tokens[i:i + k])] += 1
+
+    tokens = [BOS, BOS] + tokenize(text) + [EOS]
+    weights = model.interpolation
+    log2_p = []
+    for t in range(2, len(tokens)):
+        probability = weight = 0
+        for k in (1, 2, 3):
+            if k == 1:
+                numerator = counts[1][(tokens[t],)] + 1
+                denominator = meta["tokens"] + meta["vocabulary"] + 1
+            else:
+                numerator = counts[k][tuple(tokens[t - k + 1:t + 1])]
+                denominator = counts[k - 1][tuple(tokens[t - k + 1:t])]
+            if denominator > 0:
+                probability += weights[k - 1] * numerator / denominator
+                weight += weights[k - 1]
+        log2_p.append(math.log2(probability / weight))
+
+    expected = 2 ** (-sum(log2_p) / len(log2_p))
+    assert abs(model.perplexity(text) - expected) < 1e-9 * expected, (model.perplexity(text), expected)
+
+    # Batch scoring equals one-by-one scoring
+    batch = model.perplexity_many([text, corpus[0], ""])
+    assert abs(batch[0] - model.perplexity(text)) < 1e-9 * batch[0]
+    assert batch[1] < batch[0]  # seen text is less surprising
+    assert meta["reference_perplexity"] > 0
+
+print(f"N-gram LM perplexity {expected:.2f} matched the brute-force model")
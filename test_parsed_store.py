@@ -0,0 +1,114 @@
+# backend/test_parsed_store.py
+# The columnar parsed-resume store must return the parser's records (with the
+# full text, and sections sliced from it), support row ranges and category
+# filters, and ignore an append that never committed. Incremental updates
+# must only parse and append new or changed rows
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from parsed_store import ParsedResumeStore
+import resume_parser
+from resume_parser import ResumeParser
+
+resumes = [
+    "Skills: Python, SQL | Docker\nEducation Details\nB.Tech in IT, 2019\nProjects\n- Resume Analyzer",
+    "Technical Skills : Java; Spring\nWork Experience: Backend developer\nCertifications: OCJP",
+    "",
+    "Tools: Excel • Tableau\nMaster of Science in Statistics\nCertifications\n• Güte-Siegel Ñ",
+] * 25
+categories = ["Data Science", "Java Developer", "", "HR"] * 25
+
+with tempfile.TemporaryDirectory() as tmp:
+    csv_path = os.path.join(tmp, "resumes.csv")
+    pd.DataFrame({"Category": categories, "Resume": resumes}).to_csv(csv_path, index=False)
+
+    def expected_records():
+        """parse_resume records, as the store returns them: with the full text"""
+        parser = ResumeParser(csv_path, stream=True)
+        texts = pd.read_csv(csv_path, dtype=str)["Resume"].fillna("").tolist()
+        return [
+            dict(record, resume_id=str(record["resume_id"]), full_text=text)
+            for record, text in zip(parser.iter_records(), texts)
+        ]
+
+    expected = expected_records()
+
+    store_dir = os.path.join(tmp, "store")
+    assert ResumeParser(csv_path, stream=True).save_store(store_dir, chunk_size=7) == 100
+
+    # Reopened from disk
+    store = ParsedResumeStore(store_dir)
+    assert len(store) == 100
+    assert store.records() == expected
+    assert store.column("skills") == [r["skills"] for r in expected]
+    assert store.records(slice(0, 1), columns=["projects"]) == [{"projects": ["Resume Analyzer"]}]
+    assert [r["certifications"] for r in store.records([1, 3, 2])] == [["OCJP"], ["Güte-Siegel Ñ"], []]
+    assert store.texts([3]) == [resumes[3]]
+    assert bytes(store.text_view(3)).decode("utf-8") == resumes[3]
+    assert [bytes(view).decode("utf-8") for view in store.text_views([3, 0])] == [resumes[3], resumes[0]]
+
+    # Sections are byte spans into the text blob, not copies
+    text = bytes(store.text_view(3))
+    assert [text[start:end] for start, end in store.column("certifications", [3])[0]] == [
+        "Güte-Siegel Ñ".encode("utf-8")
+    ]
+    assert os.path.getsize(os.path.join(store_dir, "education.bin")) == 8 * 50
+
+    # Row ranges
+    assert store.records(slice(10, 20)) == expected[10:20]
+    assert store.column("skills", slice(95, 200)) == [r["skills"] for r in expected[95:]]
+    assert store.column("category", slice(2, 4)) == ["", "HR"]
+
+    # Category filter, alone and combined with a range
+    java = store.rows(category="Java Developer")
+    assert java.tolist() == list(range(1, 100, 4))
+    assert store.rows(category=["HR", "Data Science"], start=8, stop=16).tolist() == [8, 11, 12, 15]
+    assert len(store.rows(category="Unknown")) == 0
+    assert [r["skills"] for r in store.records(java, columns=["skills"])] == [["Java", "Spring"]] * 25
+
+    # A crashed append (files written, row count not bumped) is truncated away
+    sizes = {name: os.path.getsize(os.path.join(store_dir, name)) for name in os.listdir(store_dir)}
+    with open(os.path.join(store_dir, "skills.bin"), "ab") as f:
+        f.write(np.zeros(3, dtype="<i4").tobytes())
+    with open(os.path.join(store_dir, "skills.off"), "ab") as f:
+        f.write(np.array([10**6], dtype="<i8").tobytes())
+    store = ParsedResumeStore(store_dir)
+    assert store.column("skills") == [r["skills"] for r in expected]
+    store.add(store.span_rows([0, 1]))
+    assert store.records(slice(100, 102)) == expected[:2]
+    assert os.path.getsize(os.path.join(store_dir, "skills.off")) == sizes["skills.off"] + 16
+
+    # Incremental: the first run parses everything, an identical rerun nothing
+    store_dir = os.path.join(tmp, "incremental")
+    assert ResumeParser(csv_path, stream=True).update_store(store_dir, chunk_size=7) == (100, 100)
+    assert ResumeParser(csv_path, stream=True).update_store(store_dir, chunk_size=7) == (100, 0)
+    assert ParsedResumeStore(store_dir).records() == expected
+    # Every resume occurs 25 times: the unmapped copies were compacted away
+    assert len(ParsedResumeStore(store_dir).table) == 4
+
+    # Edit two rows, drop one and insert one at the top: only 3 rows are parsed
+    edited = pd.DataFrame({"Category": categories, "Resume": resumes})
+    edited.loc[5, "Resume"] = "Skills: Rust, Go"
+    edited.loc[6, "Category"] = "Testing"
+    edited = edited.drop(index=50)
+    edited = pd.concat([pd.DataFrame({"Category": ["HR"], "Resume": ["Skills: Recruiting"]}), edited])
+    edited.to_csv(csv_path, index=False)
+    assert ResumeParser(csv_path, stream=True).update_store(store_dir, chunk_size=7) == (100, 3)
+    store = ParsedResumeStore(store_dir)
+    fresh = expected_records()
+    assert store.records() == fresh
+    assert store.records([0, 6]) == [fresh[0], fresh[6]] and fresh[6]["skills"] == ["Go", "Rust"]
+    # Only the 3 parsed rows were appended; reads go through the row map
+    assert len(store.table) == 7
+    assert store.rows(category="Testing").tolist() == [7]
+    assert store.column("resume_id", [7]) == ["7"] and store.texts([7]) == [resumes[6]]
+    assert sorted(os.listdir(tmp)) == ["incremental", "resumes.csv", "store"]
+
+    # New parsing rules invalidate every row
+    resume_parser.PARSER_VERSION += 1
+    assert ResumeParser(csv_path, stream=True).update_store(store_dir, chunk_size=7) == (100, 100)
+    assert ParsedResumeStore(store_dir).records() == fresh
+
+print(f"Parsed-resume store matched {len(expected)} records")
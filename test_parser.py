@@ -1,13 +1,18 @@
 # backend/test_parser.py
 
 from resume_parser import ResumeParser
+from parsed_store import ParsedResumeStore
 
 # Use the downloaded dataset
 parser = ResumeParser(
-    csv_path="datasets/resumes/UpdatedResumeDataSet.csv"
+    csv_path="datasets/resumes/UpdatedResumeDataSet.csv",
+    stream=True
 )
 
-parsed_data = parser.save_json("datasets/resumes/parsed_resumes.json")
+# Only rows that are new or changed since the last refresh are parsed
+store_dir = "datasets/resumes/parsed_store"
+parser.update_store(store_dir)
+parsed_data = ParsedResumeStore(store_dir).records(slice(0, 1))
 
 print("\n" + "="*60)
 print("Sample parsed resume:")
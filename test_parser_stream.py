@@ -0,0 +1,71 @@
+# backend/test_parser_stream.py
+# Streaming and sharded parsing must write the same records as parse(), and
+# an interrupted sharded run must resume from its manifest
+
+import json
+import os
+import tempfile
+import pandas as pd
+from resume_parser import ResumeParser
+
+resumes = [
+    "Skills: Python, SQL | Docker\nEducation Details\nB.Tech in IT, 2019\nExperience: 3 years at Acme",
+    "Technical Skills : Java; Spring\nWork Experience: Backend developer",
+    "",
+    "Tools: Excel • Tableau\nMaster of Science in Statistics",
+] * 26
+categories = ["Data Science", "Java Developer", None, "HR"] * 26
+
+with tempfile.TemporaryDirectory() as tmp:
+    csv_path = os.path.join(tmp, "resumes.csv")
+    pd.DataFrame({"Category": categories, "Resume": resumes}).to_csv(csv_path, index=False)
+    expected = ResumeParser(csv_path).parse()
+
+    # Streaming, in chunks that do not divide the row count
+    assert list(ResumeParser(csv_path, stream=True).iter_records(chunk_size=7)) == expected
+
+    jsonl_path = os.path.join(tmp, "out.jsonl")
+    assert ResumeParser(csv_path, stream=True).save_jsonl(jsonl_path, chunk_size=7) == len(expected)
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == expected
+
+    # Sharded: merged in row order, work directory removed
+    parallel_path = os.path.join(tmp, "parallel.jsonl")
+    ResumeParser(csv_path, stream=True).save_jsonl_parallel(parallel_path, workers=2, shard_size=10)
+    with open(parallel_path, "rb") as f, open(jsonl_path, "rb") as g:
+        assert f.read() == g.read()
+    assert not os.path.exists(parallel_path + ".shards")
+
+    # Interrupted run: shard 1 is recorded as done, so it is kept, not re-parsed
+    work_dir = parallel_path + ".shards"
+    os.makedirs(work_dir)
+    stale = {"resume_id": "kept from the first run"}
+    with open(os.path.join(work_dir, "shard_000001.jsonl"), "w", encoding="utf-8") as f:
+        f.write(json.dumps(stale) + "\n")
+    manifest = {
+        "csv_path": os.path.abspath(csv_path),
+        "csv_size": os.path.getsize(csv_path),
+        "csv_mtime": os.path.getmtime(csv_path),
+        "shard_size": 10,
+        "shards": {"1": 1},
+        "total_shards": None
+    }
+    with open(os.path.join(work_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    ResumeParser(csv_path, stream=True).save_jsonl_parallel(parallel_path, workers=2, shard_size=10)
+    with open(parallel_path, "r", encoding="utf-8") as f:
+        resumed = [json.loads(line) for line in f]
+    assert resumed == expected[:10] + [stale] + expected[20:]
+
+    # A manifest for another shard size is refused
+    os.makedirs(work_dir)
+    with open(os.path.join(work_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    try:
+        ResumeParser(csv_path, stream=True).save_jsonl_parallel(parallel_path, workers=2, shard_size=5)
+        raise AssertionError("mismatched manifest accepted")
+    except ValueError:
+        pass
+
+print(f"Streaming and sharded parsing matched {len(expected)} records")
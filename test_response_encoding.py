@@ -0,0 +1,32 @@
+# backend/test_response_encoding.py
+# Accept negotiation must honour q-values, fall back to JSON when nothing
+# supported is named, and refuse only when JSON is explicitly excluded
+
+from response_encoding import FAST_JSON, JSON, MSGPACK, NotAcceptable, choose_encoding, msgpack
+
+cases = {
+    None: JSON,
+    "": JSON,
+    "*/*": JSON,
+    "text/html": JSON,
+    "application/xml, text/*;q=0.5": JSON,
+    f"{FAST_JSON}": FAST_JSON,
+    f"{JSON};q=0.5, {FAST_JSON}": FAST_JSON,
+    f"{FAST_JSON};q=0.5, {JSON}": JSON,
+}
+if msgpack is not None:
+    cases["application/x-msgpack"] = MSGPACK
+    cases[f"{JSON};q=0, {MSGPACK}"] = MSGPACK
+
+for header, expected in cases.items():
+    assert choose_encoding(header) == expected, (header, choose_encoding(header))
+
+for header in (f"{JSON};q=0", f"{JSON};q=0, text/html", f"{JSON};q=0.0, */*;q=0.1"):
+    try:
+        choose_encoding(header)
+    except NotAcceptable:
+        pass
+    else:
+        raise AssertionError(f"accepted {header}")
+
+print(f"Response encoding passed ({len(cases)} headers)")
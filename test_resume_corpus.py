@@ -0,0 +1,57 @@
+# backend/test_resume_corpus.py
+# The resume corpus must ignore empty batches, apply concurrent appends one
+# after the other (also from two instances, as the API and the ingester
+# open it) and keep searches consistent while appends run
+
+import tempfile
+import threading
+import numpy as np
+from resume_corpus import ResumeCorpus
+
+rng = np.random.default_rng(0)
+
+with tempfile.TemporaryDirectory() as tmp:
+    corpus = ResumeCorpus(tmp)
+    corpus.add([], [], [], [], np.zeros((0, 8)))
+    assert len(corpus) == 0
+    assert corpus.shortlist(np.ones(16, dtype=bool), np.ones(8))[2] == 0
+
+    def add(writer):
+        for batch in range(10):
+            ids = [f"{writer}-{batch}-{i}" for i in range(3)]
+            corpus.add(ids, ids, rng.random((3, 16)) > 0.5, [{}] * 3, rng.random((3, 8)))
+
+    def search():
+        for _ in range(100):
+            rows, scores, considered = corpus.shortlist(np.zeros(16, dtype=bool), np.ones(8), top_n=5)
+            assert len(rows) == min(5, considered) and (rows < considered).all()
+
+    threads = [threading.Thread(target=add, args=(w,)) for w in range(4)]
+    threads += [threading.Thread(target=search) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reopened = ResumeCorpus(tmp)
+    assert len(corpus) == len(reopened) == 120
+    assert reopened.embeddings.shape == (120, 8) and reopened.skills.shape == (120, 2)
+    ids = [record["resume_id"] for record in reopened.records(range(120))]
+    assert len(set(ids)) == 120
+
+with tempfile.TemporaryDirectory() as tmp:
+    # Two instances of one corpus: neither overwrites the other's rows, and
+    # searches see rows the other appended
+    api, ingester = ResumeCorpus(tmp), ResumeCorpus(tmp)
+
+    def add_to(corpus, ids):
+        corpus.add(ids, ids, np.ones((len(ids), 16), dtype=bool), [{}] * len(ids), rng.random((len(ids), 8)))
+
+    add_to(api, ["a"])
+    add_to(ingester, ["b", "c"])
+    assert api.shortlist(np.ones(16, dtype=bool), np.ones(8))[2] == 3
+    add_to(api, ["d"])
+    assert ingester.resume_ids() == ["a", "b", "c", "d"]
+    assert ResumeCorpus(tmp).resume_ids() == ["a", "b", "c", "d"]
+
+print(f"Resume corpus passed ({len(reopened)} resumes from 4 concurrent writers)")
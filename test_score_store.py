@@ -0,0 +1,33 @@
+# backend/test_score_store.py
+# Concurrent score appends must all land, and scores against different
+# inline job descriptions must stay apart when re-ranked
+
+import tempfile
+import threading
+from score_store import ScoreStore, job_key
+
+breakdown = {"skill_match": 0.5, "semantic_match": None, "section_completeness": 1.0,
+             "category_balance": 0.25, "formatting": 1.0}
+
+with tempfile.TemporaryDirectory() as tmp:
+    store = ScoreStore(tmp)
+
+    def score(thread):
+        for i in range(50):
+            store.add([f"c{thread}-{i}"], None, [breakdown], f"JD {thread % 2}")
+
+    threads = [threading.Thread(target=score, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reopened = ScoreStore(tmp)
+    assert len(reopened) == 400
+    assert len(set(reopened.table.column("candidate_id").to_list())) == 400
+    assert len(reopened.select(job_key(None, "JD 0"))) == 200
+    assert len(reopened.select(job_key(None, "JD 1"))) == 200
+    assert len(reopened.select(job_key(None, "JD 2"))) == 0
+    assert job_key("job-1", "JD 0") == "job-1"
+
+print(f"Score store passed ({len(reopened)} rows)")
@@ -0,0 +1,81 @@
+# backend/test_section_segmenter.py
+# Section segmentation must assign lines correctly and stay linear-time on
+# pathological resumes (the old section regexes were cubic on some of them)
+
+import time
+from resume_parser import ResumeParser
+from section_segmenter import segment
+
+resume = (
+    "Jane Doe\r\n"
+    "Summary\r\n"
+    "ML engineer with 4 years of experience.\r\n"
+    "WORK EXPERIENCE\r\n"
+    "  Acme Corp - ML Engineer\r\n"
+    "Company: Acme\r\n"
+    "\r\n"
+    "* Skill Details\r\n"
+    "Python, SQL | Docker\r\n"
+    "Programming Languages: Java; Go\r\n"
+    "Education Details :- B.Tech in IT, 2019\r\n"
+    "Projects\n"
+    "- Resume Analyzer\n"
+    "Certifications: AWS ML Specialty\n"
+    "Hobbies\n"
+    "Chess\n"
+)
+sections = segment(resume)
+assert sections.lines("other") == ["Jane Doe", "ML engineer with 4 years of experience.", "Chess"]
+assert sections.lines("experience") == ["Acme Corp - ML Engineer", "Company: Acme"]
+assert sections.lines("skills") == ["Python, SQL | Docker", "Java; Go"]
+assert sections.lines("education") == ["B.Tech in IT, 2019"]
+assert sections.lines("projects") == ["- Resume Analyzer"]
+assert sections.lines("certifications") == ["AWS ML Specialty"]
+for spans in sections.spans.values():
+    for start, end in spans:
+        assert resume[start:end] == resume[start:end].strip() and "\n" not in resume[start:end]
+
+# A line that only starts with a header word is content, not a header
+assert segment("Experience with Python in production").lines("other") == [
+    "Experience with Python in production"
+]
+
+parser = ResumeParser(None, stream=True)
+record = parser.parse_resume(0, resume)
+assert record["skills"] == ["Docker", "Go", "Java", "Python", "SQL"]
+assert record["education"] == "B.Tech in IT, 2019"
+assert record["experience"] == "Acme Corp - ML Engineer Company: Acme"
+assert record["projects"] == ["Resume Analyzer"]
+assert record["certifications"] == ["AWS ML Specialty"]
+assert {k: record[k] for k in parser.parse_sections(resume)} == parser.parse_sections(resume)
+assert parser.extract_education("Jane\nB.Tech in CS, 2019") == "B.Tech in CS, 2019"
+
+# Pathological inputs, each parsed under a time limit
+pathological = {
+    "header then 100k newlines": "Education" + "\n" * 100_000,
+    "200k lines, no headers": "line without any colon or header word\n" * 200_000,
+    "one 5 MB line": "x" * 5_000_000,
+    "100k header lines": "Experience:\nSkills\nEducation Details\n" * 33_334,
+    "header then 1M spaces": "Skills" + " " * 1_000_000 + "Python",
+    "1M-character words": ("a" * 1_000_000 + "\n") * 3,
+    "100k colon lines": "Word: value\n" * 100_000,
+}
+for name, text in pathological.items():
+    start = time.perf_counter()
+    parser.parse_resume(0, text)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 2.0, (name, elapsed)
+
+# Linear scaling: 8x the input takes far less than 64x the time
+small = "Education\n\n\nskills :\n" * 20_000
+large = small * 8
+start = time.perf_counter()
+parser.parse_resume(0, small)
+small_s = time.perf_counter() - start
+start = time.perf_counter()
+parser.parse_resume(0, large)
+large_s = time.perf_counter() - start
+assert large_s < 8 * small_s * 3 + 0.05, (small_s, large_s)
+
+print(f"Section segmenter passed {len(pathological)} pathological inputs "
+      f"(8x input: {large_s / small_s:.1f}x time)")